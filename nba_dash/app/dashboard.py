@@ -2,6 +2,8 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
+from data_access import player_directory, compare
+from queries import DEFAULT_PLAYER_IDS
 
 ### Page configuration
 
@@ -11,11 +13,10 @@ import plotly.graph_objects as go
 #    )
 
 ### Data loading
-def run():
-    conn = st.connection("sql", type = "sql")
-
-    df = conn.query("SELECT * FROM player_stats")
+# Span options of the page; None averages every loaded season, numbers are player_form windows
+SPANS = {"Career average": None, "Last 5 games": 5, "Last 10 games": 10, "Last 20 games": 20}
 
+def run():
     # Functions
 
     def get_player_image_url(player_id):
@@ -27,26 +28,33 @@ def run():
     Start by selecting two players from the dropdowns below.'''
     st.markdown(header)
 
+    span = st.radio("Span", list(SPANS), horizontal=True)
+    directory = player_directory()
+
     ### Page layout
 
     col1, col2 = st.columns(2)
 
-    players = df["player_name"].tolist()
-    default_player_1 = "LeBron James"
-    default_player_2 = "Stephen Curry"
+    players = directory.names
 
     with col1:
-        selected_player_1 = st.selectbox("Select Player", players, index=players.index(default_player_1), key="player_1")
-        player_id_1 = df[df["player_name"] == selected_player_1]["player_id"].values[0]
+        selected_player_1 = st.selectbox("Select Player", players, index=directory.id_position(DEFAULT_PLAYER_IDS[0]), key="player_1")
+        player_id_1 = directory.id_of(selected_player_1)
         st.image(get_player_image_url(player_id_1))
 
 
     with col2:
-        selected_player_2 = st.selectbox("Select Player", players, index=players.index(default_player_2), key="player_2")
-        player_id_2 = df[df["player_name"] == selected_player_2]["player_id"].values[0]
+        selected_player_2 = st.selectbox("Select Player", players, index=directory.id_position(DEFAULT_PLAYER_IDS[1]), key="player_2")
+        player_id_2 = directory.id_of(selected_player_2)
         st.image(get_player_image_url(player_id_2))
 
 
+    # Only the two selected players' rows are fetched
+    df = compare([player_id_1, player_id_2], SPANS[span])
+    if len(df) < len({player_id_1, player_id_2}):
+        st.error("No stats for the selected players over this span.")
+        return
+
     ### Player stats comparison chart
     container = st.container()
 
@@ -57,14 +65,14 @@ def run():
         fig = go.Figure()
 
         fig.add_trace(go.Scatterpolar(
-            r=df[df["player_id"] == player_id_1][categories].values[0],
+            r=df.loc[player_id_1, categories].to_numpy(),
             theta=categories,
             fill='toself',
             fillcolor='rgba(0, 74, 255, 0.5)',
             name=selected_player_1
         ))
         fig.add_trace(go.Scatterpolar(
-            r=df[df["player_id"] == player_id_2][categories].values[0],
+            r=df.loc[player_id_2, categories].to_numpy(),
             theta=categories,
             fill='toself',
             fillcolor='rgba(255, 0, 0, 0.5)',
@@ -75,7 +83,7 @@ def run():
         polar=dict(
             radialaxis=dict(
             visible=True,
-            range=[0, df[df["player_id"].isin([player_id_1, player_id_2])][categories].max().max()]
+            range=[0, df[categories].to_numpy().max()]
             )),
         showlegend=False
         )
@@ -84,15 +92,11 @@ def run():
 
     ### Player stats comparison
 
-    player_1_df = df[df["player_id"] == player_id_1].drop(columns=["player_id", "player_name"]).T.reset_index()
-    player_1_df.columns = ["Per Game Stats", "Value_P1"]
-
-    player_2_df = df[df["player_id"] == player_id_2].drop(columns=["player_id", "player_name"]).T.reset_index()
-    player_2_df.columns = ["Per Game Stats", "Value_P2"]
-
-    # Merge DataFrames for side-by-side comparison
-    comparison_df = player_1_df.merge(player_2_df, on="Per Game Stats")
-    comparison_df = comparison_df[['Value_P1', 'Per Game Stats', 'Value_P2']]
+    comparison_df = pd.DataFrame({
+        "Value_P1": df.loc[player_id_1].to_numpy(),
+        "Per Game Stats": df.columns,
+        "Value_P2": df.loc[player_id_2].to_numpy(),
+    })
 
     # Apply conditional formatting
     def highlight_stats(row):
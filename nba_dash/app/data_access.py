@@ -0,0 +1,63 @@
+"""
+Typed, cached data access for the dashboard pages.
+Every function fetches only the rows and columns its page shows; results are cached per
+parameters and data version (see run_query). The SQL is built in queries.py.
+"""
+import pandas as pd
+from database_utils import run_query
+from dataset import load_dataset
+from queries import (
+    player_directory_query, team_directory_query, player_overview_query, leaderboard_query,
+    team_summary_query, compare_players_query, compare_teams_query
+)
+
+def player_directory(current_only=False):
+    """
+    Ids and names of every player with stats, as a shared Dataset for the pickers.
+    Args:
+        current_only (bool): Only players on a current roster.
+    """
+    sql, params = player_directory_query(current_only)
+    return load_dataset(sql, "player_id", "player_name", params=params)
+
+def team_directory():
+    """Ids and names of every team with stats, as a shared Dataset for the pickers."""
+    sql, params = team_directory_query()
+    return load_dataset(sql, "team_id", "team_name", params=params)
+
+def compare(player_ids, window=None) -> pd.DataFrame:
+    """
+    Per-game stats of just the given players, indexed by player_id.
+    Args:
+        player_ids (list): Players to compare.
+        window (int): Average over each player's last `window` games; None for every game.
+    """
+    if not player_ids:
+        return pd.DataFrame()
+    return run_query(*compare_players_query(player_ids, window)).set_index("player_id").astype("float64")
+
+def compare_teams(team_ids) -> pd.DataFrame:
+    """Per-game stats of just the given teams, indexed by team_id."""
+    if not team_ids:
+        return pd.DataFrame()
+    return run_query(*compare_teams_query(team_ids)).set_index("team_id").astype("float64")
+
+def player_averages(player_ids, window=None) -> pd.DataFrame:
+    """Player Overview rows (name, team, per-game averages) of the given players."""
+    if not player_ids:
+        return pd.DataFrame()
+    return run_query(*player_overview_query(player_ids, window))
+
+def leaderboard(stat, k=5, window=None) -> pd.DataFrame:
+    """
+    Player Overview rows of the top k players by a per-game stat.
+    Args:
+        stat (str): One of queries.OVERVIEW_STATS, e.g. 'avg_points'.
+        k (int): Number of players.
+        window (int): Rank over each player's last `window` games; None for every game.
+    """
+    return run_query(*leaderboard_query(stat, k, window))
+
+def team_summary() -> pd.DataFrame:
+    """Standings and hustle totals of every team, best record first."""
+    return run_query(*team_summary_query())
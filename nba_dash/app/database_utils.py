@@ -1,25 +1,132 @@
+import logging
 import os
-from dotenv import load_dotenv
-import mysql.connector
-from mysql.connector import Error
-
-# Load environment variables
-load_dotenv()
-
-# Database configuration
-DB_CONFIG = {
-    'user': os.environ.get('DB_USER'),
-    'password': os.environ.get('DB_PASSWORD'),
-    'host': os.environ.get('DB_HOST'),
-    'database': 'nba_db',
-    'raise_on_warnings': True
-}
-
-def get_database_connection():
+import threading
+import time
+import pandas as pd
+import streamlit as st
+from queries import DATA_VERSION_SQL, WARM_QUERIES, to_duckdb_sql
+
+logger = logging.getLogger(__name__)
+
+# Settings of the SQLAlchemy pool shared by every Streamlit session in this process
+POOL_SIZE = int(os.environ.get('DASH_POOL_SIZE', 5))
+POOL_MAX_OVERFLOW = int(os.environ.get('DASH_POOL_MAX_OVERFLOW', 5))
+POOL_RECYCLE = 3600
+
+# 'duckdb' serves the pages from the local copy kept by database/analytics_store.py
+READ_ENGINE = os.environ.get('DASH_READ_ENGINE', 'mysql').lower()
+DUCKDB_PATH = os.environ.get('NBA_DUCKDB_PATH') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'analytics', 'nba_dash.duckdb'
+)
+
+# Seconds between checks for a new data version; new data shows up on the pages within this delay
+VERSION_CHECK_SECONDS = int(os.environ.get('DASH_VERSION_CHECK_SECONDS', 60))
+
+def get_connection():
+    """
+    Return the dashboard's shared database connection.
+    st.connection caches one engine per set of arguments, so every page must come
+    through here to share a single bounded pool instead of opening its own.
+    Connections are health-checked (pre-ping) and recycled hourly.
+    """
+    return st.connection(
+        "sql",
+        type="sql",
+        driver="pymysql",
+        pool_size=POOL_SIZE,
+        max_overflow=POOL_MAX_OVERFLOW,
+        pool_pre_ping=True,
+        pool_recycle=POOL_RECYCLE,
+    )
+
+@st.cache_resource(max_entries=1)
+def get_duckdb_connection(version):
+    """Open the DuckDB copy read-only; a new version (file mtime) opens the freshly synced file."""
+    import duckdb
+    return duckdb.connect(DUCKDB_PATH, read_only=True)
+
+@st.cache_data(max_entries=64)
+def query_duckdb(sql, params, version):
+    # DuckDB connections are not shared between threads; each query gets its own cursor
+    cursor = get_duckdb_connection(version).cursor()
     try:
-        connection = mysql.connector.connect(**DB_CONFIG)
-        if connection.is_connected():
-            return connection
-    except Error as e:
-        print(f"Error connecting to MySQL: {e}")
-    return None
\ No newline at end of file
+        return cursor.execute(to_duckdb_sql(sql), params or {}).df()
+    finally:
+        cursor.close()
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def query_mysql(sql, params, version):
+    # ttl=0 leaves caching to this function, whose key includes the data version
+    return get_connection().query(sql, params=params, ttl=0)
+
+def use_duckdb():
+    return READ_ENGINE == 'duckdb' and os.path.exists(DUCKDB_PATH)
+
+def read_data_version():
+    """
+    Version of the data the pages read: the DuckDB file's mtime, which changes on every
+    sync, or the newest data_versions stamp written by ingestion in MySQL.
+    """
+    if use_duckdb():
+        return os.stat(DUCKDB_PATH).st_mtime_ns
+    version = get_connection().query(DATA_VERSION_SQL, ttl=0)['version'].iloc[0]
+    return None if pd.isna(version) else int(version)
+
+@st.cache_data(ttl=VERSION_CHECK_SECONDS, show_spinner=False)
+def cached_mysql_version():
+    try:
+        return read_data_version()
+    except Exception as e:
+        # e.g. a database not yet migrated to have data_versions; results then stay cached until a restart
+        logger.warning(f"Error reading the data version: {e}")
+        return None
+
+def data_version():
+    """Current data version; the MySQL stamp is read at most once every VERSION_CHECK_SECONDS."""
+    return read_data_version() if use_duckdb() else cached_mysql_version()
+
+def run_query(sql, params=None, version=None):
+    """
+    Run a page query and return a DataFrame.
+    With DASH_READ_ENGINE=duckdb the query runs in-process against the DuckDB copy, otherwise
+    it goes to MySQL. Results are cached per data version, so they are reused until new data lands.
+    Args:
+        sql (str): Query from queries.py.
+        params (dict): Values of its :name parameters.
+        version: Data version to cache under; defaults to the current one.
+    """
+    params = params or None
+    version = data_version() if version is None else version
+    if use_duckdb():
+        return query_duckdb(sql, params, version)
+    return query_mysql(sql, params, version)
+
+def warm_cache(version):
+    """Run the hot page queries so their results are cached before the first visitor asks."""
+    started_at = time.monotonic()
+    for sql, params in WARM_QUERIES:
+        run_query(sql, params, version)
+    logger.info(f"Warmed {len(WARM_QUERIES)} dashboard queries for data version {version} "
+                f"in {time.monotonic() - started_at:.2f} seconds")
+
+def watch_data_version():
+    last_version = None
+    while True:
+        try:
+            version = read_data_version()
+            if version != last_version:
+                warm_cache(version)
+                last_version = version
+        except Exception as e:
+            logger.error(f"Error warming the dashboard cache: {e}")
+        time.sleep(VERSION_CHECK_SECONDS)
+
+@st.cache_resource
+def start_cache_warmer():
+    """
+    Start one background thread per Streamlit process that checks the data version every
+    VERSION_CHECK_SECONDS and warms the caches as soon as a new version appears.
+    """
+    thread = threading.Thread(target=watch_data_version, name='dashboard-cache-warmer', daemon=True)
+    thread.start()
+    return thread
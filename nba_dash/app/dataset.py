@@ -0,0 +1,43 @@
+import streamlit as st
+from database_utils import run_query, data_version
+
+class Dataset:
+    """
+    Read-only ids and names of a picker query, shared by every session of the process.
+    Rows are looked up by id or name through dicts, so resolving a selection never scans the frame.
+    """
+
+    def __init__(self, df, id_column, name_column):
+        self.ids = df[id_column].tolist()
+        self.names = df[name_column].tolist()
+        self.position_by_id = {entity_id: position for position, entity_id in enumerate(self.ids)}
+        # The first row wins if two entities share a name, as list.index did
+        self.position_by_name = {}
+        for position, name in enumerate(self.names):
+            self.position_by_name.setdefault(name, position)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def id_position(self, entity_id, default=0):
+        """Position of an id in `ids` and `names`, e.g. for a selectbox index."""
+        return self.position_by_id.get(entity_id, default)
+
+    def id_of(self, name):
+        return self.ids[self.position_by_name[name]]
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def build_dataset(sql, params, id_column, name_column, version):
+    return Dataset(run_query(sql, params, version), id_column, name_column)
+
+def load_dataset(sql, id_column, name_column, params=None):
+    """
+    Return the process-wide Dataset of a page query for the current data version.
+    It is built once per version and query and shared by every session.
+    Args:
+        sql (str): Query from queries.py.
+        id_column (str): Column the rows are looked up by, e.g. 'player_id'.
+        name_column (str): Column shown in the pickers, e.g. 'player_name'.
+        params (dict): Values of its :name parameters.
+    """
+    return build_dataset(sql, params or None, id_column, name_column, data_version())
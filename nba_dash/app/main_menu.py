@@ -3,6 +3,7 @@ import team_dashboard
 import player_dashboard
 import dashboard
 import team_v_team
+from database_utils import start_cache_warmer
 
 def main():
 
@@ -10,6 +11,7 @@ def main():
     page_title="NBA Hustle Dashboard",
     page_icon=":basketball:"
 )
+    start_cache_warmer()
 
     menu = ["Team Overview", "Player Overview", "Player v Player", "Team v Team"]
     choice = st.sidebar.selectbox("Select Dashboard", menu)
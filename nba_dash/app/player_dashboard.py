@@ -1,41 +1,36 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+from data_access import player_directory, player_averages, leaderboard
+from queries import OVERVIEW_STATS
 
-conn = st.connection("sql", type="sql", driver="pymysql")
-
-def get_player_stats():
-    df = conn.query(
-        """
-        SELECT p.full_name as player_name, t.team_abbreviation,
-               AVG(h.pts) as avg_points, AVG(h.contested_shots) as avg_contested_shots,
-               AVG(h.deflections) as avg_deflections, AVG(h.charges_drawn) as avg_charges_drawn,
-               AVG(h.screen_assists) as avg_screen_assists, AVG(h.loose_balls_recovered) as avg_loose_balls_recovered
-        FROM players p
-        JOIN hustle_stats h ON p.player_id = h.player_id
-        JOIN teams t ON p.team_id = t.team_id
-        GROUP BY p.player_id
-        """
-    )
-    return df
+# Span options of the page; None averages every loaded season, numbers are player_form windows
+SPANS = {"Career average": None, "Last 5 games": 5, "Last 10 games": 10, "Last 20 games": 20}
 
 def run():
     st.title("NBA Player Overview")
     st.markdown("This dashboard allows you to compare hustle stats between NBA players.")
 
-    df = get_player_stats()
+    span = st.radio("Span", list(SPANS), horizontal=True)
+    window = SPANS[span]
+    directory = player_directory(current_only=True)
+    # The page opens on the top 5 scorers; only the selected players' rows are fetched
+    top_players = leaderboard('avg_points', 5, window)
 
-    if df.empty:
+    if not len(directory) or top_players.empty:
         st.error("Failed to load data. Please check your database connection.")
         return
 
     # Player filter
-    all_players = df['player_name'].tolist()
-    selected_players = st.multiselect("Select players to compare", all_players, default=all_players[:5])
-    filtered_df = df[df['player_name'].isin(selected_players)]
+    default_players = top_players['player_name'].tolist()
+    selected_players = st.multiselect("Select players to compare", directory.names, default=default_players)
+    if selected_players == default_players or not selected_players:
+        filtered_df = top_players[top_players['player_name'].isin(selected_players)]
+    else:
+        filtered_df = player_averages([directory.id_of(name) for name in selected_players], window)
 
     # Stat selection
-    stats = ['avg_points', 'avg_contested_shots', 'avg_deflections', 'avg_charges_drawn', 'avg_screen_assists', 'avg_loose_balls_recovered']
+    stats = OVERVIEW_STATS
     selected_stat = st.selectbox("Select Stat to Compare", stats)
 
     # Visualization
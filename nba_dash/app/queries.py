@@ -0,0 +1,200 @@
+"""SQL behind the dashboard pages, kept in one place so scripts/benchmark.py times exactly what the pages run."""
+import re
+
+# SQLAlchemy-style :name parameters
+NAMED_PARAMETER = re.compile(r"(?<!:):(\w+)")
+
+def to_duckdb_sql(sql):
+    """Translate a page query from MySQL to DuckDB: `quoted` identifiers and :name parameters become "quoted" and $name."""
+    return NAMED_PARAMETER.sub(r"$\1", sql.replace("`", '"'))
+
+def in_list(name, values):
+    """Expand values into :name_0, :name_1, ... placeholders for an IN (...) list. Returns (sql, params)."""
+    params = {f"{name}_{index}": value for index, value in enumerate(values)}
+    return ', '.join(f":{key}" for key in params), params
+
+# Players and teams the comparison pages open with
+DEFAULT_PLAYER_IDS = [2544, 201939]               # LeBron James, Stephen Curry
+DEFAULT_TEAM_IDS = [1610612747, 1610612744]       # Lakers, Warriors
+
+# Windows offered by the pages' "Span" options
+FORM_WINDOWS = [5, 10, 20]
+
+# Newest ingestion stamp; cached page results are keyed on it
+DATA_VERSION_SQL = "SELECT MAX(version) AS version FROM data_versions"
+
+# Pickers: ids and names only; current_only keeps players on a current roster, as the Player Overview shows
+PLAYER_DIRECTORY_SQL = """
+SELECT ps.player_id, p.full_name AS player_name
+FROM player_stats ps
+JOIN players p ON p.player_id = ps.player_id
+{teams_join}
+ORDER BY p.full_name
+"""
+
+TEAM_DIRECTORY_SQL = """
+SELECT ts.team_id, t.team_name
+FROM team_stats ts
+JOIN teams t ON t.team_id = ts.team_id
+ORDER BY t.team_name
+"""
+
+# Player Overview: per-game averages over every game
+PLAYER_OVERVIEW_SQL = """
+SELECT p.full_name as player_name, t.team_abbreviation,
+       ps.pts / ps.games_played as avg_points, ps.contested_shots / ps.games_played as avg_contested_shots,
+       ps.deflections / ps.games_played as avg_deflections, ps.charges_drawn / ps.games_played as avg_charges_drawn,
+       ps.screen_assists / ps.games_played as avg_screen_assists,
+       ps.loose_balls_recovered / ps.games_played as avg_loose_balls_recovered
+FROM player_stats ps
+JOIN players p ON p.player_id = ps.player_id
+JOIN teams t ON p.team_id = t.team_id
+WHERE {condition}
+"""
+
+# Player Overview: per-game averages over each player's last :window games played
+PLAYER_OVERVIEW_FORM_SQL = """
+SELECT p.full_name as player_name, t.team_abbreviation,
+       f.pts / f.games as avg_points, f.contested_shots / f.games as avg_contested_shots,
+       f.deflections / f.games as avg_deflections, f.charges_drawn / f.games as avg_charges_drawn,
+       f.screen_assists / f.games as avg_screen_assists,
+       f.loose_balls_recovered / f.games as avg_loose_balls_recovered
+FROM player_form f
+JOIN players p ON p.player_id = f.player_id
+JOIN teams t ON p.team_id = t.team_id
+WHERE f.window_size = :window AND {condition}
+"""
+
+# Stats a leaderboard can rank by (columns of the Player Overview queries)
+OVERVIEW_STATS = ['avg_points', 'avg_contested_shots', 'avg_deflections', 'avg_charges_drawn',
+                  'avg_screen_assists', 'avg_loose_balls_recovered']
+
+# Team Overview: standings and hustle totals
+TEAM_OVERVIEW_SQL = """
+SELECT t.team_name, t.team_abbreviation, t.wins, t.losses, t.win_pct,
+       ts.deflections as total_deflections,
+       ts.charges_drawn as total_charges_drawn,
+       ts.screen_assists as total_screen_assists,
+       ts.loose_balls_recovered as total_loose_balls_recovered
+FROM teams t
+JOIN team_stats ts ON t.team_id = ts.team_id
+ORDER BY t.win_pct DESC
+"""
+
+# Player v Player: per-game stats over every game of the selected players
+PLAYER_COMPARISON_SQL = """
+SELECT ps.player_id,
+       ROUND(ps.pts / ps.games_played, 1) AS `Points`,
+       ROUND(ps.contested_shots / ps.games_played, 1) AS `Contested Shots`,
+       ROUND(ps.contested_shots_2pt / ps.games_played, 1) AS `Contested 2PT Shots`,
+       ROUND(ps.contested_shots_3pt / ps.games_played, 1) AS `Contested 3PT Shots`,
+       ROUND(ps.deflections / ps.games_played, 1) AS `Deflections`,
+       ROUND(ps.charges_drawn / ps.games_played, 1) AS `Charges Drawn`,
+       ROUND(ps.screen_assists / ps.games_played, 1) AS `Screen Assists`,
+       ROUND(ps.screen_ast_pts / ps.games_played, 1) AS `Screen Assist Points`,
+       ROUND(ps.loose_balls_recovered / ps.games_played, 1) AS `Loose Balls Recovered`,
+       ROUND(ps.boxouts / ps.games_played, 1) AS `Boxouts`
+FROM player_stats ps
+WHERE ps.player_id IN ({player_ids})
+"""
+
+# Player v Player: per-game stats over the selected players' last :window games played
+PLAYER_COMPARISON_FORM_SQL = """
+SELECT f.player_id,
+       ROUND(f.pts / f.games, 1) AS `Points`,
+       ROUND(f.contested_shots / f.games, 1) AS `Contested Shots`,
+       ROUND(f.deflections / f.games, 1) AS `Deflections`,
+       ROUND(f.charges_drawn / f.games, 1) AS `Charges Drawn`,
+       ROUND(f.screen_assists / f.games, 1) AS `Screen Assists`,
+       ROUND(f.loose_balls_recovered / f.games, 1) AS `Loose Balls Recovered`,
+       ROUND(f.boxouts / f.games, 1) AS `Boxouts`
+FROM player_form f
+WHERE f.window_size = :window AND f.player_id IN ({player_ids})
+"""
+
+# Team v Team: per-game stats of the selected teams
+TEAM_COMPARISON_SQL = """
+SELECT ts.team_id,
+       ROUND(ts.pts / ts.games_played, 1) AS `Points`,
+       ROUND(ts.contested_shots / ts.games_played, 1) AS `Contested Shots`,
+       ROUND(ts.contested_shots_3pt / ts.games_played, 1) AS `Contested 3PT Shots`,
+       ROUND(ts.deflections / ts.games_played, 1) AS `Deflections`,
+       ROUND(ts.charges_drawn / ts.games_played, 1) AS `Charges Drawn`,
+       ROUND(ts.screen_assists / ts.games_played, 1) AS `Screen Assists`,
+       ROUND(ts.loose_balls_recovered / ts.games_played, 1) AS `Loose Balls Recovered`,
+       ROUND(ts.boxouts / ts.games_played, 1) AS `Boxouts`
+FROM team_stats ts
+WHERE ts.team_id IN ({team_ids})
+"""
+
+# Query builders: each returns (sql, params) for exactly the rows and columns a page shows.
+# Id lists are de-duplicated and sorted, so the same selection always hits the same cache entry.
+
+def player_directory_query(current_only=False):
+    teams_join = "JOIN teams t ON p.team_id = t.team_id" if current_only else ""
+    return PLAYER_DIRECTORY_SQL.format(teams_join=teams_join), None
+
+def team_directory_query():
+    return TEAM_DIRECTORY_SQL, None
+
+def player_overview_query(player_ids=None, window=None, order_by=None, limit=None):
+    """Player Overview rows of the given players (all players if None), optionally ranked and cut to `limit`."""
+    alias = 'f' if window else 'ps'
+    params = {'window': window} if window else {}
+    condition = "TRUE"
+    if player_ids is not None:
+        placeholders, id_params = in_list('player_id', sorted(set(player_ids)))
+        condition = f"{alias}.player_id IN ({placeholders})"
+        params.update(id_params)
+    sql = (PLAYER_OVERVIEW_FORM_SQL if window else PLAYER_OVERVIEW_SQL).format(condition=condition)
+    if order_by:
+        if order_by not in OVERVIEW_STATS:
+            raise ValueError(f"Unknown stat {order_by!r}; expected one of {', '.join(OVERVIEW_STATS)}")
+        sql += f"ORDER BY {order_by} DESC, player_name\n"
+    if limit:
+        sql += "LIMIT :limit\n"
+        params['limit'] = int(limit)
+    return sql, params or None
+
+def leaderboard_query(stat, k=5, window=None):
+    return player_overview_query(window=window, order_by=stat, limit=k)
+
+def team_summary_query():
+    return TEAM_OVERVIEW_SQL, None
+
+def compare_players_query(player_ids, window=None):
+    placeholders, params = in_list('player_id', sorted(set(player_ids)))
+    if window:
+        params['window'] = window
+        return PLAYER_COMPARISON_FORM_SQL.format(player_ids=placeholders), params
+    return PLAYER_COMPARISON_SQL.format(player_ids=placeholders), params
+
+def compare_teams_query(team_ids):
+    placeholders, params = in_list('team_id', sorted(set(team_ids)))
+    return TEAM_COMPARISON_SQL.format(team_ids=placeholders), params
+
+# Dashboard queries as the pages run them on first load: (name, sql, params); scripts/benchmark.py times these
+DASHBOARD_QUERIES = [
+    ('player directory', *player_directory_query()),
+    ('player overview top 5', *leaderboard_query('avg_points', 5)),
+    ('player overview top 5 (last 10)', *leaderboard_query('avg_points', 5, window=10)),
+    ('player overview (2 players)', *player_overview_query(DEFAULT_PLAYER_IDS)),
+    ('team overview', *team_summary_query()),
+    ('player v player', *compare_players_query(DEFAULT_PLAYER_IDS)),
+    ('player v player (last 10)', *compare_players_query(DEFAULT_PLAYER_IDS, window=10)),
+    ('team directory', *team_directory_query()),
+    ('team v team', *compare_teams_query(DEFAULT_TEAM_IDS)),
+]
+
+# Queries run as soon as a new data version is seen: every page's opening view, for each span
+WARM_QUERIES = [
+    player_directory_query(),
+    player_directory_query(current_only=True),
+    team_directory_query(),
+    team_summary_query(),
+    compare_teams_query(DEFAULT_TEAM_IDS),
+] + [
+    query
+    for window in [None] + FORM_WINDOWS
+    for query in (leaderboard_query('avg_points', 5, window), compare_players_query(DEFAULT_PLAYER_IDS, window))
+]
@@ -1,31 +1,13 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-
-
-def get_team_stats():
-    conn = conn = st.connection("sql", type="sql", driver="pymysql")
-
-    df = conn.query(
-        """
-        SELECT t.team_name, t.team_abbreviation, t.wins, t.losses, t.win_pct,
-               SUM(h.deflections) as total_deflections,
-               SUM(h.charges_drawn) as total_charges_drawn,
-               SUM(h.screen_assists) as total_screen_assists,
-               SUM(h.loose_balls_recovered) as total_loose_balls_recovered
-        FROM teams t
-        JOIN hustle_stats h ON t.team_id = h.team_id
-        GROUP BY t.team_id
-        """
-    )
-     
-    return df
+from data_access import team_summary
 
 def run():
     st.title("NBA Team Dashboard")
     st.markdown("This dashboard allows you to compare hustle stats between NBA teams.")
 
-    df = get_team_stats()
+    df = team_summary()
 
     if df.empty:
         st.error("Failed to load data. Please check your database connection.")
@@ -33,8 +15,8 @@ def run():
 
     # Team Win Percentage
     st.subheader("Team Win Percentage")
-    win_bar = df.sort_values(by='win_pct', ascending=False)
-    fig = px.bar(win_bar, x='team_abbreviation', y='win_pct', color='team_name',
+    # team_summary() is already ordered by win percentage
+    fig = px.bar(df, x='team_abbreviation', y='win_pct', color='team_name',
                  labels={'win_pct': 'Win Percentage', 'team_abbreviation': 'Team'},
                  hover_data=['wins', 'losses'])
     st.plotly_chart(fig)
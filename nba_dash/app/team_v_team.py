@@ -2,13 +2,13 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
+from data_access import team_directory, compare_teams
+from queries import DEFAULT_TEAM_IDS
 
 
 ### Data loading
 def run():
-    conn = st.connection("sql", type = "sql")
-
-    df = conn.query("SELECT * FROM team_stats")
+    directory = team_directory()
 
     # Functions
 
@@ -25,40 +25,41 @@ def run():
 
     col1, col2 = st.columns(2)
 
-    teams = df["team_name"].tolist()
-    default_team_1 = "Lakers"
-    default_team_2 = "Warriors"
+    teams = directory.names
 
     with col1:
-        selected_team_1 = st.selectbox("Select Team", teams, index=teams.index(default_team_1), key="player_1")
-        team_id_1 = df[df["team_name"] == selected_team_1]["team_id"].values[0]
+        selected_team_1 = st.selectbox("Select Team", teams, index=directory.id_position(DEFAULT_TEAM_IDS[0]), key="player_1")
+        team_id_1 = directory.id_of(selected_team_1)
         st.image(get_team_image_url(team_id_1), width = 100)
 
 
     with col2:
-        selected_team_2 = st.selectbox("Select Team", teams, index=teams.index(default_team_2), key="player_2")
-        team_id_2 = df[df["team_name"] == selected_team_2]["team_id"].values[0]
+        selected_team_2 = st.selectbox("Select Team", teams, index=directory.id_position(DEFAULT_TEAM_IDS[1]), key="player_2")
+        team_id_2 = directory.id_of(selected_team_2)
         st.image(get_team_image_url(team_id_2), width = 100)
 
 
+    # Only the two selected teams' rows are fetched
+    df = compare_teams([team_id_1, team_id_2])
+
     ### Player stats comparison chart
     container = st.container()
 
     with container:
 
-        categories = ['Points Contested Shots 3pt', 'Deflections', 'Boxouts', 'Screen Assists', 'Loose Balls Recovered']
+        categories = ['Contested 3PT Shots', 'Deflections', 'Boxouts', 'Screen Assists', 'Loose Balls Recovered']
 
         fig = go.Figure()
 
         fig.add_trace(go.Scatterpolar(
-            r=df[df["team_id"] == team_id_1][categories].values[0],
+            r=df.loc[team_id_1, categories].to_numpy(),
             theta=categories,
             fill='toself',
             fillcolor='rgba(0, 74, 255, 0.5)',
             name=selected_team_1
         ))
         fig.add_trace(go.Scatterpolar(
-            r=df[df["team_id"] == team_id_2][categories].values[0],
+            r=df.loc[team_id_2, categories].to_numpy(),
             theta=categories,
             fill='toself',
             fillcolor='rgba(255, 0, 0, 0.5)',
@@ -69,7 +70,7 @@ def run():
         polar=dict(
             radialaxis=dict(
             visible=True,
-            range=[0, df[df["team_id"].isin([team_id_1, team_id_2])][categories].max().max()]
+            range=[0, df[categories].to_numpy().max()]
             )),
         showlegend=False
         )
@@ -78,15 +79,11 @@ def run():
 
     ### Player stats comparison
 
-    team_1_df = df[df["team_id"] == team_id_1].drop(columns=["team_id", "team_name"]).T.reset_index()
-    team_1_df.columns = ["Per Game Stats", "Value_P1"]
-
-    team_2_df = df[df["team_id"] == team_id_2].drop(columns=["team_id", "team_name"]).T.reset_index()
-    team_2_df.columns = ["Per Game Stats", "Value_P2"]
-
-    # Merge DataFrames for side-by-side comparison
-    comparison_df = team_1_df.merge(team_2_df, on="Per Game Stats")
-    comparison_df = comparison_df[['Value_P1', 'Per Game Stats', 'Value_P2']]
+    comparison_df = pd.DataFrame({
+        "Value_P1": df.loc[team_id_1].to_numpy(),
+        "Per Game Stats": df.columns,
+        "Value_P2": df.loc[team_id_2].to_numpy(),
+    })
 
     # Apply conditional formatting
     def highlight_stats(row):
@@ -1,22 +1,89 @@
-from .fetch_teams import fetch_teams
-from .fetch_players import fetch_players
-from .fetch_hustle_stats import fetch_hustle_stats
+from .fetch_teams import fetch_teams, fetch_team_rows, write_teams
+from .fetch_players import fetch_players, fetch_player_rows, write_players
+from .fetch_hustle_stats import fetch_hustle_stats, register_recent_games, ingest_planned_games
+from .seasons import CURRENT_SEASON, season_start_year
+from .task_graph import Task, run_tasks, select_tasks
+from . import metrics
+from database.aggregates import refresh_aggregates
+from database.partitions import ensure_partitions
+from database.analytics_store import sync_analytics_store, READ_ENGINE
+from database.data_version import stamp_data_version
 
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
-def run_data_ingestion():
-    try:
-        logger.info("Fetching recent teams data...")
-        fetch_teams()
+# Number of ingestion tasks allowed to run at the same time
+TASK_WORKERS = int(os.environ.get('NBA_TASK_WORKERS', 3))
 
-        logger.info("Fetching recent players data...")
-        fetch_players()
+# Tasks that change what the dashboard reads; fetches and partition DDL do not
+DATA_TASKS = {'teams', 'players', 'hustle_stats', 'aggregates', 'analytics_sync'}
 
-        logger.info("Fetching recent hustle stats...")
-        fetch_hustle_stats()
+def build_ingestion_tasks(season=CURRENT_SEASON, days_back=7):
+    """
+    Describe the daily update as a task graph.
+    API fetches have no dependencies and run in parallel; players are written after
+    teams because players.team_id references teams. Aggregates are refreshed last for
+    the games written by this or any earlier run. With the DuckDB read path enabled the
+    dashboard copy is synced once everything else is written.
+    """
+    tasks = [
+        Task('teams_fetch', lambda inputs: fetch_team_rows(season), retries=2, timeout=5 * 60),
+        Task('players_fetch', lambda inputs: fetch_player_rows(season), retries=2, timeout=5 * 60),
+        Task('games_register', lambda inputs: register_recent_games(days_back), retries=2, timeout=5 * 60),
+        Task('teams', lambda inputs: write_teams(inputs['teams_fetch']),
+             depends_on=['teams_fetch'], retries=1, timeout=5 * 60),
+        Task('players', lambda inputs: write_players(inputs['players_fetch']),
+             depends_on=['teams', 'players_fetch'], retries=1, timeout=5 * 60),
+        Task('partitions', lambda inputs: ensure_partitions(season_start_year(season)), retries=1, timeout=10 * 60),
+        Task('hustle_stats', lambda inputs: ingest_planned_games(),
+             depends_on=['games_register', 'partitions'], timeout=3 * 60 * 60),
+        Task('aggregates', lambda inputs: refresh_aggregates(),
+             depends_on=['hustle_stats'], retries=1, timeout=10 * 60),
+    ]
+    if READ_ENGINE == 'duckdb':
+        tasks.append(Task('analytics_sync', lambda inputs: sync_analytics_store(),
+                          depends_on=['teams', 'players', 'aggregates'], retries=1, timeout=30 * 60))
+    return tasks
 
-        logger.info("Data ingestion completed successfully!")
+def run_data_ingestion(tasks=None):
+    """
+    Run the ingestion task graph.
+    Args:
+        tasks (list): Task names to run, e.g. ['players'] to re-run a failed step. Their
+                      dependencies run too; None runs everything.
+    Returns:
+        dict: Teams and players change summaries plus the names of failed tasks under 'failed'.
+    A new data version is stamped at the end if any write or aggregate task finished.
+    """
+    graph = build_ingestion_tasks()
+    if tasks:
+        graph = select_tasks(graph, tasks)
+
+    status = 'success'
+    metrics.start_run('daily_update')
+    try:
+        results, errors = run_tasks(graph, max_workers=TASK_WORKERS)
     except Exception as e:
-        logger.error(f"An error occurred during data ingestion: {e}")
\ No newline at end of file
+        logger.error(f"An error occurred during data ingestion: {e}")
+        results, errors = {}, {task.name: e for task in graph}
+
+    skipped = [task.name for task in graph if task.name not in results and task.name not in errors]
+    failed = list(errors) + skipped
+    if failed:
+        status = 'partial' if results else 'failed'
+        logger.error(f"Data ingestion finished with failed tasks: {', '.join(failed)}. "
+                     f"Re-run them with: python -m scripts.update {' '.join(failed)}")
+    else:
+        logger.info("Data ingestion completed successfully!")
+    # A finished write may have changed rows; a new version makes the dashboard drop and re-warm its caches
+    if DATA_TASKS.intersection(results):
+        stamp_data_version('daily_update')
+    metrics.finish_run(status)
+
+    return {
+        'teams': results.get('teams'),
+        'players': results.get('players'),
+        'failed': failed,
+    }
@@ -0,0 +1,124 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from nba_api.stats.library.http import NBAStatsResponse
+from data_ingestion.http_transport import request_endpoint
+from data_ingestion import metrics
+
+logging.basicConfig(level=logging.INFO)
+
+CACHE_DIR = os.environ.get('NBA_API_CACHE_DIR') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache'
+)
+
+# Seconds a cached response stays fresh per endpoint; None never expires
+ENDPOINT_TTLS = {
+    'HustleStatsBoxScore': None,
+    'LeagueGameFinder': 60 * 60,
+    'LeagueStandings': 6 * 60 * 60,
+    'CommonAllPlayers': 12 * 60 * 60,
+}
+
+# Box scores of games that may still be corrected are only trusted for an hour
+PROVISIONAL_BOX_SCORE_TTL = 60 * 60
+
+# When offline, every call is served from the cache (expired entries included) and misses raise
+OFFLINE = os.environ.get('NBA_API_OFFLINE', '').lower() in ('1', 'true', 'yes')
+
+class CacheMiss(Exception):
+    pass
+
+def set_offline(offline):
+    global OFFLINE
+    OFFLINE = offline
+
+def cache_key(endpoint_name, params):
+    """Content key of a request: the endpoint name plus its sorted parameters."""
+    payload = json.dumps({'endpoint': endpoint_name, 'params': params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def cache_path(endpoint_name, key):
+    return os.path.join(CACHE_DIR, endpoint_name, f"{key}.json.gz")
+
+def read_entry(path):
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+def write_entry(path, entry):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, path)
+
+def to_normalized_dict(raw_json):
+    """Rebuild nba_api's normalized dict from a raw response body."""
+    return NBAStatsResponse(response=raw_json, status_code=200, url=None).get_normalized_dict()
+
+def has_rows(raw_json):
+    result_sets = json.loads(raw_json).get('resultSets', [])
+    if isinstance(result_sets, dict):
+        result_sets = [result_sets]
+    return any(result_set.get('rowSet') for result_set in result_sets)
+
+def fetch_endpoint(endpoint_class, ttl='default', timeout=60, final=True, **params):
+    """
+    Call an nba_api endpoint through the on-disk cache and return its normalized dict.
+    Args:
+        endpoint_class: nba_api endpoint class, e.g. HustleStatsBoxScore.
+        ttl (int): Freshness in seconds for this call. 'default' uses ENDPOINT_TTLS, None never expires.
+        timeout (int): Request timeout in seconds on a cache miss; retries are handled by the transport.
+        final (bool): Whether the response can no longer change. With ttl None, only entries
+                      stored as final are served forever; a provisional entry is fetched again.
+        **params: Endpoint parameters; they make up the cache key.
+    """
+    endpoint_name = endpoint_class.__name__
+    if ttl == 'default':
+        ttl = ENDPOINT_TTLS.get(endpoint_name)
+
+    path = cache_path(endpoint_name, cache_key(endpoint_name, params))
+    if os.path.exists(path):
+        entry = read_entry(path)
+        if ttl is None:
+            # Entries without the flag predate it and may hold provisional data
+            fresh = entry.get('final', False)
+        else:
+            fresh = time.time() - entry['fetched_at'] < ttl
+        if OFFLINE or fresh:
+            metrics.current().increment('cache_hit', endpoint_name)
+            return to_normalized_dict(entry['response'])
+
+    if OFFLINE:
+        raise CacheMiss(f"No cached {endpoint_name} response for {params}")
+
+    endpoint = request_endpoint(endpoint_class, timeout=timeout, **params)
+    raw_json = endpoint.nba_response.get_json()
+
+    # Empty responses usually mean the data is not published yet, so they are not kept
+    if has_rows(raw_json):
+        write_entry(path, {
+            'endpoint': endpoint_name,
+            'params': params,
+            'fetched_at': time.time(),
+            'final': final,
+            'response': raw_json,
+        })
+    return to_normalized_dict(raw_json)
+
+def iter_cached(endpoint_name):
+    """Yield (params, normalized dict) for every cached response of an endpoint."""
+    endpoint_dir = os.path.join(CACHE_DIR, endpoint_name)
+    if not os.path.isdir(endpoint_dir):
+        return
+    for file_name in sorted(os.listdir(endpoint_dir)):
+        if not file_name.endswith('.json.gz'):
+            continue
+        try:
+            entry = read_entry(os.path.join(endpoint_dir, file_name))
+        except (OSError, ValueError) as e:
+            logging.warning(f"Skipping unreadable cache entry {file_name}: {e}")
+            continue
+        yield entry['params'], to_normalized_dict(entry['response'])
@@ -0,0 +1,47 @@
+import hashlib
+import json
+import logging
+from database.config import get_db_connection
+
+logging.basicConfig(level=logging.INFO)
+
+def normalize_value(value):
+    # FLOAT columns come back with binary noise (0.709 -> 0.7090000...), so compare rounded
+    if isinstance(value, float):
+        return round(value, 3)
+    if value == '':
+        return None
+    return value
+
+def row_hash(row):
+    """Stable hash of a row's normalized values."""
+    payload = json.dumps([normalize_value(value) for value in row], default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def load_stored_rows(table, columns):
+    """Return {key: row} for the stored rows of a table; the first column is the key."""
+    connection = None
+    try:
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        cursor.execute(f"SELECT {', '.join(columns)} FROM {table}")
+        return {row[0]: tuple(row) for row in cursor.fetchall()}
+    finally:
+        if connection:
+            connection.close()
+
+def diff_rows(incoming_rows, stored_rows):
+    """
+    Compare incoming rows with stored rows by hash; the first value of each row is its key.
+    Returns:
+        tuple: (inserted, changed) lists. changed holds (stored_row, incoming_row) pairs.
+    """
+    inserted = []
+    changed = []
+    for row in incoming_rows:
+        stored = stored_rows.get(row[0])
+        if stored is None:
+            inserted.append(row)
+        elif row_hash(stored) != row_hash(row):
+            changed.append((stored, row))
+    return inserted, changed
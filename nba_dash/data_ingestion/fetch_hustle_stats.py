@@ -1,173 +1,376 @@
 import logging
+import os
+import queue
+import threading
 import time
-import random
-from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from datetime import date, datetime, timedelta
 from nba_api.stats.endpoints import HustleStatsBoxScore, LeagueGameFinder
-from requests.exceptions import Timeout, ConnectionError
-from database.config import get_db_connection
+from database.bulk_load import bulk_upsert
+from database.games import upsert_games, season_of_game
+from data_ingestion import metrics
+from data_ingestion.api_cache import fetch_endpoint, PROVISIONAL_BOX_SCORE_TTL
+from data_ingestion.game_manifest import (
+    dedupe_games, register_games, get_games_to_fetch, mark_games_fetched, mark_games_failed,
+    FINAL_AFTER_DAYS
+)
 
 logging.basicConfig(level=logging.INFO)
 
-def fetch_game_with_retry(game_id, max_retries=3, base_delay=2):
-    for attempt in range(max_retries):
-        try:
-            time.sleep(base_delay + random.uniform(0, 1))
-            
-            game_data = HustleStatsBoxScore(
-                game_id=str(game_id),
-                timeout=60
-            ).get_normalized_dict()
-            
-            if 'PlayerStats' not in game_data or not isinstance(game_data['PlayerStats'], list):
-                raise ValueError(f"Invalid data format for game {game_id}")
-                
-            return game_data['PlayerStats']
-            
-        except (Timeout, ConnectionError) as e:
-            delay = base_delay * (2 ** attempt) + random.uniform(0, 1)
-            logging.warning(f"Attempt {attempt + 1}/{max_retries} failed for game {game_id}. "
-                          f"Retrying in {delay:.2f} seconds... Error: {e}")
-            time.sleep(delay)
+# Number of box scores fetched concurrently; overall request rate is capped by the shared limiter
+DEFAULT_WORKERS = int(os.environ.get('NBA_FETCH_WORKERS', 4))
+
+# Capacity of the queues between pipeline stages; a full queue blocks the stage feeding it
+DEFAULT_QUEUE_SIZE = int(os.environ.get('NBA_PIPELINE_QUEUE_SIZE', 16))
+
+# Marks the end of a pipeline queue
+END_OF_STREAM = object()
+
+# HustleStatsBoxScore PlayerStats counters and their hustle_stats columns
+COUNTER_COLUMNS = {
+    'PTS': 'pts',
+    'CONTESTED_SHOTS': 'contested_shots',
+    'CONTESTED_SHOTS_2PT': 'contested_shots_2pt',
+    'CONTESTED_SHOTS_3PT': 'contested_shots_3pt',
+    'DEFLECTIONS': 'deflections',
+    'CHARGES_DRAWN': 'charges_drawn',
+    'SCREEN_ASSISTS': 'screen_assists',
+    'SCREEN_AST_PTS': 'screen_ast_pts',
+    'OFF_LOOSE_BALLS_RECOVERED': 'off_loose_balls_recovered',
+    'DEF_LOOSE_BALLS_RECOVERED': 'def_loose_balls_recovered',
+    'LOOSE_BALLS_RECOVERED': 'loose_balls_recovered',
+    'OFF_BOXOUTS': 'off_boxouts',
+    'DEF_BOXOUTS': 'def_boxouts',
+    'BOX_OUTS': 'boxouts',
+}
+
+# Matchups and seasons live in the games table
+HUSTLE_STATS_COLUMNS = [
+    'game_id', 'team_id', 'player_id', 'game_date', 'minutes'
+] + list(COUNTER_COLUMNS.values())
+
+NBA_TEAM_IDS = set(range(1610612737, 1610612767))
+
+# Columns refreshed when a (game_id, player_id) row is ingested again
+HUSTLE_STATS_UPDATE_COLUMNS = ['team_id', 'minutes'] + list(COUNTER_COLUMNS.values())
+
+def fetch_game(game_id, final=False):
+    """
+    Fetch a game's HustleStatsBoxScore PlayerStats.
+    Transient errors and throttling are retried by the shared HTTP transport.
+    Args:
+        game_id: NBA game ID; zero-padded to 10 digits.
+        final (bool): Final box scores are served from the cache forever, once fetched as final.
+    """
+    game_data = fetch_endpoint(
+        HustleStatsBoxScore,
+        ttl=None if final else PROVISIONAL_BOX_SCORE_TTL,
+        final=final,
+        game_id=str(game_id).zfill(10)
+    )
+
+    if 'PlayerStats' not in game_data or not isinstance(game_data['PlayerStats'], list):
+        raise ValueError(f"Invalid data format for game {game_id}")
+
+    return game_data['PlayerStats']
+
+def parse_game_finder_results(all_games):
+    """Turn LeagueGameFinderResults into (game_id, game_date, matchup) rows for NBA teams."""
+    games = [game for game in all_games if game.get('TEAM_ID') in NBA_TEAM_IDS]
     
-    raise Exception(f"Failed to fetch game {game_id} after {max_retries} attempts")
+    return [
+        (str(game['GAME_ID']), datetime.strptime(game['GAME_DATE'], '%Y-%m-%d').date(), game['MATCHUP'])
+        for game in games
+    ]
+
+def parse_game_dimension(all_games):
+    """Turn LeagueGameFinderResults into games rows; the home team's row reads "vs.", the away team's "@"."""
+    games = {}
+    for game in all_games:
+        if game.get('TEAM_ID') not in NBA_TEAM_IDS:
+            continue
+        game_id = int(game['GAME_ID'])
+        row = games.setdefault(game_id, [
+            game_id, datetime.strptime(game['GAME_DATE'], '%Y-%m-%d').date(), season_of_game(game_id), None, None
+        ])
+        row[3 if 'vs.' in game['MATCHUP'] else 4] = game['TEAM_ID']
+    return [tuple(row) for row in games.values()]
+
+def query_game_finder(**params):
+    """Run LeagueGameFinder, record its games and return (game_id, game_date, matchup) rows for NBA teams."""
+    all_games = fetch_endpoint(
+        LeagueGameFinder,
+        league_id_nullable='00',
+        **params
+    )['LeagueGameFinderResults']
+
+    upsert_games(parse_game_dimension(all_games))
+    return parse_game_finder_results(all_games)
 
 def fetch_game_ids(days_back):
-    try:
-        nba_team_ids = set(range(1610612737, 1610612767))
+    """Fetch the games of the last `days_back` days. API and database errors propagate to the caller."""
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=days_back)
 
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days_back)
+    game_data = query_game_finder(
+        date_from_nullable=start_date.strftime('%m/%d/%Y'),
+        date_to_nullable=end_date.strftime('%m/%d/%Y')
+    )
 
-        all_games = LeagueGameFinder(
-            date_from_nullable=start_date.strftime('%m/%d/%Y'),
-            date_to_nullable=end_date.strftime('%m/%d/%Y'),
-            timeout=60
-        ).get_normalized_dict()['LeagueGameFinderResults']
+    logging.info(f"Fetched {len(game_data)} recent game IDs successfully.")
+    return game_data
 
-        games = [game for game in all_games if game.get('TEAM_ID') in nba_team_ids]
-        
-        game_data = [
-            (str(game['GAME_ID']), datetime.strptime(game['GAME_DATE'], '%Y-%m-%d').date(), game['MATCHUP'])
-            for game in games
-        ]
+def fetch_season_game_ids(season, season_type='Regular Season'):
+    """Fetch every game ID of a season, e.g. "2019-20"."""
+    try:
+        game_data = query_game_finder(
+            season_nullable=season,
+            season_type_nullable=season_type
+        )
         
-        logging.info(f"Fetched {len(game_data)} recent game IDs successfully.")
+        logging.info(f"Fetched {len(game_data)} game IDs for season {season} successfully.")
 
         return game_data
     
     except Exception as e:
-        logging.error(f"Error fetching game IDs: {e}")
+        logging.error(f"Error fetching game IDs for season {season}: {e}")
         return []
 
 def insert_hustle_stats_batch(stats_list):
-    if not stats_list:
+    """Upsert hustle stats rows (list of tuples or DataFrame) through the bulk loader."""
+    if stats_list is None or len(stats_list) == 0:
         logging.warning("No stats to insert")
-        return
-        
-    connection = None
+        return False
+
+    started_at = time.monotonic()
     try:
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        sql = """
-        INSERT INTO hustle_stats (
-            game_id, team_id, player_id, game_date, matchup, minutes, pts,
-            contested_shots, contested_shots_2pt, contested_shots_3pt,
-            deflections, charges_drawn, screen_assists, screen_ast_pts,
-            off_loose_balls_recovered, def_loose_balls_recovered,
-            loose_balls_recovered, off_boxouts, def_boxouts, boxouts
-        )
-        VALUES (
-            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-        )
-        ON DUPLICATE KEY UPDATE 
-            team_id = VALUES(team_id),
-            minutes = VALUES(minutes),
-            pts = VALUES(pts),
-            contested_shots = VALUES(contested_shots),
-            contested_shots_2pt = VALUES(contested_shots_2pt),
-            contested_shots_3pt = VALUES(contested_shots_3pt),
-            deflections = VALUES(deflections),
-            charges_drawn = VALUES(charges_drawn),
-            screen_assists = VALUES(screen_assists),
-            screen_ast_pts = VALUES(screen_ast_pts),
-            off_loose_balls_recovered = VALUES(off_loose_balls_recovered),
-            def_loose_balls_recovered = VALUES(def_loose_balls_recovered),
-            loose_balls_recovered = VALUES(loose_balls_recovered),
-            off_boxouts = VALUES(off_boxouts),
-            def_boxouts = VALUES(def_boxouts),
-            boxouts = VALUES(boxouts)
-        """
-        cursor.executemany(sql, stats_list)
-        connection.commit()
+        bulk_upsert('hustle_stats', HUSTLE_STATS_COLUMNS, HUSTLE_STATS_UPDATE_COLUMNS, stats_list)
+        metrics.current().record_write('hustle_stats', len(stats_list), time.monotonic() - started_at)
         logging.info(f"Inserted {len(stats_list)} hustle stats records successfully.")
+        return True
     except Exception as e:
+        metrics.current().increment('write_failure', 'hustle_stats')
         logging.error(f"Error inserting hustle stats: {e}")
-        if connection:
-            connection.rollback()
-    finally:
-        if connection:
-            connection.close()
-
-def fetch_hustle_stats(days_back=7):
-    game_data_list = fetch_game_ids(days_back)
+        return False
+
+def transform_player_stats_batch(games):
+    """
+    Convert the PlayerStats of several games into one hustle_stats frame, column by column.
+    Args:
+        games (list): (game_id, game_date, matchup, player_stats) tuples.
+    Returns:
+        pandas.DataFrame: One row per player in HUSTLE_STATS_COLUMNS order, with compact integer dtypes.
+    """
+    records = [player for _, _, _, player_stats in games for player in player_stats]
+    counts = [len(player_stats) for _, _, _, player_stats in games]
+    source = pd.DataFrame.from_records(records, columns=['TEAM_ID', 'PLAYER_ID', 'MINUTES'] + list(COUNTER_COLUMNS))
+
+    frame = pd.DataFrame({
+        'game_id': np.repeat(np.array([int(game[0]) for game in games], dtype=np.int32), counts),
+        'team_id': source['TEAM_ID'].astype(np.int32),
+        'player_id': source['PLAYER_ID'].astype(np.int32),
+        'game_date': np.repeat(np.array([game[1] for game in games], dtype=object), counts),
+    })
+
+    # "mm:ss" -> seconds; anything else (including nulls) counts as 0
+    minutes = source['MINUTES'].astype(str).str.extract(r'^(\d+):(\d+)')
+    minutes = minutes.apply(pd.to_numeric, errors='coerce').fillna(0)
+    frame['minutes'] = (minutes[0] * 60 + minutes[1]).astype(np.int32)
+
+    for source_column, column in COUNTER_COLUMNS.items():
+        frame[column] = pd.to_numeric(source[source_column], errors='coerce').fillna(0).astype(np.int16)
+
+    return frame
+
+def flush_batch(stats_list, batch_games):
+    """Insert a batch of rows and record the outcome for its games in the manifest."""
+    with metrics.timed_stage('hustle_write'):
+        inserted = insert_hustle_stats_batch(stats_list)
+    if inserted:
+        mark_games_fetched(batch_games)
+        return True
+    mark_games_failed([game_id for game_id, _ in batch_games], "Insert into hustle_stats failed")
+    return False
+
+def log_progress(done, total, started_at):
+    elapsed = time.monotonic() - started_at
+    rate = done / elapsed if elapsed > 0 else 0
+    eta = (total - done) / rate if rate > 0 else 0
+    logging.info(f"Progress: {done}/{total} games ({done / total:.1%}), "
+                 f"{rate:.2f} games/s, ETA {timedelta(seconds=int(eta))}")
+
+def fetch_stage(game_queue, fetched_queue, final_cutoff, stop_event):
+    """Fetcher worker: pull games, fetch their box scores and pass the raw result on."""
+    while True:
+        try:
+            game = game_queue.get_nowait()
+        except queue.Empty:
+            return
+        if stop_event.is_set():
+            continue
+        game_id, game_date, matchup = game
+        try:
+            result = fetch_game(game_id, final=game_date <= final_cutoff)
+        except Exception as e:
+            result = e
+        fetched_queue.put((game, result))
+
+def emit_batch(pending, rows_queue):
+    """Transform buffered games as one column batch and hand it to the writer."""
+    batch_games = [(game_id, game_date) for game_id, game_date, _, _ in pending]
+    try:
+        with metrics.timed_stage('hustle_transform'):
+            frame = transform_player_stats_batch(pending)
+        rows_queue.put((batch_games, frame))
+    except Exception as e:
+        logging.error(f"Error transforming games {[game_id for game_id, _ in batch_games]}: {e}")
+        mark_games_failed([game_id for game_id, _ in batch_games], e)
+
+def transform_stage(fetched_queue, rows_queue, total, stop_event, max_consecutive_failures,
+                    progress_every, batch_size):
+    """Transformer worker: buffer fetched box scores into column batches and record fetch failures."""
+    started_at = time.monotonic()
+    done = 0
+    consecutive_failures = 0
+    pending = []
+    while True:
+        item = fetched_queue.get()
+        if item is END_OF_STREAM:
+            if pending:
+                emit_batch(pending, rows_queue)
+            rows_queue.put(END_OF_STREAM)
+            return
+
+        (game_id, game_date, matchup), result = item
+        done += 1
+        try:
+            if isinstance(result, Exception):
+                raise result
+            if not result:
+                raise ValueError("No player stats available yet")
+            pending.append((game_id, game_date, matchup, result))
+            consecutive_failures = 0
+            logging.info(f"Successfully processed game {game_id}")
+
+        except Exception as e:
+            logging.error(f"Error processing game {game_id}: {e}")
+            mark_games_failed([game_id], e)
+            consecutive_failures += 1
+            if max_consecutive_failures and consecutive_failures >= max_consecutive_failures:
+                stop_event.set()
+
+        if len(pending) >= batch_size:
+            emit_batch(pending, rows_queue)
+            pending = []
+
+        if done % progress_every == 0 or done == total:
+            log_progress(done, total, started_at)
+
+def write_stage(rows_queue):
+    """Writer: insert each transformed batch. Returns the number of games ingested."""
+    ingested = 0
+    while True:
+        item = rows_queue.get()
+        if item is END_OF_STREAM:
+            return ingested
+        batch_games, frame = item
+        if flush_batch(frame, batch_games):
+            ingested += len(batch_games)
+
+def ingest_games(game_data_list, max_workers=DEFAULT_WORKERS, batch_size=5,
+                 max_consecutive_failures=None, progress_every=25, queue_size=DEFAULT_QUEUE_SIZE):
+    """
+    Fetch, transform and insert the given games, recording each outcome in the manifest.
+    Fetchers, a transformer and the database writer run concurrently, connected by
+    bounded queues, so memory use does not grow with the number of games.
+    Args:
+        game_data_list (list): (game_id, game_date, matchup) tuples, usually from get_games_to_fetch.
+        max_workers (int): Number of games fetched concurrently. Use 1 for sequential fetching.
+        batch_size (int): Number of games transformed and inserted together.
+        max_consecutive_failures (int): Abort after this many failures in a row (e.g. a rate-limit ban).
+                                        None never aborts.
+        progress_every (int): Log progress and ETA every this many games.
+        queue_size (int): Capacity of each queue between stages.
+    Returns:
+        int: Number of games ingested successfully.
+    """
+    final_cutoff = date.today() - timedelta(days=FINAL_AFTER_DAYS)
+    stop_event = threading.Event()
+
+    game_queue = queue.Queue()
+    for game in game_data_list:
+        game_queue.put(game)
+    fetched_queue = queue.Queue(maxsize=queue_size)
+    rows_queue = queue.Queue(maxsize=queue_size)
+
+    fetchers = [
+        threading.Thread(target=fetch_stage, args=(game_queue, fetched_queue, final_cutoff, stop_event),
+                         name=f"hustle-fetch-{i}", daemon=True)
+        for i in range(max(1, max_workers))
+    ]
+    transformer = threading.Thread(
+        target=transform_stage,
+        args=(fetched_queue, rows_queue, len(game_data_list), stop_event,
+              max_consecutive_failures, progress_every, batch_size),
+        name="hustle-transform", daemon=True
+    )
+    for thread in fetchers + [transformer]:
+        thread.start()
+
+    def close_fetched_queue():
+        for thread in fetchers:
+            thread.join()
+        fetched_queue.put(END_OF_STREAM)
+
+    closer = threading.Thread(target=close_fetched_queue, name="hustle-fetch-closer", daemon=True)
+    closer.start()
+
+    # Games already fetched when an abort happens are still written before returning
+    ingested = write_stage(rows_queue)
+    closer.join()
+    transformer.join()
+
+    if stop_event.is_set():
+        raise Exception(f"Aborted after {max_consecutive_failures} consecutive failures; "
+                        f"{ingested} games ingested before stopping")
+    return ingested
+
+def register_recent_games(days_back=7):
+    """
+    Register the games of the lookback window in the game manifest. Returns how many were found.
+    Errors are raised, so the 'games_register' task retries and fails the run instead of reporting success.
+    """
+    game_data_list = dedupe_games(fetch_game_ids(days_back))
+    register_games(game_data_list)
+    return len(game_data_list)
+
+def ingest_planned_games(max_workers=DEFAULT_WORKERS, batch_size=5):
+    """Fetch and insert every new, failed or not-yet-final game in the manifest. Returns the number ingested."""
+    game_data_list = get_games_to_fetch()
     if not game_data_list:
-        logging.warning("No recent games found for the specified period")
-        return
-    
-    logging.info(f"Found {len(game_data_list)} recent games to process")
-    stats_list = []
+        logging.info("No new or failed games to fetch")
+        return 0
     
-    batch_size = 5
+    logging.info(f"Found {len(game_data_list)} games to process with {max_workers} workers")
+    return ingest_games(game_data_list, max_workers=max_workers, batch_size=batch_size)
 
-    for i in range(0, len(game_data_list), batch_size):
-        batch = game_data_list[i:i + batch_size]
-        
-        for game_id, game_date, matchup in batch:
-            try:
-                player_stats = fetch_game_with_retry(game_id)
-            
-                for player in player_stats:
-                    minutes_str = player.get('MINUTES', '0:00')
-                    if ':' in str(minutes_str):
-                        min_parts = str(minutes_str).split(':')
-                        minutes = int(min_parts[0]) * 60 + int(min_parts[1])
-                    else:
-                        minutes = 0
-                    
-                    stats_list.append((
-                        int(game_id),
-                        int(player['TEAM_ID']),
-                        int(player['PLAYER_ID']),
-                        game_date,
-                        matchup,
-                        minutes,
-                        int(player.get('PTS', 0)),
-                        int(player.get('CONTESTED_SHOTS', 0)),
-                        int(player.get('CONTESTED_SHOTS_2PT', 0)),
-                        int(player.get('CONTESTED_SHOTS_3PT', 0)),
-                        int(player.get('DEFLECTIONS', 0)),
-                        int(player.get('CHARGES_DRAWN', 0)),
-                        int(player.get('SCREEN_ASSISTS', 0)),
-                        int(player.get('SCREEN_AST_PTS', 0)),
-                        int(player.get('OFF_LOOSE_BALLS_RECOVERED', 0)),
-                        int(player.get('DEF_LOOSE_BALLS_RECOVERED', 0)),
-                        int(player.get('LOOSE_BALLS_RECOVERED', 0)),
-                        int(player.get('OFF_BOXOUTS', 0)),
-                        int(player.get('DEF_BOXOUTS', 0)),
-                        int(player.get('BOX_OUTS', 0))
-                    ))
-                
-                logging.info(f"Successfully processed recent game {game_id}")
-                
-            except Exception as e:
-                logging.error(f"Error processing recent game {game_id}: {e}")
-                continue
-        
-        if stats_list:
-            insert_hustle_stats_batch(stats_list)
-            stats_list = []
-        
-        time.sleep(5)
+def fetch_hustle_stats(days_back=7, max_workers=DEFAULT_WORKERS, batch_size=5):
+    """
+    Fetch hustle box scores planned from the game manifest and insert them into hustle_stats.
+    Games found in the lookback window are registered first; only new, failed or
+    not-yet-final games are then fetched, once each.
+    Args:
+        days_back (int): Size of the lookback window in days.
+        max_workers (int): Number of games fetched concurrently. Use 1 for sequential fetching.
+        batch_size (int): Number of games accumulated before each database insert.
+    """
+    try:
+        register_recent_games(days_back)
+    except Exception as e:
+        # Games registered by earlier runs are still fetched
+        logging.error(f"Error registering recent games: {e}")
+    ingest_planned_games(max_workers=max_workers, batch_size=batch_size)
 
 if __name__ == "__main__":
     logging.info("Starting recent hustle stats collection...")
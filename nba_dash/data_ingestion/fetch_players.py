@@ -1,72 +1,105 @@
 import logging
 from nba_api.stats.endpoints import CommonAllPlayers
 import time
-from database.config import get_db_connection
+from database.bulk_load import bulk_upsert
+from data_ingestion.api_cache import fetch_endpoint
+from data_ingestion.seasons import CURRENT_SEASON
+from data_ingestion import metrics
+from data_ingestion.change_detection import load_stored_rows, diff_rows
 
 logging.basicConfig(level=logging.INFO)
 
+PLAYER_COLUMNS = ['player_id', 'full_name', 'position', 'team_id']
+
 def insert_players_batch(player_info_list):
     if not player_info_list:
         logging.warning("No players to insert")
         return
 
-    connection = None
+    started_at = time.monotonic()
     try:
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        sql = """
-        INSERT INTO players (player_id, player_name, position, team_id)
-        VALUES (%s, %s, %s, %s)
-        ON DUPLICATE KEY UPDATE
-            player_name = VALUES(player_name),
-            position = VALUES(position),
-            team_id = VALUES(team_id)
-        """
-        cursor.executemany(sql, player_info_list)
-        connection.commit()
+        bulk_upsert('players', PLAYER_COLUMNS, PLAYER_COLUMNS[1:], player_info_list)
+        metrics.current().record_write('players', len(player_info_list), time.monotonic() - started_at)
         logging.info(f"Inserted or updated {len(player_info_list)} players successfully.")
     except Exception as e:
+        metrics.current().increment('write_failure', 'players')
         logging.error(f"Error inserting players: {e}")
-        if connection:
-            connection.rollback()
-    finally:
-        if connection:
-            connection.close()
+        raise
+
+def summarize_player_changes(inserted, changed, unchanged):
+    """Build the change summary returned by fetch_players."""
+    return {
+        'inserted': [row[0] for row in inserted],
+        'trades': [(new[0], old[3], new[3]) for old, new in changed if old[3] != new[3]],
+        'updated': [new[0] for _, new in changed],
+        'unchanged': unchanged,
+    }
+
+def fetch_player_rows(season=CURRENT_SEASON, current_only=True):
+    """Fetch CommonAllPlayers and return it as rows in PLAYER_COLUMNS order."""
+    all_players = fetch_endpoint(CommonAllPlayers, is_only_current_season=int(current_only), league_id="00", season=season)['CommonAllPlayers']
+
+    player_info_list = []
+    for player in all_players:
+        player_info = (
+            player['PERSON_ID'],
+            player['DISPLAY_FIRST_LAST'],
+            player['POSITION'],
+            player['TEAM_ID']
+        )
+        player_info_list.append(player_info)
+    return player_info_list
+
+def write_players(player_info_list):
+    """
+    Write only new or changed players.
+    Returns:
+        dict: Change summary with inserted player IDs, trades as (player_id, old_team_id,
+              new_team_id), updated player IDs and the unchanged count.
+    """
+    inserted, changed = diff_rows(player_info_list, load_stored_rows('players', PLAYER_COLUMNS))
+    if inserted or changed:
+        insert_players_batch(inserted + [new for _, new in changed])
 
-def fetch_players():
+    summary = summarize_player_changes(
+        inserted, changed, len(player_info_list) - len(inserted) - len(changed)
+    )
+    logging.info(f"Players: {len(summary['inserted'])} new, {len(summary['trades'])} trades, "
+                 f"{len(summary['updated'])} updated, {summary['unchanged']} unchanged")
+    return summary
+
+def fetch_players(season=CURRENT_SEASON, current_only=True):
+    """
+    Fetch players from CommonAllPlayers and write only new or changed rows to the players table.
+    Args:
+        season (str): Season to query, e.g. "2024-25".
+        current_only (bool): If False, every player in league history is returned
+                             (used by the backfill so older hustle stats have a player row).
+    Returns:
+        dict: Change summary from write_players. None on failure.
+    """
     max_retries = 3
     retry_delay = 5  # seconds
 
     for attempt in range(max_retries):
         try:
-            all_players = CommonAllPlayers(is_only_current_season=1, league_id="00", season="2024-25").get_normalized_dict()['CommonAllPlayers']
-            
-            player_info_list = []
-            for player in all_players:
-                player_info = (
-                    player['PERSON_ID'],
-                    player['DISPLAY_FIRST_LAST'],
-                    player['POSITION'],
-                    player['TEAM_ID']
-                )
-                player_info_list.append(player_info)
-                logging.info(f"Successfully fetched data for {player['DISPLAY_FIRST_LAST']}")
+            player_info_list = fetch_player_rows(season, current_only)
             
-            if player_info_list:
-                insert_players_batch(player_info_list)
-                logging.info(f"Successfully inserted {len(player_info_list)} players into the database")
-            else:
+            if not player_info_list:
                 logging.warning("No player data was collected to insert into database")
-            
-            return  # Exit the function if successful
+                return None
+
+            return write_players(player_info_list)
         
         except Exception as e:
             logging.error(f"Error fetching players (attempt {attempt + 1}/{max_retries}): {e}")
+            metrics.current().increment('retry', 'CommonAllPlayers')
             if attempt < max_retries - 1:
                 logging.info(f"Retrying in {retry_delay} seconds...")
                 time.sleep(retry_delay)
             else:
                 logging.error("Max retries reached. Unable to fetch player data.")
+    return None
 
 if __name__ == "__main__":
     fetch_players()
\ No newline at end of file
@@ -1,85 +1,109 @@
 import logging
 import time
 from nba_api.stats.endpoints import LeagueStandings
-from database.config import get_db_connection
-from requests.exceptions import Timeout, ConnectionError
-import random
+from database.bulk_load import bulk_upsert
+from data_ingestion.api_cache import fetch_endpoint
+from data_ingestion.seasons import CURRENT_SEASON
+from data_ingestion import metrics
+from data_ingestion.change_detection import load_stored_rows, diff_rows
 
 logging.basicConfig(level=logging.INFO)
 
-def fetch_teams_with_retry(max_retries=3, base_delay=1):
-    for attempt in range(max_retries):
-        try:
-            time.sleep(base_delay + random.uniform(0, 1))
-            
-            standings = LeagueStandings(
-                season="2024-25",
-                season_type="Regular Season",
-                timeout=60
-            ).get_normalized_dict()
-            
-            return standings['Standings']
-            
-        except (Timeout, ConnectionError) as e:
-            delay = base_delay * (2 ** attempt) + random.uniform(0, 1)
-            logging.warning(f"Attempt {attempt + 1}/{max_retries} failed for fetching teams. "
-                          f"Retrying in {delay:.2f} seconds... Error: {e}")
-            time.sleep(delay)
-    
-    raise Exception(f"Failed to fetch teams after {max_retries} attempts")
+TEAM_COLUMNS = ['team_id', 'season_year', 'team_city', 'team_name', 'team_abbreviation',
+                'team_conference', 'wins', 'losses', 'win_pct']
+
+def fetch_standings(season=CURRENT_SEASON):
+    """Fetch LeagueStandings rows; transient errors are retried by the shared HTTP transport."""
+    standings = fetch_endpoint(
+        LeagueStandings,
+        season=season,
+        season_type="Regular Season"
+    )
+    return standings['Standings']
+
+def summarize_team_changes(inserted, changed, unchanged):
+    """Build the change summary returned by fetch_teams."""
+    return {
+        'inserted': [row[0] for row in inserted],
+        'standings_moves': [
+            (new[4], (old[6], old[7]), (new[6], new[7]))
+            for old, new in changed if (old[6], old[7]) != (new[6], new[7])
+        ],
+        'updated': [new[0] for _, new in changed],
+        'unchanged': unchanged,
+    }
+
+def fetch_team_rows(season=CURRENT_SEASON):
+    """Fetch standings and return them as rows in TEAM_COLUMNS order."""
+    teams_data = fetch_standings(season)
+    team_info_list = []
+
+    for team in teams_data:
+        team_info_list.append((
+            team['TeamID'],
+            season,
+            team['TeamCity'],
+            team['TeamName'],
+            team['TeamAbbreviation'],
+            team['Conference'],
+            team['WINS'],
+            team['LOSSES'],
+            team['WinPCT']
+        ))
+    return team_info_list
 
-def fetch_teams():
+def write_teams(team_info_list):
+    """
+    Write only new or changed teams.
+    Returns:
+        dict: Change summary with inserted team IDs, standings moves as
+              (abbreviation, (old wins, old losses), (new wins, new losses)),
+              updated team IDs and the unchanged count.
+    """
+    inserted, changed = diff_rows(team_info_list, load_stored_rows('teams', TEAM_COLUMNS))
+    if inserted or changed:
+        insert_team_batch(inserted + [new for _, new in changed])
+
+    summary = summarize_team_changes(
+        inserted, changed, len(team_info_list) - len(inserted) - len(changed)
+    )
+    logging.info(f"Teams: {len(summary['inserted'])} new, "
+                 f"{len(summary['standings_moves'])} standings moves, "
+                 f"{len(summary['updated'])} updated, {summary['unchanged']} unchanged")
+    return summary
+
+def fetch_teams(season=CURRENT_SEASON):
+    """
+    Fetch standings and write only new or changed teams.
+    Returns:
+        dict: Change summary from write_teams. None on failure.
+    """
     try:
-        teams_data = fetch_teams_with_retry()
-        team_info_list = []
-        
-        for team in teams_data:
-            team_info_list.append((
-                team['TeamID'],
-                "2024-25",
-                team['TeamCity'],
-                team['TeamName'],
-                team['TeamAbbreviation'],
-                team['Conference'],
-                team['WINS'],
-                team['LOSSES'],
-                team['WinPCT']
-            ))
-            logging.info(f"Successfully fetched data for {team['TeamCity']} {team['TeamName']}")
+        team_info_list = fetch_team_rows(season)
         
-        if team_info_list:
-            insert_team_batch(team_info_list)
-        else:
+        if not team_info_list:
             logging.warning("No team data was collected to insert into database")
+            return None
+
+        return write_teams(team_info_list)
     
     except Exception as e:
         logging.error(f"Error fetching teams: {e}")
+        return None
 
 def insert_team_batch(team_info_list):
-    connection = None
+    if not team_info_list:
+        logging.warning("No teams to insert")
+        return
+
+    started_at = time.monotonic()
     try:
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        sql = """
-        INSERT INTO teams (team_id, season_year, team_city, team_name, team_abbreviation, 
-                         team_conference, wins, losses, win_pct)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        ON DUPLICATE KEY UPDATE 
-            season_year = VALUES(season_year),
-            team_city = VALUES(team_city),
-            team_name = VALUES(team_name),
-            team_abbreviation = VALUES(team_abbreviation),
-            team_conference = VALUES(team_conference),
-            wins = VALUES(wins),
-            losses = VALUES(losses),
-            win_pct = VALUES(win_pct)
-        """
-        cursor.executemany(sql, team_info_list)
-        connection.commit()
-        print(f"Inserted or updated {len(team_info_list)} teams successfully.")
-    finally:
-        if connection:
-            connection.close()
+        bulk_upsert('teams', TEAM_COLUMNS, TEAM_COLUMNS[1:], team_info_list)
+    except Exception:
+        metrics.current().increment('write_failure', 'teams')
+        raise
+    metrics.current().record_write('teams', len(team_info_list), time.monotonic() - started_at)
+    logging.info(f"Inserted or updated {len(team_info_list)} teams successfully.")
 
 if __name__ == "__main__":
     logging.info("Fetching recent teams data...")
@@ -0,0 +1,189 @@
+import logging
+from datetime import date, timedelta
+from database.config import get_db_connection
+from data_ingestion import metrics
+
+logging.basicConfig(level=logging.INFO)
+
+# Games fetched this many days after tip-off are treated as final and never re-fetched
+FINAL_AFTER_DAYS = 1
+
+# Failed games are retried on later runs until they reach this many attempts
+MAX_ATTEMPTS = 5
+
+def dedupe_games(game_data_list):
+    """
+    Collapse LeagueGameFinder rows (one per team) into one entry per game.
+    The home team's matchup ("BOS vs. NYK") is kept when both rows are present.
+    """
+    games = {}
+    for game_id, game_date, matchup in game_data_list:
+        key = int(game_id)
+        if key not in games or 'vs.' in matchup:
+            games[key] = (key, game_date, matchup)
+    return list(games.values())
+
+def register_games(game_data_list, season=None):
+    """
+    Add newly seen games to the manifest as pending.
+    Games already present in hustle_stats or its archive are marked fetched (or final) so they are not fetched again.
+    Args:
+        game_data_list (list): (game_id, game_date, matchup) tuples.
+        season (str): Season the games belong to, if known.
+    Returns:
+        int: Number of games registered. Database errors are raised after a rollback.
+    """
+    if not game_data_list:
+        return 0
+
+    final_cutoff = date.today() - timedelta(days=FINAL_AFTER_DAYS)
+    connection = None
+    try:
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        cursor.executemany(
+            """
+            INSERT INTO game_manifest (game_id, game_date, matchup, season, status)
+            VALUES (%s, %s, %s, %s, 'pending')
+            ON DUPLICATE KEY UPDATE season = COALESCE(season, VALUES(season))
+            """,
+            [(game_id, game_date, matchup, season) for game_id, game_date, matchup in game_data_list]
+        )
+        cursor.execute(
+            """
+            UPDATE game_manifest m
+            JOIN (SELECT DISTINCT game_id FROM hustle_stats_all) h ON h.game_id = m.game_id
+            SET m.status = IF(m.game_date <= %s, 'final', 'fetched')
+            WHERE m.status = 'pending'
+            """,
+            (final_cutoff,)
+        )
+        connection.commit()
+        logging.info(f"Registered {len(game_data_list)} games in the manifest.")
+        return len(game_data_list)
+    except Exception as e:
+        logging.error(f"Error registering games in manifest: {e}")
+        if connection:
+            connection.rollback()
+        raise
+    finally:
+        if connection:
+            connection.close()
+
+def get_games_to_fetch(season=None, max_attempts=MAX_ATTEMPTS):
+    """
+    Plan the next fetch from the manifest.
+    Returns pending games, failed games under the attempt limit and fetched games
+    that are not final yet, as (game_id, game_date, matchup) tuples.
+    Args:
+        season (str): Only plan games of this season. None plans every season.
+        max_attempts (int): Failed games with this many attempts are no longer retried.
+    """
+    query = """
+        SELECT game_id, game_date, matchup
+        FROM game_manifest
+        WHERE (status IN ('pending', 'fetched')
+               OR (status = 'failed' AND attempts < %s))
+    """
+    params = [max_attempts]
+    if season:
+        query += " AND season = %s"
+        params.append(season)
+    query += " ORDER BY game_date, game_id"
+
+    connection = None
+    try:
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        cursor.execute(query, params)
+        return cursor.fetchall()
+    except Exception as e:
+        logging.error(f"Error reading game manifest: {e}")
+        return []
+    finally:
+        if connection:
+            connection.close()
+
+def mark_games_fetched(games):
+    """
+    Mark successfully ingested games as fetched, or final once they are old enough.
+    Their player and team aggregates are flagged for the next refresh_aggregates.
+    """
+    if not games:
+        return
+
+    final_cutoff = date.today() - timedelta(days=FINAL_AFTER_DAYS)
+    updates = [
+        ('final' if game_date <= final_cutoff else 'fetched', game_id)
+        for game_id, game_date in games
+    ]
+    connection = None
+    try:
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        cursor.executemany(
+            """
+            UPDATE game_manifest
+            SET status = %s, attempts = attempts + 1, last_error = NULL, aggregated = 0
+            WHERE game_id = %s
+            """,
+            updates
+        )
+        connection.commit()
+    except Exception as e:
+        logging.error(f"Error updating game manifest: {e}")
+        if connection:
+            connection.rollback()
+    finally:
+        if connection:
+            connection.close()
+
+def mark_games_failed(game_ids, error):
+    """Record a failed fetch or insert so the games are retried on a later run."""
+    if not game_ids:
+        return
+
+    metrics.current().increment('game_failure', amount=len(game_ids))
+    connection = None
+    try:
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        cursor.executemany(
+            """
+            UPDATE game_manifest
+            SET status = 'failed', attempts = attempts + 1, last_error = %s
+            WHERE game_id = %s
+            """,
+            [(str(error)[:500], game_id) for game_id in game_ids]
+        )
+        connection.commit()
+    except Exception as e:
+        logging.error(f"Error updating game manifest: {e}")
+        if connection:
+            connection.rollback()
+    finally:
+        if connection:
+            connection.close()
+
+def get_season_summary(season):
+    """Return a {status: game count} summary of a season in the manifest."""
+    connection = None
+    try:
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        cursor.execute(
+            """
+            SELECT status, COUNT(*)
+            FROM game_manifest
+            WHERE season = %s
+            GROUP BY status
+            """,
+            (season,)
+        )
+        return dict(cursor.fetchall())
+    except Exception as e:
+        logging.error(f"Error reading game manifest: {e}")
+        return {}
+    finally:
+        if connection:
+            connection.close()
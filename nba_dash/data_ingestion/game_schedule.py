@@ -0,0 +1,54 @@
+import logging
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from nba_api.stats.endpoints import ScoreboardV2
+from data_ingestion.http_transport import request_endpoint
+
+logging.basicConfig(level=logging.INFO)
+
+# Scoreboard dates and tip-off times are US Eastern
+EASTERN = ZoneInfo('America/New_York')
+
+# ScoreboardV2 GAME_STATUS_ID of a finished game (1 = scheduled, 2 = in progress)
+STATUS_FINAL = 3
+
+def parse_tip_off(game_date, status_text):
+    """Turn a scheduled game's status text such as "7:30 pm ET" into an Eastern datetime, else None."""
+    try:
+        tip_off = datetime.strptime(status_text.replace('ET', '').strip().upper(), '%I:%M %p')
+    except (AttributeError, ValueError):
+        return None
+    return datetime.combine(game_date, tip_off.time(), EASTERN)
+
+def fetch_scoreboard(game_date):
+    """
+    Fetch the games scheduled on a date.
+    Args:
+        game_date (date): Eastern calendar date.
+    Returns:
+        list: Dicts with game_id, status_id and tip_off (None once a game has started).
+    """
+    # Live game status: always requested from the API, never read from or written to the on-disk cache
+    game_header = request_endpoint(
+        ScoreboardV2,
+        game_date=game_date.strftime('%Y-%m-%d'),
+        league_id='00',
+        day_offset=0
+    ).nba_response.get_normalized_dict()['GameHeader']
+
+    return [
+        {
+            'game_id': game['GAME_ID'],
+            'status_id': game['GAME_STATUS_ID'],
+            'tip_off': parse_tip_off(game_date, game['GAME_STATUS_TEXT']),
+        }
+        for game in game_header
+    ]
+
+def last_tip_off(games):
+    """Latest known tip-off of a night's games, or None if none is known."""
+    tip_offs = [game['tip_off'] for game in games if game['tip_off']]
+    return max(tip_offs) if tip_offs else None
+
+def all_games_final(games):
+    return all(game['status_id'] == STATUS_FINAL for game in games)
@@ -0,0 +1,223 @@
+import logging
+import os
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import Timeout, ConnectionError
+from nba_api.stats.library.http import NBAStatsHTTP, STATS_HEADERS
+from data_ingestion.rate_limiter import get_rate_limiter, DEFAULT_RATE
+from data_ingestion import metrics
+
+logging.basicConfig(level=logging.INFO)
+
+# Attempts after the first one for a failed request, and the base of the exponential backoff
+MAX_RETRIES = int(os.environ.get('NBA_API_MAX_RETRIES', 3))
+BASE_DELAY = float(os.environ.get('NBA_API_RETRY_DELAY', 2))
+
+# Consecutive throttled responses that open the circuit breaker, and how long it first stays open
+BREAKER_THRESHOLD = int(os.environ.get('NBA_API_BREAKER_THRESHOLD', 3))
+BREAKER_COOLDOWN = float(os.environ.get('NBA_API_BREAKER_COOLDOWN', 60))
+MAX_BREAKER_COOLDOWN = 15 * 60
+
+# Keep-alive connections kept open to stats.nba.com (one per concurrent fetch plus a spare)
+POOL_SIZE = int(os.environ.get('NBA_FETCH_WORKERS', 4)) + 1
+
+# stats.nba.com answers throttled clients with 403 or 429
+THROTTLE_STATUSES = {403, 429}
+RETRY_STATUSES = {500, 502, 503, 504}
+
+# Weight of the newest sample in the latency average, and the largest rate slowdown it can cause
+LATENCY_SMOOTHING = 0.2
+MAX_SLOWDOWN = 8.0
+
+class CircuitBreaker:
+    """
+    Pauses every caller once the upstream starts throttling.
+    After BREAKER_THRESHOLD throttled responses in a row the breaker opens for a cooldown.
+    Then a single probe request is let through: success closes the breaker, another throttled
+    response reopens it with twice the cooldown.
+    """
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN, max_cooldown=MAX_BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = 'closed'
+        self._cooldown = cooldown
+        self._throttled = 0
+        self._open_until = 0.0
+        self._probe_in_flight = False
+        self._condition = threading.Condition()
+
+    def before_request(self):
+        """Block while the breaker is open or another caller is probing."""
+        with self._condition:
+            while True:
+                if self.state == 'closed':
+                    return
+                now = time.monotonic()
+                if self.state == 'open' and now >= self._open_until:
+                    self.state = 'half_open'
+                if self.state == 'half_open' and not self._probe_in_flight:
+                    self._probe_in_flight = True
+                    return
+                self._condition.wait(self._open_until - now if self.state == 'open' else None)
+
+    def record_success(self):
+        with self._condition:
+            if self.state != 'closed':
+                logging.info("nba_api circuit breaker closed")
+            self.state = 'closed'
+            self._throttled = 0
+            self._cooldown = self.base_cooldown
+            self._probe_in_flight = False
+            self._condition.notify_all()
+
+    def record_throttle(self):
+        with self._condition:
+            self._throttled += 1
+            if self.state == 'half_open' or self._throttled >= self.threshold:
+                if self.state == 'half_open':
+                    self._cooldown = min(self._cooldown * 2, self.max_cooldown)
+                self.state = 'open'
+                self._open_until = time.monotonic() + self._cooldown
+                self._probe_in_flight = False
+                metrics.current().increment('circuit_open')
+                logging.warning(f"nba_api is throttling; pausing all requests for {self._cooldown:.0f} seconds")
+            self._condition.notify_all()
+
+    def record_failure(self):
+        """A non-throttling failure: release the probe slot without changing the state."""
+        with self._condition:
+            self._probe_in_flight = False
+            self._condition.notify_all()
+
+class AdaptiveBackoff:
+    """
+    Slows the shared rate limiter down as response times grow.
+    The slowdown is the smoothed latency divided by the best smoothed latency seen so far.
+    """
+
+    def __init__(self, base_rate=DEFAULT_RATE, base_delay=BASE_DELAY):
+        self.base_rate = base_rate
+        self.base_delay = base_delay
+        self.slowdown = 1.0
+        self._average = None
+        self._baseline = None
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        with self._lock:
+            if self._average is None:
+                self._average = seconds
+            else:
+                self._average += LATENCY_SMOOTHING * (seconds - self._average)
+            self._baseline = self._average if self._baseline is None else min(self._baseline, self._average)
+            slowdown = min(max(self._average / self._baseline, 1.0), MAX_SLOWDOWN) if self._baseline else 1.0
+            changed = abs(slowdown - self.slowdown) >= 0.25
+            if changed:
+                self.slowdown = slowdown
+        if changed:
+            get_rate_limiter().set_rate(self.base_rate / slowdown)
+            logging.info(f"nba_api latency {self._average:.2f}s; request rate slowed {slowdown:.1f}x")
+
+    def retry_delay(self, attempt, retry_after=None):
+        delay = self.base_delay * (2 ** attempt) * self.slowdown + random.uniform(0, 1)
+        return max(delay, retry_after or 0)
+
+_session = None
+_session_lock = threading.Lock()
+breaker = CircuitBreaker()
+backoff = AdaptiveBackoff()
+
+def raise_for_status(response, *args, **kwargs):
+    # nba_api never checks the status code, so error pages would otherwise surface as JSON errors
+    if response.status_code >= 400:
+        response.raise_for_status()
+
+def accept_encoding():
+    try:
+        import brotli  # noqa: F401
+        return 'gzip, deflate, br'
+    except ImportError:
+        # Without brotli installed requests cannot decode 'br' bodies
+        return 'gzip, deflate'
+
+def get_session():
+    """Return the keep-alive session shared by every nba_api request, installing it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=POOL_SIZE, max_retries=0)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.hooks['response'].append(raise_for_status)
+            NBAStatsHTTP.headers = dict(STATS_HEADERS, **{'Accept-Encoding': accept_encoding()})
+            NBAStatsHTTP.set_session(session)
+            _session = session
+        return _session
+
+def status_code(error):
+    response = getattr(error, 'response', None)
+    return response.status_code if response is not None else None
+
+def retry_after(error):
+    response = getattr(error, 'response', None)
+    try:
+        return float(response.headers.get('Retry-After'))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+def request_endpoint(endpoint_class, timeout=60, **params):
+    """
+    Instantiate an nba_api endpoint over the shared session, with rate limiting, retries,
+    adaptive backoff and the circuit breaker.
+    Args:
+        endpoint_class: nba_api endpoint class, e.g. HustleStatsBoxScore.
+        timeout (int): Request timeout in seconds.
+        **params: Endpoint parameters.
+    """
+    get_session()
+    endpoint_name = endpoint_class.__name__
+    for attempt in range(MAX_RETRIES + 1):
+        breaker.before_request()
+        get_rate_limiter().acquire()
+        started_at = time.monotonic()
+        try:
+            endpoint = endpoint_class(timeout=timeout, **params)
+            # A throttled request sometimes gets a 200 with an HTML body
+            endpoint.nba_response.get_dict()
+        except Exception as e:
+            elapsed = time.monotonic() - started_at
+            metrics.current().observe_api_latency(endpoint_name, elapsed)
+            metrics.current().increment('request_error', endpoint_name)
+
+            status = status_code(e)
+            throttled = status in THROTTLE_STATUSES
+            if throttled:
+                breaker.record_throttle()
+                metrics.current().increment('throttled', endpoint_name)
+            else:
+                breaker.record_failure()
+            if isinstance(e, Timeout):
+                backoff.observe(elapsed)
+
+            retryable = throttled or status in RETRY_STATUSES or isinstance(e, (Timeout, ConnectionError, ValueError))
+            if not retryable or attempt == MAX_RETRIES:
+                raise
+
+            delay = backoff.retry_delay(attempt, retry_after(e))
+            metrics.current().increment('retry', endpoint_name)
+            logging.warning(f"{endpoint_name} attempt {attempt + 1}/{MAX_RETRIES + 1} failed. "
+                            f"Retrying in {delay:.2f} seconds... Error: {e}")
+            time.sleep(delay)
+            continue
+
+        elapsed = time.monotonic() - started_at
+        metrics.current().observe_api_latency(endpoint_name, elapsed)
+        backoff.observe(elapsed)
+        breaker.record_success()
+        return endpoint
@@ -0,0 +1,178 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+logging.basicConfig(level=logging.INFO)
+
+METRICS_DIR = os.environ.get('NBA_METRICS_DIR') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'metrics'
+)
+PROMETHEUS_FILE = 'nba_ingestion.prom'
+
+# Upper bounds (seconds) of the API latency histogram buckets
+LATENCY_BUCKETS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+
+class RunMetrics:
+    """Thread-safe collector for the measurements of one ingestion run."""
+
+    def __init__(self, name='ingestion'):
+        self.name = name
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started_at = time.time()
+        self.stage_seconds = defaultdict(float)
+        self.api_latencies = defaultdict(list)
+        self.events = defaultdict(int)
+        self.rows_written = defaultdict(int)
+        self.write_seconds = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def add_stage_time(self, stage, seconds):
+        with self._lock:
+            self.stage_seconds[stage] += seconds
+
+    def observe_api_latency(self, endpoint, seconds):
+        with self._lock:
+            self.api_latencies[endpoint].append(seconds)
+
+    def increment(self, event, target='', amount=1):
+        """Count an event such as 'retry', 'game_failure' or 'cache_hit', optionally per endpoint or table."""
+        with self._lock:
+            self.events[(event, target)] += amount
+
+    def record_write(self, table, rows, seconds):
+        with self._lock:
+            self.rows_written[table] += rows
+            self.write_seconds[table] += seconds
+
+    def histogram(self, endpoint):
+        latencies = self.api_latencies[endpoint]
+        return {
+            'buckets': {str(bound): sum(1 for value in latencies if value <= bound) for bound in LATENCY_BUCKETS},
+            'count': len(latencies),
+            'sum': sum(latencies),
+        }
+
+    def to_record(self, status):
+        with self._lock:
+            finished_at = time.time()
+            return {
+                'run_id': self.run_id,
+                'name': self.name,
+                'status': status,
+                'started_at': datetime.fromtimestamp(self.started_at, timezone.utc).isoformat(),
+                'duration_seconds': round(finished_at - self.started_at, 3),
+                'stages': {stage: round(seconds, 3) for stage, seconds in self.stage_seconds.items()},
+                'api_latency': {endpoint: self.histogram(endpoint) for endpoint in self.api_latencies},
+                'events': [
+                    {'event': event, 'target': target, 'count': count}
+                    for (event, target), count in sorted(self.events.items())
+                ],
+                'writes': {
+                    table: {
+                        'rows': rows,
+                        'seconds': round(self.write_seconds[table], 3),
+                        'rows_per_second': round(rows / self.write_seconds[table], 1)
+                        if self.write_seconds[table] else None,
+                    }
+                    for table, rows in self.rows_written.items()
+                },
+            }
+
+def to_prometheus(record):
+    """Render a run record in the Prometheus text exposition format."""
+    lines = [
+        '# HELP nba_ingestion_last_run_timestamp_seconds Start time of the last ingestion run.',
+        '# TYPE nba_ingestion_last_run_timestamp_seconds gauge',
+        f'nba_ingestion_last_run_timestamp_seconds{{name="{record["name"]}"}} '
+        f'{datetime.fromisoformat(record["started_at"]).timestamp():.0f}',
+        '# HELP nba_ingestion_last_run_success Whether the last ingestion run succeeded.',
+        '# TYPE nba_ingestion_last_run_success gauge',
+        f'nba_ingestion_last_run_success{{name="{record["name"]}"}} {int(record["status"] == "success")}',
+        '# HELP nba_ingestion_run_duration_seconds Duration of the last ingestion run.',
+        '# TYPE nba_ingestion_run_duration_seconds gauge',
+        f'nba_ingestion_run_duration_seconds{{name="{record["name"]}"}} {record["duration_seconds"]}',
+        '# HELP nba_ingestion_stage_duration_seconds Time spent in each stage during the last run.',
+        '# TYPE nba_ingestion_stage_duration_seconds gauge',
+    ]
+    lines += [
+        f'nba_ingestion_stage_duration_seconds{{stage="{stage}"}} {seconds}'
+        for stage, seconds in record['stages'].items()
+    ]
+    lines += [
+        '# HELP nba_api_request_duration_seconds Latency of nba_api requests during the last run.',
+        '# TYPE nba_api_request_duration_seconds histogram',
+    ]
+    for endpoint, histogram in record['api_latency'].items():
+        for bound, count in histogram['buckets'].items():
+            lines.append(f'nba_api_request_duration_seconds_bucket{{endpoint="{endpoint}",le="{bound}"}} {count}')
+        lines.append(f'nba_api_request_duration_seconds_bucket{{endpoint="{endpoint}",le="+Inf"}} {histogram["count"]}')
+        lines.append(f'nba_api_request_duration_seconds_sum{{endpoint="{endpoint}"}} {histogram["sum"]:.3f}')
+        lines.append(f'nba_api_request_duration_seconds_count{{endpoint="{endpoint}"}} {histogram["count"]}')
+    lines += [
+        '# HELP nba_ingestion_events Retries, failures and cache hits during the last run.',
+        '# TYPE nba_ingestion_events gauge',
+    ]
+    lines += [
+        f'nba_ingestion_events{{event="{event["event"]}",target="{event["target"]}"}} {event["count"]}'
+        for event in record['events']
+    ]
+    lines += [
+        '# HELP nba_ingestion_rows_written Rows written per table during the last run.',
+        '# TYPE nba_ingestion_rows_written gauge',
+    ]
+    lines += [f'nba_ingestion_rows_written{{table="{table}"}} {write["rows"]}' for table, write in record['writes'].items()]
+    lines += [
+        '# HELP nba_ingestion_rows_per_second Write throughput per table during the last run.',
+        '# TYPE nba_ingestion_rows_per_second gauge',
+    ]
+    lines += [
+        f'nba_ingestion_rows_per_second{{table="{table}"}} {write["rows_per_second"]}'
+        for table, write in record['writes'].items() if write['rows_per_second'] is not None
+    ]
+    return '\n'.join(lines) + '\n'
+
+_current = RunMetrics()
+_current_lock = threading.Lock()
+
+def current():
+    """Return the collector of the run in progress."""
+    return _current
+
+def start_run(name='ingestion'):
+    """Begin collecting metrics for a new run."""
+    global _current
+    with _current_lock:
+        _current = RunMetrics(name)
+    return _current
+
+def finish_run(status='success', metrics_dir=METRICS_DIR):
+    """Write the run record as JSON under runs/ and refresh the Prometheus text file."""
+    record = current().to_record(status)
+    try:
+        runs_dir = os.path.join(metrics_dir, 'runs')
+        os.makedirs(runs_dir, exist_ok=True)
+        with open(os.path.join(runs_dir, f"{record['started_at'][:19].replace(':', '')}_{record['run_id']}.json"), 'w') as f:
+            json.dump(record, f, indent=2)
+
+        prom_path = os.path.join(metrics_dir, PROMETHEUS_FILE)
+        with open(f"{prom_path}.tmp", 'w') as f:
+            f.write(to_prometheus(record))
+        os.replace(f"{prom_path}.tmp", prom_path)
+    except OSError as e:
+        logging.error(f"Error writing ingestion metrics: {e}")
+    return record
+
+@contextmanager
+def timed_stage(stage):
+    """Add the time spent inside the block to a stage's duration."""
+    started_at = time.monotonic()
+    try:
+        yield
+    finally:
+        current().add_stage_time(stage, time.monotonic() - started_at)
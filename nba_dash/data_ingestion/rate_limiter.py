@@ -0,0 +1,58 @@
+import os
+import threading
+import time
+
+# Requests per second allowed against stats.nba.com, and how many can burst at once
+DEFAULT_RATE = float(os.environ.get('NBA_API_RATE', 0.5))
+DEFAULT_BURST = int(os.environ.get('NBA_API_BURST', 2))
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiter.
+    Args:
+        rate (float): Tokens added per second.
+        capacity (int): Maximum number of tokens that can be stored (burst size).
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def set_rate(self, rate):
+        """Change the refill rate; tokens already earned are kept."""
+        with self._lock:
+            self._refill()
+            self.rate = rate
+
+    def acquire(self, tokens=1):
+        """Block until the requested number of tokens is available."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+def get_rate_limiter():
+    """Return the process-wide limiter shared by every nba_api caller."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = TokenBucket(DEFAULT_RATE, DEFAULT_BURST)
+        return _limiter
@@ -0,0 +1,20 @@
+import os
+
+# Season used by the daily update, e.g. "2024-25"
+CURRENT_SEASON = os.environ.get('NBA_SEASON', '2024-25')
+
+def season_start_year(season):
+    """Return the starting year of a season string such as "2019-20"."""
+    return int(season.split('-')[0])
+
+def format_season(start_year):
+    """Build the nba_api season string for a starting year, e.g. 2019 -> "2019-20"."""
+    return f"{start_year}-{str(start_year + 1)[-2:]}"
+
+def season_range(start_season, end_season=CURRENT_SEASON):
+    """List every season from start_season to end_season inclusive, oldest first."""
+    start = season_start_year(start_season)
+    end = season_start_year(end_season)
+    if start > end:
+        raise ValueError(f"Start season {start_season} is after end season {end_season}")
+    return [format_season(year) for year in range(start, end + 1)]
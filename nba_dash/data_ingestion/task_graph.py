@@ -0,0 +1,135 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from data_ingestion import metrics
+
+logging.basicConfig(level=logging.INFO)
+
+class TaskTimeout(Exception):
+    pass
+
+class Task:
+    """
+    One step of the ingestion graph.
+    Args:
+        name (str): Unique task name, also used for stage metrics.
+        func: Callable taking a dict of dependency results by task name.
+        depends_on (list): Names of tasks that must succeed first.
+        retries (int): Extra attempts after a failure.
+        retry_delay (float): Seconds between attempts.
+        timeout (float): Seconds before the task is abandoned; None waits forever.
+    """
+
+    def __init__(self, name, func, depends_on=(), retries=0, retry_delay=5, timeout=None):
+        self.name = name
+        self.func = func
+        self.depends_on = list(depends_on)
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.timeout = timeout
+
+    def run(self, inputs, abandoned=None):
+        """Run with retries; no further attempt starts once `abandoned` (set on timeout) is set."""
+        for attempt in range(self.retries + 1):
+            if abandoned is not None and abandoned.is_set():
+                raise TaskTimeout(f"Task {self.name} was abandoned after timing out")
+            try:
+                with metrics.timed_stage(self.name):
+                    return self.func(inputs)
+            except Exception as e:
+                if attempt == self.retries or (abandoned is not None and abandoned.is_set()):
+                    raise
+                metrics.current().increment('task_retry', self.name)
+                logging.warning(f"Task {self.name} failed (attempt {attempt + 1}/{self.retries + 1}): {e}. "
+                                f"Retrying in {self.retry_delay} seconds...")
+                time.sleep(self.retry_delay)
+
+def select_tasks(tasks, names):
+    """Return the named tasks plus every task they depend on, in their original order."""
+    by_name = {task.name: task for task in tasks}
+    unknown = [name for name in names if name not in by_name]
+    if unknown:
+        raise ValueError(f"Unknown tasks: {', '.join(unknown)}")
+
+    selected = set()
+    stack = list(names)
+    while stack:
+        name = stack.pop()
+        if name not in selected:
+            selected.add(name)
+            stack.extend(by_name[name].depends_on)
+    return [task for task in tasks if task.name in selected]
+
+def run_tasks(tasks, max_workers=4):
+    """
+    Run tasks concurrently as soon as their dependencies have succeeded.
+    A failed or timed-out task skips its dependents; independent tasks keep running.
+    A timed-out task cannot be interrupted: it gets no further retries, and this function
+    waits for its current attempt to finish before returning, so nothing it writes can
+    overlap the next run once the caller releases its lock.
+    Returns:
+        tuple: (results, errors) dicts keyed by task name. Skipped tasks appear in neither.
+    """
+    by_name = {task.name: task for task in tasks}
+    for task in tasks:
+        missing = [name for name in task.depends_on if name not in by_name]
+        if missing:
+            raise ValueError(f"Task {task.name} depends on unknown tasks: {', '.join(missing)}")
+
+    results = {}
+    errors = {}
+    waiting = list(tasks)
+    running = {}
+    timed_out = []
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ingestion-task')
+    try:
+        while waiting or running:
+            for task in list(waiting):
+                if any(name in errors for name in task.depends_on):
+                    waiting.remove(task)
+                    logging.warning(f"Skipping task {task.name}: a dependency failed")
+                elif all(name in results for name in task.depends_on):
+                    waiting.remove(task)
+                    inputs = {name: results[name] for name in task.depends_on}
+                    deadline = time.monotonic() + task.timeout if task.timeout else None
+                    abandoned = threading.Event()
+                    running[executor.submit(task.run, inputs, abandoned)] = (task, deadline, abandoned)
+                    logging.info(f"Started task {task.name}")
+
+            if not running:
+                # Everything left waits on a task that never ran (dependency cycle)
+                for task in waiting:
+                    errors[task.name] = ValueError(f"Task {task.name} is part of a dependency cycle")
+                break
+
+            deadlines = [deadline for _, deadline, _ in running.values() if deadline]
+            wait_seconds = max(0, min(deadlines) - time.monotonic()) if deadlines else None
+            done, _ = wait(running, timeout=wait_seconds, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                task, _, _ = running.pop(future)
+                try:
+                    results[task.name] = future.result()
+                    logging.info(f"Task {task.name} succeeded")
+                except Exception as e:
+                    errors[task.name] = e
+                    metrics.current().increment('task_failure', task.name)
+                    logging.error(f"Task {task.name} failed: {e}")
+
+            now = time.monotonic()
+            for future, (task, deadline, abandoned) in list(running.items()):
+                if deadline and now >= deadline:
+                    # The thread cannot be interrupted; its result is discarded when it finishes
+                    running.pop(future)
+                    abandoned.set()
+                    timed_out.append((task, future))
+                    errors[task.name] = TaskTimeout(f"Task {task.name} timed out after {task.timeout} seconds")
+                    metrics.current().increment('task_timeout', task.name)
+                    logging.error(f"Task {task.name} timed out after {task.timeout} seconds")
+    finally:
+        still_running = [task.name for task, future in timed_out if not future.done()]
+        if still_running:
+            logging.warning(f"Waiting for timed-out tasks to finish their current attempt: {', '.join(still_running)}")
+        executor.shutdown(wait=True, cancel_futures=True)
+    return results, errors
@@ -0,0 +1,155 @@
+import logging
+import time
+from database.config import get_db_connection
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# hustle_stats columns summed into player_stats and team_stats
+SUM_COLUMNS = [
+    'minutes', 'pts', 'contested_shots', 'contested_shots_2pt', 'contested_shots_3pt',
+    'deflections', 'charges_drawn', 'screen_assists', 'screen_ast_pts',
+    'off_loose_balls_recovered', 'def_loose_balls_recovered', 'loose_balls_recovered',
+    'off_boxouts', 'def_boxouts', 'boxouts',
+]
+
+# player_form windows (games played) and the hustle_stats columns summed over them
+FORM_WINDOWS = [5, 10, 20]
+FORM_COLUMNS = [
+    'pts', 'contested_shots', 'deflections', 'charges_drawn', 'screen_assists',
+    'loose_balls_recovered', 'boxouts',
+]
+
+# Keys per IN (...) list
+CHUNK_SIZE = 1000
+
+# (aggregate table, grouping column, games played expression)
+AGGREGATES = [
+    ('player_stats', 'player_id', 'COUNT(*)'),
+    ('team_stats', 'team_id', 'COUNT(DISTINCT game_id)'),
+]
+
+def chunks(values, size=CHUNK_SIZE):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+def hustle_rows(columns, where=''):
+    """
+    Derived table of hot and archived hustle_stats rows.
+    The filter is repeated on both tables so each uses its own indexes; its
+    parameters must be passed twice.
+    """
+    select = ', '.join(columns)
+    return f"(SELECT {select} FROM hustle_stats {where} UNION ALL SELECT {select} FROM hustle_stats_archive {where})"
+
+def aggregate_sql(table, key, games_played, where=''):
+    sums = ', '.join(f"SUM({column})" for column in SUM_COLUMNS)
+    return f"""
+        REPLACE INTO {table} ({key}, games_played, {', '.join(SUM_COLUMNS)})
+        SELECT {key}, {games_played}, {sums}
+        FROM {hustle_rows(['game_id', key] + SUM_COLUMNS, where)} rows_all
+        GROUP BY {key}
+    """
+
+def player_form_sql(where=''):
+    """Sum each player's last N games played (minutes > 0) for every window in FORM_WINDOWS."""
+    windows = ' UNION ALL '.join(f"SELECT {size} AS window_size" for size in FORM_WINDOWS)
+    return f"""
+        REPLACE INTO player_form (player_id, window_size, games, last_game_date, {', '.join(FORM_COLUMNS)})
+        SELECT recent.player_id, w.window_size, COUNT(*), MAX(recent.game_date),
+               {', '.join(f"SUM(recent.{column})" for column in FORM_COLUMNS)}
+        FROM (
+            SELECT player_id, game_date, {', '.join(FORM_COLUMNS)},
+                   ROW_NUMBER() OVER (PARTITION BY player_id ORDER BY game_date DESC, game_id DESC) AS game_number
+            FROM {hustle_rows(['game_id', 'player_id', 'game_date'] + FORM_COLUMNS, f"WHERE minutes > 0 {where}")} rows_all
+        ) recent
+        JOIN ({windows}) w ON recent.game_number <= w.window_size
+        GROUP BY recent.player_id, w.window_size
+    """
+
+def refresh_player_form(cursor, player_ids):
+    """Recompute the rolling windows of the given players from their most recent games."""
+    for chunk in chunks(player_ids):
+        placeholders = ', '.join(['%s'] * len(chunk))
+        cursor.execute(player_form_sql(f"AND player_id IN ({placeholders})"), chunk + chunk)
+
+def refresh_keys(cursor, table, key, games_played, keys):
+    """Recompute the aggregate rows of the given players or teams from all of their hustle_stats rows."""
+    for chunk in chunks(keys):
+        placeholders = ', '.join(['%s'] * len(chunk))
+        cursor.execute(aggregate_sql(table, key, games_played, f"WHERE {key} IN ({placeholders})"), chunk + chunk)
+
+def refresh_aggregates():
+    """
+    Update player_stats, team_stats and player_form for the games ingested since the last refresh.
+    Only players and teams that appear in those games are recomputed.
+    Returns:
+        int: Number of games whose aggregates were refreshed.
+    """
+    started_at = time.monotonic()
+    connection = None
+    try:
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        cursor.execute(
+            """
+            SELECT game_id FROM game_manifest
+            WHERE aggregated = 0 AND status IN ('fetched', 'final')
+            """
+        )
+        game_ids = [row[0] for row in cursor.fetchall()]
+        if not game_ids:
+            logger.info("Player and team aggregates are up to date")
+            return 0
+
+        for table, key, games_played in AGGREGATES:
+            keys = set()
+            for chunk in chunks(game_ids):
+                cursor.execute(
+                    f"SELECT DISTINCT {key} FROM hustle_stats WHERE game_id IN ({', '.join(['%s'] * len(chunk))})",
+                    chunk
+                )
+                keys.update(row[0] for row in cursor.fetchall())
+            refresh_keys(cursor, table, key, games_played, sorted(keys))
+            logger.info(f"Refreshed {len(keys)} rows of {table}")
+            if key == 'player_id':
+                refresh_player_form(cursor, sorted(keys))
+
+        for chunk in chunks(game_ids):
+            cursor.execute(
+                f"UPDATE game_manifest SET aggregated = 1 WHERE game_id IN ({', '.join(['%s'] * len(chunk))})",
+                chunk
+            )
+        connection.commit()
+        logger.info(f"Refreshed aggregates for {len(game_ids)} games in {time.monotonic() - started_at:.2f} seconds")
+        return len(game_ids)
+    except Exception:
+        if connection:
+            connection.rollback()
+        raise
+    finally:
+        if connection:
+            connection.close()
+
+def rebuild_aggregates():
+    """Recompute player_stats, team_stats and player_form from every hustle_stats row, e.g. after a restore."""
+    started_at = time.monotonic()
+    connection = None
+    try:
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        for table, key, games_played in AGGREGATES:
+            cursor.execute(f"DELETE FROM {table}")
+            cursor.execute(aggregate_sql(table, key, games_played))
+        cursor.execute("DELETE FROM player_form")
+        cursor.execute(player_form_sql())
+        cursor.execute("UPDATE game_manifest SET aggregated = 1 WHERE status IN ('fetched', 'final')")
+        connection.commit()
+        logger.info(f"Rebuilt player and team aggregates in {time.monotonic() - started_at:.2f} seconds")
+    except Exception:
+        if connection:
+            connection.rollback()
+        raise
+    finally:
+        if connection:
+            connection.close()
@@ -0,0 +1,101 @@
+import logging
+import os
+import time
+import pyarrow as pa
+from database.config import get_db_connection
+from database.snapshot import arrow_schema, to_arrow, CHUNK_SIZE
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# The dashboard reads from MySQL ('mysql') or from a local DuckDB copy ('duckdb')
+READ_ENGINE = os.environ.get('DASH_READ_ENGINE', 'mysql').lower()
+
+# DuckDB file shared with app/database_utils.py, which resolves the same default
+DUCKDB_PATH = os.environ.get('NBA_DUCKDB_PATH') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'analytics', 'nba_dash.duckdb'
+)
+
+# Tables copied to DuckDB: the dimensions, the raw box scores and the aggregates the pages read
+ANALYTICS_TABLES = ['teams', 'players', 'games', 'hustle_stats', 'player_stats', 'team_stats', 'player_form']
+
+# MySQL sources of DuckDB tables that differ from the table name; archived seasons are included
+ANALYTICS_SOURCES = {'hustle_stats': 'hustle_stats_all'}
+
+def copy_table(connection, duck, table, source=None):
+    """Stream one MySQL table or view into a new DuckDB table in Arrow chunks. Returns the row count."""
+    source = source or table
+    cursor = connection.cursor()
+    schema = arrow_schema(cursor, source)
+    cursor.close()
+
+    duck.register('chunk', pa.Table.from_batches([], schema=schema))
+    duck.execute(f'CREATE TABLE "{table}" AS SELECT * FROM chunk')
+    duck.unregister('chunk')
+
+    rows = 0
+    cursor = connection.cursor(buffered=False)
+    cursor.execute(f"SELECT {', '.join(f'`{name}`' for name in schema.names)} FROM `{source}`")
+    while True:
+        chunk = cursor.fetchmany(CHUNK_SIZE)
+        if not chunk:
+            break
+        columns = list(zip(*chunk))
+        duck.register('chunk', pa.Table.from_arrays(
+            [to_arrow(values, field.type) for values, field in zip(columns, schema)],
+            schema=schema
+        ))
+        duck.execute(f'INSERT INTO "{table}" SELECT * FROM chunk')
+        duck.unregister('chunk')
+        rows += len(chunk)
+    cursor.close()
+    return rows
+
+def sync_analytics_store(path=DUCKDB_PATH, tables=ANALYTICS_TABLES, force=False):
+    """
+    Copy the dashboard tables from MySQL into the DuckDB file the dashboard reads.
+    The copy is built in a temporary file and moved into place, so open dashboard
+    sessions keep reading the previous copy until they pick up the new one.
+    Args:
+        path (str): DuckDB file to replace.
+        tables (list): Tables to copy.
+        force (bool): Sync even when DASH_READ_ENGINE is not 'duckdb'.
+    Returns:
+        dict: {table: rows copied}, or None when the DuckDB read path is disabled.
+    """
+    if READ_ENGINE != 'duckdb' and not force:
+        return None
+
+    import duckdb
+
+    started_at = time.monotonic()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+
+    counts = {}
+    connection = None
+    try:
+        duck = duckdb.connect(temp_path)
+        try:
+            connection = get_db_connection()
+            for table in tables:
+                counts[table] = copy_table(connection, duck, table, ANALYTICS_SOURCES.get(table))
+            duck.execute("CHECKPOINT")
+        finally:
+            duck.close()
+            if connection:
+                connection.close()
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    os.replace(temp_path, path)
+    logger.info(f"Synced {', '.join(f'{table} ({rows} rows)' for table, rows in counts.items())} "
+                f"to {path} in {time.monotonic() - started_at:.2f} seconds")
+    return counts
+
+if __name__ == "__main__":
+    sync_analytics_store(force=True)
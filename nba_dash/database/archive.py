@@ -0,0 +1,123 @@
+import logging
+import sys
+import time
+from database.config import get_db_connection
+from database.partitions import get_partitions, current_season_start_year
+from database.run_lock import run_lock
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Compressed table holding the seasons moved out of hustle_stats; hustle_stats_all reads both
+ARCHIVE_TABLE = 'hustle_stats_archive'
+
+def archivable_partitions(cursor, through_year):
+    """Season partitions up to and including through_year, oldest first."""
+    return [
+        name for name in get_partitions(cursor)
+        if name.startswith('p_before_') or (name[1:].isdigit() and int(name[1:]) <= through_year)
+    ]
+
+def row_fingerprint(cursor, table, columns, join_partition=None):
+    """
+    (row count, checksum) of a table. The checksum sums a CRC32 of every row's values.
+    With join_partition, only rows whose key is in that hustle_stats partition are read.
+    """
+    values = ', '.join(f"IFNULL(a.{column}, 'NULL')" for column in columns)
+    checksum = f"SUM(CRC32(CONCAT_WS('|', {values})))"
+    sql = f"SELECT COUNT(*), COALESCE({checksum}, 0) FROM {table} a"
+    if join_partition:
+        sql += (f" JOIN hustle_stats PARTITION ({join_partition}) h"
+                f" ON h.game_id = a.game_id AND h.player_id = a.player_id AND h.game_date = a.game_date")
+    cursor.execute(sql)
+    count, total = cursor.fetchone()
+    return int(count), int(total)
+
+def archive_partition(connection, cursor, name, columns):
+    """
+    Move one season partition into the archive in a single transaction: copy, verify, delete.
+    columns is the list of the archive table's column names.
+    Nothing is committed unless every hot row is in the archive with identical values, so a
+    season is never readable from both tables. Hot rows of games already archived (e.g. by
+    an earlier run) replace their archived copy and leave the hot table the same way.
+    Returns:
+        int: Rows moved.
+    """
+    select = ', '.join(columns)
+    try:
+        hot = row_fingerprint(cursor, f"hustle_stats PARTITION ({name})", columns)
+        if not hot[0]:
+            connection.rollback()
+            return 0
+
+        # REPLACE: the hot copy is the newest version of a row already in the archive
+        cursor.execute(
+            f"REPLACE INTO {ARCHIVE_TABLE} ({select}) SELECT {select} FROM hustle_stats PARTITION ({name})"
+        )
+        archived = row_fingerprint(cursor, ARCHIVE_TABLE, columns, join_partition=name)
+        if archived != hot:
+            raise ValueError(f"Archive copy of {name} does not match: {archived[0]} rows (checksum {archived[1]}), "
+                             f"expected {hot[0]} rows (checksum {hot[1]}); partition kept")
+
+        cursor.execute(f"DELETE FROM hustle_stats PARTITION ({name})")
+        if cursor.rowcount != hot[0]:
+            raise ValueError(f"Deleted {cursor.rowcount} rows from {name}, expected {hot[0]}; partition kept")
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+
+    # Give the emptied partition's space back; REBUILD keeps any row written since
+    cursor.execute(f"ALTER TABLE hustle_stats REBUILD PARTITION {name}")
+    return hot[0]
+
+def archive_seasons(through_year=None):
+    """
+    Move completed seasons out of hustle_stats into the compressed archive table.
+    Archived seasons stay readable through the hustle_stats_all view, and the
+    aggregate refreshes read both tables. Each season moves in one transaction.
+    Holds the update lock, so scheduled updates are skipped while partitions move.
+    Args:
+        through_year (int): Start year of the last season to archive; defaults to the
+                            season before the current one.
+    Returns:
+        dict: {partition: rows moved}, or None if an update was running.
+    """
+    through_year = through_year if through_year is not None else current_season_start_year() - 1
+    started_at = time.monotonic()
+    with run_lock() as acquired:
+        if not acquired:
+            logger.warning("An update is running; archival skipped")
+            return None
+
+        moved = {}
+        connection = None
+        try:
+            connection = get_db_connection()
+            cursor = connection.cursor()
+            cursor.execute(
+                """
+                SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+                ORDER BY ORDINAL_POSITION
+                """,
+                (ARCHIVE_TABLE,)
+            )
+            columns = [row[0] for row in cursor.fetchall()]
+
+            for name in archivable_partitions(cursor, through_year):
+                rows = archive_partition(connection, cursor, name, columns)
+                if rows:
+                    moved[name] = rows
+                    logger.info(f"Archived {rows} hustle_stats rows from partition {name}")
+        finally:
+            if connection:
+                connection.close()
+
+    logger.info(f"Archived {sum(moved.values())} rows from {len(moved)} season partitions "
+                f"in {time.monotonic() - started_at:.2f} seconds")
+    return moved
+
+if __name__ == "__main__":
+    # e.g. `python -m database.archive 2022` archives every season up to 2022-23
+    archive_seasons(int(sys.argv[1]) if len(sys.argv) > 1 else None)
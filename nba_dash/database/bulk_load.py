@@ -0,0 +1,111 @@
+import csv
+import logging
+import os
+import tempfile
+from database.config import get_db_connection, LOCAL_INFILE
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Rows per multi-row INSERT statement when LOAD DATA LOCAL INFILE is not available
+INSERT_CHUNK_SIZE = 1000
+
+def rows_from(data, columns):
+    """Return plain Python rows from a list of tuples or a pandas DataFrame."""
+    if hasattr(data, 'to_csv'):
+        # astype(object) hands the driver plain Python ints instead of NumPy scalars, and NaN becomes NULL
+        frame = data[columns].astype(object)
+        return frame.where(frame.notna(), None).values.tolist()
+    return data
+
+def create_staging_table(cursor, table, columns):
+    """Create an empty, index-free session copy of the given columns of a table."""
+    staging = f"staging_{table}"
+    cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {staging}")
+    cursor.execute(
+        f"CREATE TEMPORARY TABLE {staging} SELECT {', '.join(columns)} FROM {table} LIMIT 0"
+    )
+    return staging
+
+def load_infile(cursor, table, columns, data):
+    """Stream rows into a table through a temporary CSV and LOAD DATA LOCAL INFILE."""
+    with tempfile.NamedTemporaryFile('w', suffix='.csv', newline='', delete=False) as f:
+        path = f.name
+        if hasattr(data, 'to_csv'):
+            data[columns].to_csv(f, header=False, index=False, na_rep='\\N', lineterminator='\n')
+        else:
+            writer = csv.writer(f, lineterminator='\n')
+            for row in data:
+                writer.writerow(['\\N' if value is None else value for value in row])
+    try:
+        cursor.execute(
+            f"""
+            LOAD DATA LOCAL INFILE %s INTO TABLE {table}
+            FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"'
+            LINES TERMINATED BY '\\n'
+            ({', '.join(columns)})
+            """,
+            (path,)
+        )
+    finally:
+        os.remove(path)
+
+def load_inserts(cursor, table, columns, data):
+    """Load rows into a table with large multi-row INSERT statements."""
+    rows = rows_from(data, columns)
+    placeholders = f"({', '.join(['%s'] * len(columns))})"
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        chunk = rows[start:start + INSERT_CHUNK_SIZE]
+        sql = (
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+            + ", ".join([placeholders] * len(chunk))
+        )
+        cursor.execute(sql, [value for row in chunk for value in row])
+
+def load_rows(cursor, table, columns, data):
+    """Append rows to a table with LOAD DATA LOCAL INFILE when enabled, else multi-row INSERTs."""
+    if LOCAL_INFILE:
+        load_infile(cursor, table, columns, data)
+    else:
+        load_inserts(cursor, table, columns, data)
+
+def bulk_upsert(table, columns, update_columns, data):
+    """
+    Upsert rows into a table through a staging table and one set-based merge.
+    Args:
+        table (str): Target table, e.g. 'hustle_stats'.
+        columns (list): Column order of the rows in data.
+        update_columns (list): Columns overwritten when a row's key already exists.
+        data: List of tuples or a pandas DataFrame containing the columns.
+    Returns:
+        int: Number of rows staged.
+    """
+    if data is None or len(data) == 0:
+        return 0
+
+    connection = None
+    try:
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        staging = create_staging_table(cursor, table, columns)
+        load_rows(cursor, staging, columns, data)
+
+        updates = ",\n            ".join(f"{column} = VALUES({column})" for column in update_columns)
+        cursor.execute(
+            f"""
+            INSERT INTO {table} ({', '.join(columns)})
+            SELECT {', '.join(columns)} FROM {staging}
+            ON DUPLICATE KEY UPDATE
+            {updates}
+            """
+        )
+        connection.commit()
+        cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {staging}")
+        return len(data)
+    except Exception:
+        if connection:
+            connection.rollback()
+        raise
+    finally:
+        if connection:
+            connection.close()
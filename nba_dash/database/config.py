@@ -13,6 +13,11 @@ DB_CONFIG = {
     'host': os.environ.get('DB_HOST'),
 }
 
+# Bulk loads use LOAD DATA LOCAL INFILE when enabled (the server also needs local_infile=ON)
+LOCAL_INFILE = os.environ.get('DB_LOCAL_INFILE', '').lower() in ('1', 'true', 'yes')
+if LOCAL_INFILE:
+    DB_CONFIG['allow_local_infile'] = True
+
 def connect_to_mysql(use_database=True):
     """
     Establish connection to MySQL database
@@ -58,5 +63,7 @@ def execute_query(connection, query, params=None, fetch=False):
             cursor.close()
 
 def get_db_connection():
-    """Helper function to get database connection."""
-    return connect_to_mysql(use_database=True)
\ No newline at end of file
+    """Helper function to borrow a pooled nba_db connection; close() returns it to the pool."""
+    # Imported here because database.pool reads DB_CONFIG from this module
+    from database.pool import get_connection
+    return get_connection()
\ No newline at end of file
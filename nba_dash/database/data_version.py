@@ -0,0 +1,32 @@
+import logging
+from database.config import get_db_connection
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def stamp_data_version(source):
+    """
+    Record that new data landed. The dashboard keys its cached results on the newest
+    version, so they stay cached until the next stamp and are then warmed again.
+    Args:
+        source (str): What wrote the data, e.g. 'daily_update' or 'backfill'.
+    Returns:
+        int: The new version, or None on error.
+    """
+    connection = None
+    try:
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        cursor.execute(
+            "INSERT INTO data_versions (source, created_at) VALUES (%s, NOW())",
+            (source,)
+        )
+        connection.commit()
+        logger.info(f"Stamped data version {cursor.lastrowid} ({source})")
+        return cursor.lastrowid
+    except Exception as e:
+        logger.error(f"Error stamping the data version: {e}")
+        return None
+    finally:
+        if connection:
+            connection.close()
@@ -0,0 +1,160 @@
+import logging
+import sys
+from datetime import timedelta
+from database.config import get_db_connection
+from database.aggregates import hustle_rows
+from database.archive import ARCHIVE_TABLE
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Known hot queries on hustle_stats and the plan each one is expected to use.
+# Placeholders are filled from the most recent hustle_stats row (see sample_values).
+# The aggregate refreshes read hot and archived rows through hustle_rows, as aggregates.py runs them.
+#   keys: acceptable values of EXPLAIN's `key` column for hustle_stats (and the archive, once it has rows)
+#   max_partitions: upper bound on the partitions read (None when the query is not date-bounded)
+KNOWN_QUERIES = [
+    {
+        'name': 'player aggregate refresh',
+        'sql': f"""
+            SELECT player_id, COUNT(*), SUM(pts), SUM(deflections), SUM(boxouts)
+            FROM {hustle_rows(['game_id', 'player_id', 'pts', 'deflections', 'boxouts'],
+                              "WHERE player_id IN (%(player_id)s)")} rows_all
+            GROUP BY player_id
+        """,
+        'keys': ['idx_hustle_player_date', 'idx_archive_player_date'],
+        'max_partitions': None,
+    },
+    {
+        'name': 'team aggregate refresh',
+        'sql': f"""
+            SELECT team_id, COUNT(DISTINCT game_id), SUM(pts), SUM(deflections)
+            FROM {hustle_rows(['game_id', 'team_id', 'pts', 'deflections'],
+                              "WHERE team_id IN (%(team_id)s)")} rows_all
+            GROUP BY team_id
+        """,
+        'keys': ['idx_hustle_team_date', 'idx_archive_team_date'],
+        'max_partitions': None,
+    },
+    {
+        'name': 'players of ingested games',
+        'sql': "SELECT DISTINCT player_id FROM hustle_stats WHERE game_id IN (%(game_id)s)",
+        # idx_hustle_game_team carries the primary key columns, so it covers this query as well
+        'keys': ['PRIMARY', 'idx_hustle_game_team'],
+        'max_partitions': None,
+    },
+    {
+        'name': 'teams of ingested games',
+        'sql': "SELECT DISTINCT team_id FROM hustle_stats WHERE game_id IN (%(game_id)s)",
+        'keys': ['idx_hustle_game_team'],
+        'max_partitions': None,
+    },
+    {
+        'name': 'player game log',
+        'sql': """
+            SELECT game_date, pts, deflections, boxouts FROM hustle_stats
+            WHERE player_id = %(player_id)s ORDER BY game_date DESC LIMIT 20
+        """,
+        'keys': ['idx_hustle_player_date'],
+        'max_partitions': None,
+    },
+    {
+        'name': 'player form refresh',
+        'sql': f"""
+            SELECT player_id, game_date, deflections,
+                   ROW_NUMBER() OVER (PARTITION BY player_id ORDER BY game_date DESC, game_id DESC)
+            FROM {hustle_rows(['game_id', 'player_id', 'game_date', 'deflections'],
+                              "WHERE minutes > 0 AND player_id IN (%(player_id)s)")} rows_all
+        """,
+        'keys': ['idx_hustle_player_date', 'idx_archive_player_date'],
+        'max_partitions': None,
+    },
+    {
+        'name': 'league date window',
+        'sql': """
+            SELECT player_id, SUM(pts) FROM hustle_stats
+            WHERE game_date BETWEEN %(week_start)s AND %(game_date)s GROUP BY player_id
+        """,
+        'keys': ['idx_hustle_date', 'idx_hustle_player_date'],
+        'max_partitions': 2,
+    },
+    {
+        'name': 'team date window',
+        'sql': """
+            SELECT game_date, SUM(deflections) FROM hustle_stats
+            WHERE team_id = %(team_id)s AND game_date BETWEEN %(week_start)s AND %(game_date)s
+            GROUP BY game_date
+        """,
+        'keys': ['idx_hustle_team_date'],
+        'max_partitions': 2,
+    },
+]
+
+def sample_values(cursor):
+    """Pick realistic parameter values from the newest hustle_stats row."""
+    cursor.execute(
+        "SELECT game_id, player_id, team_id, game_date FROM hustle_stats ORDER BY game_date DESC LIMIT 1"
+    )
+    row = cursor.fetchone()
+    if row is None:
+        raise ValueError("hustle_stats is empty; load some data before checking query plans")
+    game_id, player_id, team_id, game_date = row['game_id'], row['player_id'], row['team_id'], row['game_date']
+    return {
+        'game_id': game_id,
+        'player_id': player_id,
+        'team_id': team_id,
+        'game_date': game_date,
+        'week_start': game_date - timedelta(days=7),
+    }
+
+def check_plan(query, plan, tables=('hustle_stats',)):
+    """Return the list of problems found in a query's EXPLAIN rows for the given tables."""
+    problems = []
+    for row in plan:
+        if row['table'] not in tables:
+            continue
+        if row['type'] == 'ALL':
+            problems.append("full table scan")
+        if row['key'] not in query['keys']:
+            problems.append(f"uses index {row['key']}, expected {' or '.join(query['keys'])}")
+        partitions = [name for name in (row.get('partitions') or '').split(',') if name]
+        if query['max_partitions'] and len(partitions) > query['max_partitions']:
+            problems.append(f"reads {len(partitions)} partitions, expected at most {query['max_partitions']}")
+    return problems
+
+def check_query_plans(queries=KNOWN_QUERIES):
+    """
+    EXPLAIN every known query and compare the plan with its expectations.
+    Returns:
+        dict: {query name: list of problems}; an empty list means the plan is as expected.
+    """
+    connection = None
+    try:
+        connection = get_db_connection()
+        cursor = connection.cursor(dictionary=True)
+        values = sample_values(cursor)
+        # Plans on an empty archive say nothing about its indexes
+        cursor.execute(f"SELECT 1 FROM {ARCHIVE_TABLE} LIMIT 1")
+        tables = ('hustle_stats', ARCHIVE_TABLE) if cursor.fetchall() else ('hustle_stats',)
+
+        report = {}
+        for query in queries:
+            cursor.execute(f"EXPLAIN {query['sql']}", values)
+            plan = cursor.fetchall()
+            problems = check_plan(query, plan, tables)
+            report[query['name']] = problems
+            for row in plan:
+                logger.info(f"{query['name']}: table={row['table']} type={row['type']} key={row['key']} "
+                            f"partitions={row.get('partitions')} rows={row['rows']}")
+            if problems:
+                logger.error(f"{query['name']}: {'; '.join(problems)}")
+        return report
+    finally:
+        if connection:
+            connection.close()
+
+if __name__ == "__main__":
+    report = check_query_plans()
+    failed = [name for name, problems in report.items() if problems]
+    logger.info(f"{len(report) - len(failed)}/{len(report)} query plans as expected")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,111 @@
+import logging
+from database.config import get_db_connection
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+GAMES_COLUMNS = ['game_id', 'game_date', 'season', 'home_team_id', 'away_team_id']
+
+# Rows per executemany batch
+CHUNK_SIZE = 1000
+
+def season_of_game(game_id):
+    """NBA game IDs encode their season: 0022400001 is a 2024-25 game."""
+    year = int(str(game_id).zfill(10)[3:5])
+    start_year = 1900 + year if year >= 46 else 2000 + year
+    return f"{start_year}-{str(start_year + 1)[-2:]}"
+
+def split_matchup(matchup):
+    """Return (home abbreviation, away abbreviation) of "BOS vs. NYK" or "NYK @ BOS"."""
+    if ' vs. ' in matchup:
+        home, away = matchup.split(' vs. ', 1)
+        return home, away
+    if ' @ ' in matchup:
+        away, home = matchup.split(' @ ', 1)
+        return home, away
+    return None, None
+
+def write_games(cursor, rows):
+    cursor.executemany(
+        f"""
+        INSERT INTO games ({', '.join(GAMES_COLUMNS)})
+        VALUES ({', '.join(['%s'] * len(GAMES_COLUMNS))})
+        ON DUPLICATE KEY UPDATE
+            game_date = VALUES(game_date),
+            season = VALUES(season),
+            home_team_id = COALESCE(VALUES(home_team_id), home_team_id),
+            away_team_id = COALESCE(VALUES(away_team_id), away_team_id)
+        """,
+        rows
+    )
+
+def upsert_games(rows):
+    """
+    Insert or update games dimension rows.
+    A side whose team is unknown (None) never overwrites a known team.
+    Args:
+        rows (list): Tuples in GAMES_COLUMNS order.
+    Returns:
+        int: Number of rows written. Errors are raised after a rollback, since games is the
+             only source of matchups and seasons and must not silently fall behind hustle_stats.
+    """
+    if not rows:
+        return 0
+
+    connection = None
+    try:
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        for start in range(0, len(rows), CHUNK_SIZE):
+            write_games(cursor, rows[start:start + CHUNK_SIZE])
+        connection.commit()
+        logger.info(f"Recorded {len(rows)} games.")
+        return len(rows)
+    except Exception as e:
+        logger.error(f"Error recording games: {e}")
+        if connection:
+            connection.rollback()
+        raise
+    finally:
+        if connection:
+            connection.close()
+
+def games_from_hustle_stats(cursor):
+    """
+    Build games rows from the matchup strings of a hustle_stats table that still has them.
+    Abbreviations are resolved through teams; when only one side resolves (e.g. a relocated
+    team's old abbreviation) the game's other team fills the other side.
+    """
+    cursor.execute("SELECT team_abbreviation, team_id FROM teams")
+    team_ids_by_abbreviation = dict(cursor.fetchall())
+
+    cursor.execute(
+        """
+        SELECT game_id, MIN(game_date), MAX(matchup), GROUP_CONCAT(DISTINCT team_id)
+        FROM hustle_stats GROUP BY game_id
+        """
+    )
+    rows = []
+    for game_id, game_date, matchup, team_list in cursor.fetchall():
+        game_teams = {int(team_id) for team_id in team_list.split(',')} if team_list else set()
+        home, away = split_matchup(matchup or '')
+        home_team_id = team_ids_by_abbreviation.get(home)
+        away_team_id = team_ids_by_abbreviation.get(away)
+        home_team_id = home_team_id if home_team_id in game_teams else None
+        away_team_id = away_team_id if away_team_id in game_teams else None
+        if len(game_teams) == 2:
+            if home_team_id and not away_team_id:
+                away_team_id = (game_teams - {home_team_id}).pop()
+            elif away_team_id and not home_team_id:
+                home_team_id = (game_teams - {away_team_id}).pop()
+        rows.append((game_id, game_date, season_of_game(game_id), home_team_id, away_team_id))
+    return rows
+
+def backfill_games_from_hustle_stats(cursor):
+    """Record every game of hustle_stats in games before its matchup column is dropped. Returns the row count."""
+    rows = games_from_hustle_stats(cursor)
+    for start in range(0, len(rows), CHUNK_SIZE):
+        write_games(cursor, rows[start:start + CHUNK_SIZE])
+    unresolved = sum(1 for row in rows if row[3] is None or row[4] is None)
+    logger.info(f"Recorded {len(rows)} games from hustle_stats matchups ({unresolved} with an unknown side)")
+    return len(rows)
@@ -0,0 +1,225 @@
+import logging
+import re
+from datetime import date
+from database.config import get_db_connection
+from database.games import backfill_games_from_hustle_stats
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# hustle_stats is range-partitioned on game_date, one partition per season.
+# A season's partition ends on August 1st after it (the 2020 bubble games land in p2020).
+FIRST_PARTITION_YEAR = 2015
+PARTITION_BOUNDARY_MONTH = 8
+FUTURE_PARTITION = 'p_future'
+
+# Secondary indexes of hustle_stats and the access patterns they serve
+HUSTLE_STATS_INDEXES = {
+    # Affected teams of newly ingested games (covering)
+    'idx_hustle_game_team': ['game_id', 'team_id'],
+    # Player aggregates and per-player game logs ordered by date
+    'idx_hustle_player_date': ['player_id', 'game_date'],
+    # Team aggregates and per-team date windows
+    'idx_hustle_team_date': ['team_id', 'game_date'],
+    # League-wide date windows inside a partition
+    'idx_hustle_date': ['game_date'],
+}
+
+# The partitioning column must be part of every unique key
+HUSTLE_STATS_PRIMARY_KEY = ['game_id', 'player_id', 'game_date']
+
+# Compact column types of hustle_stats (minutes are seconds played, so they need a SMALLINT)
+HUSTLE_STATS_COLUMN_TYPES = {
+    'minutes': 'smallint unsigned',
+    'pts': 'smallint unsigned',
+    'contested_shots': 'tinyint unsigned',
+    'contested_shots_2pt': 'tinyint unsigned',
+    'contested_shots_3pt': 'tinyint unsigned',
+    'deflections': 'tinyint unsigned',
+    'charges_drawn': 'tinyint unsigned',
+    'screen_assists': 'tinyint unsigned',
+    'screen_ast_pts': 'smallint unsigned',
+    'off_loose_balls_recovered': 'tinyint unsigned',
+    'def_loose_balls_recovered': 'tinyint unsigned',
+    'loose_balls_recovered': 'tinyint unsigned',
+    'off_boxouts': 'tinyint unsigned',
+    'def_boxouts': 'tinyint unsigned',
+    'boxouts': 'tinyint unsigned',
+}
+
+def current_season_start_year(today=None):
+    today = today or date.today()
+    return today.year if today.month >= PARTITION_BOUNDARY_MONTH else today.year - 1
+
+def partition_name(start_year):
+    return f"p{start_year}"
+
+def partition_boundary(start_year):
+    """First game_date that no longer belongs to the season starting in start_year."""
+    return date(start_year + 1, PARTITION_BOUNDARY_MONTH, 1)
+
+def partition_definitions(start_year, end_year):
+    return [
+        f"PARTITION {partition_name(year)} VALUES LESS THAN ('{partition_boundary(year).isoformat()}')"
+        for year in range(start_year, end_year + 1)
+    ]
+
+def get_partitions(cursor, table='hustle_stats'):
+    cursor.execute(
+        """
+        SELECT PARTITION_NAME FROM INFORMATION_SCHEMA.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+        ORDER BY PARTITION_ORDINAL_POSITION
+        """,
+        (table,)
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+def get_indexes(cursor, table='hustle_stats'):
+    """Return {index name: [columns in order]} for a table."""
+    cursor.execute(
+        """
+        SELECT INDEX_NAME, COLUMN_NAME FROM INFORMATION_SCHEMA.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        ORDER BY INDEX_NAME, SEQ_IN_INDEX
+        """,
+        (table,)
+    )
+    indexes = {}
+    for index_name, column in cursor.fetchall():
+        indexes.setdefault(index_name, []).append(column)
+    return indexes
+
+def get_column_types(cursor, table='hustle_stats'):
+    """Return {column: lower-case column type without display width, e.g. 'tinyint unsigned'} for a table."""
+    cursor.execute(
+        """
+        SELECT COLUMN_NAME, COLUMN_TYPE FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """,
+        (table,)
+    )
+    return {column: re.sub(r'\(\d+\)', '', column_type.lower()) for column, column_type in cursor.fetchall()}
+
+def get_foreign_keys(cursor, table='hustle_stats'):
+    cursor.execute(
+        """
+        SELECT CONSTRAINT_NAME FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND CONSTRAINT_TYPE = 'FOREIGN KEY'
+        """,
+        (table,)
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+def fill_missing_game_dates(cursor):
+    """
+    Take NULL hustle_stats.game_date values from the games table before game_date becomes
+    part of the primary key. Raises ValueError naming the games that still have no date.
+    """
+    cursor.execute(
+        """
+        UPDATE hustle_stats h JOIN games g ON g.game_id = h.game_id
+        SET h.game_date = g.game_date
+        WHERE h.game_date IS NULL
+        """
+    )
+    if cursor.rowcount:
+        logger.info(f"Filled game_date of {cursor.rowcount} hustle_stats rows from games")
+
+    cursor.execute("SELECT game_id, COUNT(*) FROM hustle_stats WHERE game_date IS NULL GROUP BY game_id ORDER BY game_id")
+    missing = cursor.fetchall()
+    if missing:
+        listed = ', '.join(f"{game_id} ({rows} rows)" for game_id, rows in missing[:20])
+        more = f" and {len(missing) - 20} more games" if len(missing) > 20 else ""
+        raise ValueError(f"hustle_stats rows without a game_date and no date in games: {listed}{more}. "
+                         f"Record these games in games or delete their rows, then run the migration again.")
+
+def apply_hustle_stats_layout(through_year=None):
+    """
+    Bring hustle_stats to the compact, partitioned, indexed layout of schema.sql.
+    Tables restored from older dumps (e.g. data.sql) are altered in place: their matchup
+    strings are moved to the games table first, then the column is dropped and the counters
+    shrunk. Missing game dates are taken from games before game_date joins the primary
+    key. A table that already matches is left untouched apart from adding missing season
+    partitions.
+    Args:
+        through_year (int): Start year of the last season that needs its own partition.
+    """
+    through_year = through_year or current_season_start_year()
+    connection = None
+    try:
+        connection = get_db_connection()
+        cursor = connection.cursor()
+
+        # Partitioned InnoDB tables cannot have foreign keys
+        alterations = [f"DROP FOREIGN KEY `{name}`" for name in get_foreign_keys(cursor)]
+
+        column_types = get_column_types(cursor)
+        if 'matchup' in column_types:
+            backfill_games_from_hustle_stats(cursor)
+            connection.commit()
+            alterations.append("DROP COLUMN matchup")
+        for column, column_type in HUSTLE_STATS_COLUMN_TYPES.items():
+            if column_types.get(column) != column_type:
+                alterations.append(f"MODIFY {column} {column_type.upper()}")
+
+        indexes = get_indexes(cursor)
+        if indexes.get('PRIMARY') != HUSTLE_STATS_PRIMARY_KEY:
+            fill_missing_game_dates(cursor)
+            connection.commit()
+            alterations += [
+                "MODIFY game_date DATE NOT NULL",
+                "DROP PRIMARY KEY",
+                f"ADD PRIMARY KEY ({', '.join(HUSTLE_STATS_PRIMARY_KEY)})",
+            ]
+        for index_name, columns in indexes.items():
+            if index_name != 'PRIMARY' and HUSTLE_STATS_INDEXES.get(index_name) != columns:
+                alterations.append(f"DROP INDEX `{index_name}`")
+        for index_name, columns in HUSTLE_STATS_INDEXES.items():
+            if indexes.get(index_name) != columns:
+                alterations.append(f"ADD INDEX {index_name} ({', '.join(columns)})")
+
+        if alterations:
+            logger.info(f"Altering hustle_stats: {'; '.join(alterations)}")
+            cursor.execute(f"ALTER TABLE hustle_stats {', '.join(alterations)}")
+
+        if not get_partitions(cursor):
+            definitions = [f"PARTITION p_before_{FIRST_PARTITION_YEAR} VALUES LESS THAN "
+                           f"('{partition_boundary(FIRST_PARTITION_YEAR - 1).isoformat()}')"]
+            definitions += partition_definitions(FIRST_PARTITION_YEAR, through_year)
+            definitions.append(f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE)")
+            logger.info(f"Partitioning hustle_stats into {len(definitions)} partitions by game_date")
+            cursor.execute(
+                f"ALTER TABLE hustle_stats PARTITION BY RANGE COLUMNS(game_date) ({', '.join(definitions)})"
+            )
+        else:
+            ensure_partitions(through_year, cursor)
+    finally:
+        if connection:
+            connection.close()
+
+def ensure_partitions(through_year, cursor=None):
+    """Split the catch-all partition so every season up to through_year has its own partition."""
+    if cursor is None:
+        connection = get_db_connection()
+        try:
+            return ensure_partitions(through_year, connection.cursor())
+        finally:
+            connection.close()
+
+    partitions = get_partitions(cursor)
+    years = [int(name[1:]) for name in partitions if name[1:].isdigit()]
+    if not partitions or FUTURE_PARTITION not in partitions:
+        return []
+    start_year = max(years) + 1 if years else FIRST_PARTITION_YEAR
+    if start_year > through_year:
+        return []
+
+    definitions = partition_definitions(start_year, through_year)
+    definitions.append(f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE)")
+    cursor.execute(
+        f"ALTER TABLE hustle_stats REORGANIZE PARTITION {FUTURE_PARTITION} INTO ({', '.join(definitions)})"
+    )
+    added = [partition_name(year) for year in range(start_year, through_year + 1)]
+    logger.info(f"Added hustle_stats partitions: {', '.join(added)}")
+    return added
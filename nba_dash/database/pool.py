@@ -0,0 +1,61 @@
+import logging
+import os
+import threading
+import time
+from mysql.connector import pooling, Error
+from mysql.connector.errors import PoolError
+from database.config import DB_CONFIG
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# mysql-connector caps a pool at 32 connections
+POOL_SIZE = min(int(os.environ.get('DB_POOL_SIZE', 5)), 32)
+
+# Seconds to wait for a free connection before giving up
+POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 30))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """Return the process-wide nba_db connection pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            config = DB_CONFIG.copy()
+            config['database'] = 'nba_db'
+            _pool = pooling.MySQLConnectionPool(
+                pool_name='nba_db_pool',
+                pool_size=POOL_SIZE,
+                pool_reset_session=True,
+                **config
+            )
+            logger.info(f"Created MySQL connection pool with {POOL_SIZE} connections")
+        return _pool
+
+def get_connection(timeout=POOL_TIMEOUT):
+    """
+    Borrow a healthy connection from the pool.
+    Calling close() on the returned connection hands it back to the pool.
+    Args:
+        timeout (float): Seconds to wait while every pooled connection is in use.
+    """
+    pool = get_pool()
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            connection = pool.get_connection()
+            break
+        except PoolError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.05)
+
+    # Health check: reconnect connections dropped by the server (e.g. wait_timeout)
+    try:
+        connection.ping(reconnect=True, attempts=2, delay=1)
+    except Error:
+        connection.close()
+        raise
+    return connection
@@ -0,0 +1,82 @@
+import logging
+import socket
+from contextlib import contextmanager
+from database.config import get_db_connection
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+UPDATE_LOCK = 'nba_db.update'
+
+@contextmanager
+def run_lock(name=UPDATE_LOCK):
+    """
+    Hold a MySQL named lock for the duration of the block; yields False if another session holds it.
+    The lock belongs to the connection, so it is released even if the process dies mid-run.
+    Args:
+        name (str): Lock name shared by every process that must not run concurrently.
+    """
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    acquired = False
+    try:
+        cursor.execute("SELECT GET_LOCK(%s, 0)", (name,))
+        acquired = cursor.fetchone()[0] == 1
+        yield acquired
+    finally:
+        if acquired:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (name,))
+            cursor.fetchone()
+        cursor.close()
+        connection.close()
+
+def record_run_start(trigger_name):
+    """Insert a 'running' row into scheduler_runs and return its run_id."""
+    connection = None
+    try:
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        cursor.execute(
+            """
+            INSERT INTO scheduler_runs (trigger_name, host, started_at, status)
+            VALUES (%s, %s, NOW(), 'running')
+            """,
+            (trigger_name, socket.gethostname())
+        )
+        connection.commit()
+        return cursor.lastrowid
+    finally:
+        if connection:
+            connection.close()
+
+def record_run_finish(run_id, status):
+    connection = None
+    try:
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        cursor.execute(
+            "UPDATE scheduler_runs SET finished_at = NOW(), status = %s WHERE run_id = %s",
+            (status, run_id)
+        )
+        connection.commit()
+    finally:
+        if connection:
+            connection.close()
+
+def minutes_since_last_success():
+    """Minutes since the last successful run finished, or None if there has not been one."""
+    connection = None
+    try:
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        cursor.execute(
+            """
+            SELECT TIMESTAMPDIFF(MINUTE, MAX(finished_at), NOW())
+            FROM scheduler_runs
+            WHERE status = 'success'
+            """
+        )
+        return cursor.fetchone()[0]
+    finally:
+        if connection:
+            connection.close()
@@ -26,13 +26,127 @@ CREATE TABLE IF NOT EXISTS players (
     FOREIGN KEY (team_id) REFERENCES teams(team_id) ON DELETE SET NULL
 );
 
--- Create hustle_stats table
+-- Create games table (one row per game; the dimension hustle_stats rows join to for matchups and seasons)
+CREATE TABLE IF NOT EXISTS games (
+    game_id INT PRIMARY KEY,
+    game_date DATE NOT NULL,
+    season CHAR(7) NOT NULL,
+    home_team_id INT,
+    away_team_id INT,
+    INDEX idx_games_season_date (season, game_date),
+    INDEX idx_games_date (game_date)
+);
+
+-- Create hustle_stats table, partitioned by season (August to August); database/partitions.py adds new seasons.
+-- Counters use the smallest type that holds them; minutes are seconds played.
 CREATE TABLE IF NOT EXISTS hustle_stats (
     game_id INT,
     team_id INT,
     player_id INT,
+    game_date DATE NOT NULL,
+    minutes SMALLINT UNSIGNED,
+    pts SMALLINT UNSIGNED,
+    contested_shots TINYINT UNSIGNED,
+    contested_shots_2pt TINYINT UNSIGNED,
+    contested_shots_3pt TINYINT UNSIGNED,
+    deflections TINYINT UNSIGNED,
+    charges_drawn TINYINT UNSIGNED,
+    screen_assists TINYINT UNSIGNED,
+    screen_ast_pts SMALLINT UNSIGNED,
+    off_loose_balls_recovered TINYINT UNSIGNED,
+    def_loose_balls_recovered TINYINT UNSIGNED,
+    loose_balls_recovered TINYINT UNSIGNED,
+    off_boxouts TINYINT UNSIGNED,
+    def_boxouts TINYINT UNSIGNED,
+    boxouts TINYINT UNSIGNED,
+    PRIMARY KEY (game_id, player_id, game_date),
+    INDEX idx_hustle_game_team (game_id, team_id),
+    INDEX idx_hustle_player_date (player_id, game_date),
+    INDEX idx_hustle_team_date (team_id, game_date),
+    INDEX idx_hustle_date (game_date)
+)
+PARTITION BY RANGE COLUMNS(game_date) (
+    PARTITION p_before_2015 VALUES LESS THAN ('2015-08-01'),
+    PARTITION p2015 VALUES LESS THAN ('2016-08-01'),
+    PARTITION p2016 VALUES LESS THAN ('2017-08-01'),
+    PARTITION p2017 VALUES LESS THAN ('2018-08-01'),
+    PARTITION p2018 VALUES LESS THAN ('2019-08-01'),
+    PARTITION p2019 VALUES LESS THAN ('2020-08-01'),
+    PARTITION p2020 VALUES LESS THAN ('2021-08-01'),
+    PARTITION p2021 VALUES LESS THAN ('2022-08-01'),
+    PARTITION p2022 VALUES LESS THAN ('2023-08-01'),
+    PARTITION p2023 VALUES LESS THAN ('2024-08-01'),
+    PARTITION p2024 VALUES LESS THAN ('2025-08-01'),
+    PARTITION p2025 VALUES LESS THAN ('2026-08-01'),
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
+
+-- Create hustle_stats_archive table (completed seasons moved out of hustle_stats by database/archive.py)
+CREATE TABLE IF NOT EXISTS hustle_stats_archive (
+    game_id INT,
+    team_id INT,
+    player_id INT,
+    game_date DATE NOT NULL,
+    minutes SMALLINT UNSIGNED,
+    pts SMALLINT UNSIGNED,
+    contested_shots TINYINT UNSIGNED,
+    contested_shots_2pt TINYINT UNSIGNED,
+    contested_shots_3pt TINYINT UNSIGNED,
+    deflections TINYINT UNSIGNED,
+    charges_drawn TINYINT UNSIGNED,
+    screen_assists TINYINT UNSIGNED,
+    screen_ast_pts SMALLINT UNSIGNED,
+    off_loose_balls_recovered TINYINT UNSIGNED,
+    def_loose_balls_recovered TINYINT UNSIGNED,
+    loose_balls_recovered TINYINT UNSIGNED,
+    off_boxouts TINYINT UNSIGNED,
+    def_boxouts TINYINT UNSIGNED,
+    boxouts TINYINT UNSIGNED,
+    PRIMARY KEY (game_id, player_id, game_date),
+    INDEX idx_archive_game_team (game_id, team_id),
+    INDEX idx_archive_player_date (player_id, game_date),
+    INDEX idx_archive_team_date (team_id, game_date),
+    INDEX idx_archive_date (game_date)
+) ROW_FORMAT=COMPRESSED KEY_BLOCK_SIZE=8;
+
+-- Create hustle_stats_all view (every season, hot and archived)
+CREATE OR REPLACE VIEW hustle_stats_all AS
+SELECT game_id, team_id, player_id, game_date, minutes, pts, contested_shots, contested_shots_2pt,
+       contested_shots_3pt, deflections, charges_drawn, screen_assists, screen_ast_pts,
+       off_loose_balls_recovered, def_loose_balls_recovered, loose_balls_recovered,
+       off_boxouts, def_boxouts, boxouts
+FROM hustle_stats
+UNION ALL
+SELECT game_id, team_id, player_id, game_date, minutes, pts, contested_shots, contested_shots_2pt,
+       contested_shots_3pt, deflections, charges_drawn, screen_assists, screen_ast_pts,
+       off_loose_balls_recovered, def_loose_balls_recovered, loose_balls_recovered,
+       off_boxouts, def_boxouts, boxouts
+FROM hustle_stats_archive;
+
+-- Insert the Free Agents team
+INSERT IGNORE INTO teams (team_id, season_year, team_city, team_name, team_abbreviation, team_conference, wins, losses, win_pct)
+VALUES (0, "2024-25", 'Free Agents', 'Free Agents', 'FA', 'FA', 0, 0, 0.0);
+
+-- Create game_manifest table (one row per game, drives hustle stats ingestion)
+CREATE TABLE IF NOT EXISTS game_manifest (
+    game_id INT PRIMARY KEY,
     game_date DATE,
     matchup VARCHAR(255),
+    season VARCHAR(10),
+    status ENUM('pending', 'fetched', 'failed', 'final') NOT NULL DEFAULT 'pending',
+    attempts INT NOT NULL DEFAULT 0,
+    last_error VARCHAR(500),
+    aggregated TINYINT(1) NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_manifest_status (status),
+    INDEX idx_manifest_season_status (season, status),
+    INDEX idx_manifest_aggregated (aggregated)
+);
+
+-- Create player_stats table (hustle_stats totals per player, refreshed for the players of newly ingested games)
+CREATE TABLE IF NOT EXISTS player_stats (
+    player_id INT PRIMARY KEY,
+    games_played INT NOT NULL,
     minutes INT,
     pts INT,
     contested_shots INT,
@@ -48,11 +162,62 @@ CREATE TABLE IF NOT EXISTS hustle_stats (
     off_boxouts INT,
     def_boxouts INT,
     boxouts INT,
-    PRIMARY KEY (game_id, player_id),
-    INDEX idx_hustle_game (game_id),
-    INDEX idx_hustle_team (team_id)
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
 );
 
--- Insert the Free Agents team
-INSERT IGNORE INTO teams (team_id, season_year, team_city, team_name, team_abbreviation, team_conference, wins, losses, win_pct)
-VALUES (0, "2024-25", 'Free Agents', 'Free Agents', 'FA', 'FA', 0, 0, 0.0);
\ No newline at end of file
+-- Create team_stats table (hustle_stats totals per team, refreshed for the teams of newly ingested games)
+CREATE TABLE IF NOT EXISTS team_stats (
+    team_id INT PRIMARY KEY,
+    games_played INT NOT NULL,
+    minutes INT,
+    pts INT,
+    contested_shots INT,
+    contested_shots_2pt INT,
+    contested_shots_3pt INT,
+    deflections INT,
+    charges_drawn INT,
+    screen_assists INT,
+    screen_ast_pts INT,
+    off_loose_balls_recovered INT,
+    def_loose_balls_recovered INT,
+    loose_balls_recovered INT,
+    off_boxouts INT,
+    def_boxouts INT,
+    boxouts INT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+-- Create scheduler_runs table (one row per scheduled update, used to coalesce runs)
+CREATE TABLE IF NOT EXISTS scheduler_runs (
+    run_id INT AUTO_INCREMENT PRIMARY KEY,
+    trigger_name VARCHAR(50),
+    host VARCHAR(255),
+    started_at DATETIME NOT NULL,
+    finished_at DATETIME,
+    status ENUM('running', 'success', 'failed') NOT NULL DEFAULT 'running',
+    INDEX idx_scheduler_runs_status (status, finished_at)
+);
+
+-- Create player_form table (hustle_stats totals over each player's last 5, 10 and 20 games played)
+CREATE TABLE IF NOT EXISTS player_form (
+    player_id INT,
+    window_size TINYINT,
+    games INT NOT NULL,
+    last_game_date DATE,
+    pts INT,
+    contested_shots INT,
+    deflections INT,
+    charges_drawn INT,
+    screen_assists INT,
+    loose_balls_recovered INT,
+    boxouts INT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (player_id, window_size)
+);
+
+-- Create data_versions table (one row per run that wrote new data; the dashboard caches results per version)
+CREATE TABLE IF NOT EXISTS data_versions (
+    version INT AUTO_INCREMENT PRIMARY KEY,
+    source VARCHAR(50),
+    created_at DATETIME NOT NULL
+);
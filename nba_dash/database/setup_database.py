@@ -1,24 +1,211 @@
 import os
+import re
+import time
 import logging
-from database.config import connect_to_mysql, execute_query
+from concurrent.futures import ThreadPoolExecutor
+from database.config import connect_to_mysql, execute_query, get_db_connection
+from database.partitions import apply_hustle_stats_layout
+from database.snapshot import snapshot_exists, import_snapshot
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Number of tables restored concurrently from data.sql
+RESTORE_WORKERS = int(os.environ.get('DB_RESTORE_WORKERS', 3))
+
+# Next character that can change the parser state outside of quotes and comments
+SPECIAL_CHARS = re.compile(r"['\"`;#]|--|/\*")
+
+# End of a quoted string or identifier, or a backslash escape inside it
+QUOTE_ENDS = {quote: re.compile(r"\\.|" + re.escape(quote), re.DOTALL) for quote in ("'", '"', '`')}
+
+# Statements that target a single table; the table name is captured
+TABLE_STATEMENT = re.compile(
+    r"^\s*(?:/\*!\d*\s*)?(?:DROP\s+TABLE(?:\s+IF\s+EXISTS)?|CREATE\s+TABLE(?:\s+IF\s+NOT\s+EXISTS)?|"
+    r"LOCK\s+TABLES|INSERT(?:\s+IGNORE)?\s+INTO|ALTER\s+TABLE)\s+`?(\w+)`?",
+    re.IGNORECASE
+)
+
+# Statements skipped inside a transactional restore: table locks and MyISAM-only key toggles
+SKIPPED_STATEMENT = re.compile(
+    r"^\s*(?:LOCK\s+TABLES|UNLOCK\s+TABLES|/\*!40000\s+ALTER\s+TABLE\s+\S+\s+(?:DISABLE|ENABLE)\s+KEYS)",
+    re.IGNORECASE
+)
+
+def iter_sql_statements(sql_file):
+    """
+    Yield the statements of a SQL script one at a time without reading the whole file.
+    Semicolons inside quoted strings or identifiers and comments are ignored; executable
+    /*! ... */ comments written by mysqldump are kept as part of their statement.
+    """
+    statement = []
+    quote = None
+    in_comment = False
+    for line in sql_file:
+        pos = 0
+        while pos < len(line):
+            if in_comment:
+                end = line.find('*/', pos)
+                if end == -1:
+                    pos = len(line)
+                else:
+                    in_comment = False
+                    pos = end + 2
+            elif quote:
+                match = QUOTE_ENDS[quote].search(line, pos)
+                if not match:
+                    statement.append(line[pos:])
+                    pos = len(line)
+                else:
+                    statement.append(line[pos:match.end()])
+                    pos = match.end()
+                    if match.group() == quote:
+                        quote = None
+            else:
+                match = SPECIAL_CHARS.search(line, pos)
+                if not match:
+                    statement.append(line[pos:])
+                    break
+                statement.append(line[pos:match.start()])
+                token = match.group()
+                pos = match.end()
+                if token in ("'", '"', '`'):
+                    statement.append(token)
+                    quote = token
+                elif token == ';':
+                    text = ''.join(statement).strip()
+                    if text:
+                        yield text
+                    statement = []
+                elif token == '#' or (token == '--' and line[pos:pos + 1] in ('', ' ', '\t', '\n', '\r')):
+                    statement.append('\n')
+                    break
+                elif token == '--':
+                    statement.append(token)
+                elif line.startswith('/*!', match.start()):
+                    # Executable comment: keep it verbatim up to its end
+                    end = line.find('*/', pos)
+                    if end == -1:
+                        raise ValueError("Unterminated /*! ... */ comment in SQL script")
+                    statement.append(line[match.start():end + 2])
+                    pos = end + 2
+                else:
+                    statement.append(' ')
+                    in_comment = True
+    text = ''.join(statement).strip()
+    if text:
+        yield text
+
+def group_statements_by_table(statements):
+    """
+    Group a statement stream into (table, statements) runs.
+    Statements before the first table are yielded with table None; later table-less
+    statements (e.g. character set switches) stay with the table they follow.
+    """
+    table = None
+    group = []
+    for statement in statements:
+        match = TABLE_STATEMENT.match(statement)
+        if match and match.group(1) != table:
+            if group:
+                yield table, group
+            table = match.group(1)
+            group = []
+        group.append(statement)
+    if group:
+        yield table, group
+
+def restore_table(connection, table, statements, session_statements=()):
+    """
+    Run one table's statements with foreign key and unique checks deferred.
+    DDL runs first; all data statements then run in a single transaction.
+    Returns the number of rows written.
+    """
+    started_at = time.monotonic()
+    cursor = connection.cursor()
+    rows = 0
+    in_transaction = False
+    try:
+        for statement in session_statements:
+            cursor.execute(statement)
+        cursor.execute("SET SESSION foreign_key_checks = 0, unique_checks = 0")
+
+        for statement in statements:
+            if SKIPPED_STATEMENT.match(statement):
+                continue
+            if not in_transaction and re.match(r"^\s*INSERT\b", statement, re.IGNORECASE):
+                if connection.in_transaction:
+                    connection.commit()
+                connection.start_transaction()
+                in_transaction = True
+            cursor.execute(statement)
+            if cursor.rowcount > 0:
+                rows += cursor.rowcount
+        connection.commit()
+        logger.info(f"Restored {table or 'session settings'}: {rows} rows in "
+                    f"{time.monotonic() - started_at:.2f} seconds")
+        return rows
+    except Exception as e:
+        logger.error(f"Error restoring table {table}, rolled back: {e}")
+        connection.rollback()
+        raise
+    finally:
+        cursor.execute("SET SESSION foreign_key_checks = 1, unique_checks = 1")
+        cursor.close()
+
 def execute_sql_file(connection, file_path):
+    """Stream a SQL script on one connection, committing once per table."""
+    started_at = time.monotonic()
+    failed = []
+    try:
+        with open(file_path, 'r', encoding='utf-8') as sql_file:
+            for table, statements in group_statements_by_table(iter_sql_statements(sql_file)):
+                try:
+                    restore_table(connection, table, statements)
+                except Exception:
+                    failed.append(table)
+        logger.info(f"Executed {file_path} in {time.monotonic() - started_at:.2f} seconds")
+    except IOError as e:
+        logger.error(f"Error reading SQL file {file_path}: {e}")
+    return failed
+
+def restore_table_on_new_connection(table, statements, session_statements):
+    connection = get_db_connection()
+    try:
+        return restore_table(connection, table, statements, session_statements)
+    finally:
+        connection.close()
+
+def restore_dump(file_path, workers=RESTORE_WORKERS):
+    """
+    Restore a mysqldump file, loading independent tables in parallel.
+    Each table gets its own pooled connection and transaction; foreign key checks are
+    deferred so tables can be loaded in any order.
+    Returns the list of tables that failed to restore.
+    """
+    started_at = time.monotonic()
+    session_statements = []
+    futures = []
     try:
-        with open(file_path, 'r') as sql_file:
-            sql_script = sql_file.read()
-            for statement in sql_script.split(';'):
-                if statement.strip():
-                    try:
-                        execute_query(connection, statement)
-                    except Exception as e:
-                        logger.error(f"Error executing SQL statement: {e}")
-                        logger.error(f"Problematic statement: {statement}")
-        logger.info(f"Successfully executed {file_path}")
+        with open(file_path, 'r', encoding='utf-8') as sql_file, \
+                ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            for table, statements in group_statements_by_table(iter_sql_statements(sql_file)):
+                if table is None:
+                    # Leading SET statements apply to every worker session
+                    session_statements.extend(statements)
+                    continue
+                futures.append((table, executor.submit(
+                    restore_table_on_new_connection, table, statements, list(session_statements)
+                )))
     except IOError as e:
         logger.error(f"Error reading SQL file {file_path}: {e}")
+        return [table for table, _ in futures]
+
+    failed = [table for table, future in futures if future.exception()]
+    total_rows = sum(future.result() for _, future in futures if not future.exception())
+    logger.info(f"Restored {len(futures) - len(failed)}/{len(futures)} tables ({total_rows} rows) "
+                f"from {file_path} in {time.monotonic() - started_at:.2f} seconds")
+    return failed
 
 def setup_database():
     try:
@@ -42,20 +229,29 @@ def setup_database():
 
         # Get the current directory (where setup_database.py is located)
         current_dir = os.path.dirname(os.path.abspath(__file__))
-        
+
         # Construct the paths to schema.sql and data.sql
         schema_path = os.path.join(current_dir, 'schema.sql')
         data_path = os.path.join(current_dir, 'data.sql')
-        
+
         # Execute schema.sql
         execute_sql_file(connection, schema_path)
-        
-        # Execute data.sql if it exists
-        if os.path.exists(data_path):
-            execute_sql_file(connection, data_path)
+
+        # Seed from a Parquet snapshot if one exists, otherwise restore data.sql
+        if snapshot_exists():
+            failed = import_snapshot()
+            if failed:
+                logger.error(f"Failed to import tables from the snapshot: {', '.join(failed)}")
+        elif os.path.exists(data_path):
+            failed = restore_dump(data_path)
+            if failed:
+                logger.error(f"Failed to restore tables from data.sql: {', '.join(failed)}")
         else:
-            logger.info("data.sql not found. Skipping initial data population.")
-        
+            logger.info("No snapshot or data.sql found. Skipping initial data population.")
+
+        # Dumps recreate hustle_stats with their own layout; restore the partitions and indexes
+        apply_hustle_stats_layout()
+
         logger.info("Database setup completed successfully.")
 
     except Exception as e:
@@ -65,5 +261,25 @@ def setup_database():
         if 'connection' in locals() and connection.is_connected():
             connection.close()
 
+def migrate_database():
+    """
+    Upgrade an existing nba_db to the current schema in place, keeping its data.
+    schema.sql only creates missing tables, so it is safe to re-run; hustle_stats is then
+    converted to the current layout (games dimension, compact counters, partitions).
+    """
+    connection = connect_to_mysql(use_database=True)
+    if not connection:
+        raise Exception("Failed to connect to the 'nba_db' database")
+    try:
+        schema_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'schema.sql')
+        failed = execute_sql_file(connection, schema_path)
+        if failed:
+            raise Exception(f"Failed to create tables: {', '.join(failed)}")
+    finally:
+        connection.close()
+
+    apply_hustle_stats_layout()
+    logger.info("Database migrated to the current schema.")
+
 if __name__ == "__main__":
-    setup_database()
\ No newline at end of file
+    setup_database()
@@ -0,0 +1,205 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+import pyarrow as pa
+import pyarrow.parquet as pq
+from database.config import get_db_connection
+from database.bulk_load import load_rows
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshot')
+MANIFEST_FILE = 'manifest.json'
+
+# Data tables a snapshot holds, parents first. Operational state (scheduler_runs, game_manifest,
+# data_versions) belongs to one installation and is left out; setup creates those tables empty.
+SNAPSHOT_TABLES = ['teams', 'players', 'games', 'hustle_stats', 'hustle_stats_archive',
+                   'player_stats', 'team_stats', 'player_form']
+
+# Rows read from MySQL or Parquet at a time
+CHUNK_SIZE = 50000
+
+# MySQL DATA_TYPE -> Arrow type; anything not listed (DECIMAL, TIME, ...) is stored as a string
+ARROW_TYPES = {
+    'tinyint': pa.int8(),
+    'smallint': pa.int16(),
+    'mediumint': pa.int32(),
+    'int': pa.int32(),
+    'bigint': pa.int64(),
+    'float': pa.float32(),
+    'double': pa.float64(),
+    'date': pa.date32(),
+    'datetime': pa.timestamp('s'),
+    'timestamp': pa.timestamp('s'),
+}
+
+# Unsigned integer columns need the unsigned Arrow type of the same width (TINYINT UNSIGNED holds 0-255)
+UNSIGNED_ARROW_TYPES = {
+    'tinyint': pa.uint8(),
+    'smallint': pa.uint16(),
+    'mediumint': pa.uint32(),
+    'int': pa.uint32(),
+    'bigint': pa.uint64(),
+}
+
+def list_tables(cursor):
+    """The SNAPSHOT_TABLES present in nba_db, in SNAPSHOT_TABLES order."""
+    cursor.execute("SHOW FULL TABLES WHERE Table_type = 'BASE TABLE'")
+    existing = {row[0] for row in cursor.fetchall()}
+    return [table for table in SNAPSHOT_TABLES if table in existing]
+
+def arrow_schema(cursor, table):
+    cursor.execute(
+        """
+        SELECT COLUMN_NAME, DATA_TYPE, COLUMN_TYPE
+        FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        ORDER BY ORDINAL_POSITION
+        """,
+        (table,)
+    )
+    fields = []
+    for column, data_type, column_type in cursor.fetchall():
+        types = UNSIGNED_ARROW_TYPES if 'unsigned' in column_type.lower() else ARROW_TYPES
+        fields.append((column, types.get(data_type.lower(), ARROW_TYPES.get(data_type.lower(), pa.string()))))
+    return pa.schema(fields)
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def to_arrow(values, arrow_type):
+    if arrow_type == pa.string():
+        values = [value if value is None or isinstance(value, str) else str(value) for value in values]
+    return pa.array(values, type=arrow_type)
+
+def export_table(connection, table, path):
+    """Stream one table into a zstd-compressed Parquet file. Returns the row count."""
+    cursor = connection.cursor()
+    schema = arrow_schema(cursor, table)
+    cursor.close()
+
+    rows = 0
+    cursor = connection.cursor(buffered=False)
+    cursor.execute(f"SELECT {', '.join(f'`{name}`' for name in schema.names)} FROM `{table}`")
+    with pq.ParquetWriter(path, schema, compression='zstd') as writer:
+        while True:
+            chunk = cursor.fetchmany(CHUNK_SIZE)
+            if not chunk:
+                break
+            columns = list(zip(*chunk))
+            writer.write_table(pa.Table.from_arrays(
+                [to_arrow(values, field.type) for values, field in zip(columns, schema)],
+                schema=schema
+            ))
+            rows += len(chunk)
+    cursor.close()
+    return rows
+
+def export_snapshot(output_dir=SNAPSHOT_DIR, tables=None):
+    """
+    Export tables to Parquet files plus a manifest.json describing them.
+    Args:
+        output_dir (str): Directory the snapshot is written to.
+        tables (list): Tables to export. None exports the data tables (SNAPSHOT_TABLES).
+    Returns:
+        dict: The snapshot manifest.
+    """
+    started_at = time.monotonic()
+    os.makedirs(output_dir, exist_ok=True)
+    connection = get_db_connection()
+    try:
+        cursor = connection.cursor()
+        tables = tables or list_tables(cursor)
+        manifest = {'created_at': datetime.now(timezone.utc).isoformat(), 'tables': {}}
+        for table in tables:
+            cursor.execute(f"SHOW CREATE TABLE `{table}`")
+            create_statement = cursor.fetchone()[1]
+
+            file_name = f"{table}.parquet"
+            path = os.path.join(output_dir, file_name)
+            rows = export_table(connection, table, path)
+            manifest['tables'][table] = {
+                'file': file_name,
+                'rows': rows,
+                'sha256': file_sha256(path),
+                'create_statement': create_statement,
+            }
+            logger.info(f"Exported {rows} rows from {table} ({os.path.getsize(path)} bytes)")
+        cursor.close()
+    finally:
+        connection.close()
+
+    with open(os.path.join(output_dir, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    logger.info(f"Snapshot of {len(tables)} tables written to {output_dir} "
+                f"in {time.monotonic() - started_at:.2f} seconds")
+    return manifest
+
+def import_table(connection, table, entry, snapshot_dir):
+    """Recreate one table from its manifest entry and bulk-load its Parquet file."""
+    path = os.path.join(snapshot_dir, entry['file'])
+    if file_sha256(path) != entry['sha256']:
+        raise ValueError(f"Checksum mismatch for {path}")
+
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SET SESSION foreign_key_checks = 0, unique_checks = 0")
+        cursor.execute(f"DROP TABLE IF EXISTS `{table}`")
+        cursor.execute(entry['create_statement'])
+
+        rows = 0
+        connection.start_transaction()
+        parquet_file = pq.ParquetFile(path)
+        columns = parquet_file.schema_arrow.names
+        for batch in parquet_file.iter_batches(batch_size=CHUNK_SIZE):
+            load_rows(cursor, table, columns, batch.to_pandas(integer_object_nulls=True, timestamp_as_object=True))
+            rows += batch.num_rows
+        connection.commit()
+        return rows
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.execute("SET SESSION foreign_key_checks = 1, unique_checks = 1")
+        cursor.close()
+
+def import_snapshot(snapshot_dir=SNAPSHOT_DIR):
+    """
+    Replace the tables in nba_db with the contents of a snapshot.
+    Returns the list of tables that failed to import.
+    """
+    started_at = time.monotonic()
+    with open(os.path.join(snapshot_dir, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+
+    failed = []
+    connection = get_db_connection()
+    try:
+        for table, entry in manifest['tables'].items():
+            table_started_at = time.monotonic()
+            try:
+                rows = import_table(connection, table, entry, snapshot_dir)
+                logger.info(f"Imported {rows} rows into {table} in "
+                            f"{time.monotonic() - table_started_at:.2f} seconds")
+            except Exception as e:
+                logger.error(f"Error importing table {table}: {e}")
+                failed.append(table)
+    finally:
+        connection.close()
+
+    logger.info(f"Imported snapshot from {snapshot_dir} in {time.monotonic() - started_at:.2f} seconds")
+    return failed
+
+def snapshot_exists(snapshot_dir=SNAPSHOT_DIR):
+    return os.path.exists(os.path.join(snapshot_dir, MANIFEST_FILE))
+
+if __name__ == "__main__":
+    export_snapshot()
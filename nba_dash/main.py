@@ -1,21 +1,39 @@
 import logging
 from scripts.initial_setup import initial_setup
 from scripts.update import run_update
-from scheduler import start_scheduler
+from scripts.backfill import run_backfill
+from scripts.replay import run_replay
+from database.snapshot import export_snapshot
+from database.setup_database import migrate_database
+from database.archive import archive_seasons
+from data_ingestion.seasons import CURRENT_SEASON
+from scheduler import run_scheduler_service
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def main():
-    choice = input("Enter '1' for initial setup, '2' for update, '3' to start scheduler: ")
+    choice = input("Enter '1' for initial setup, '2' for update, '3' to start scheduler, '4' for historical backfill, '5' to replay from the API cache, '6' to export a snapshot, '7' to migrate an existing database, '8' to archive completed seasons: ")
     if choice == '1':
         initial_setup()
     elif choice == '2':
         run_update()
     elif choice == '3':
-        start_scheduler()
+        run_scheduler_service()
+    elif choice == '4':
+        start_season = input("Enter the first season to load (e.g. 2019-20): ").strip()
+        end_season = input(f"Enter the last season to load [{CURRENT_SEASON}]: ").strip() or CURRENT_SEASON
+        run_backfill(start_season, end_season)
+    elif choice == '5':
+        run_replay()
+    elif choice == '6':
+        export_snapshot()
+    elif choice == '7':
+        migrate_database()
+    elif choice == '8':
+        archive_seasons()
     else:
-        logger.error("Invalid choice. Please enter '1', '2', or '3'.")
+        logger.error("Invalid choice. Please enter '1', '2', '3', '4', '5', '6', '7' or '8'.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
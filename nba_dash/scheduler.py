@@ -1,39 +1,176 @@
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.date import DateTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+from datetime import datetime, time, timedelta
 from scripts.update import run_update
+from database.run_lock import run_lock, record_run_start, record_run_finish, minutes_since_last_success
+from data_ingestion.game_schedule import EASTERN, STATUS_FINAL, fetch_scoreboard, last_tip_off, all_games_final
 import logging
+import os
+import signal
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def start_scheduler():
-    scheduler = BackgroundScheduler()
-    
+# A run is skipped if another one succeeded less than this many minutes ago
+COALESCE_MINUTES = int(os.environ.get('NBA_COALESCE_MINUTES', 120))
+
+# Hustle box scores are published a little after the final buzzer
+FINAL_DELAY_MINUTES = int(os.environ.get('NBA_FINAL_DELAY_MINUTES', 30))
+
+# How often the scoreboard is checked once the last game could be over
+FINAL_POLL_MINUTES = int(os.environ.get('NBA_FINAL_POLL_MINUTES', 15))
+
+# Typical game length; the first final check happens this long after the last tip-off
+GAME_LENGTH = timedelta(hours=2, minutes=15)
+
+# Stop polling this long after the first check (postponements, suspended games)
+MAX_POLL_DURATION = timedelta(hours=6)
+
+# Used when no tip-off time can be read from the scoreboard
+DEFAULT_LAST_TIP_OFF = time(22, 30)
+
+# Jobs that fire while the process is down or busy are run once if they are at most this late
+MISFIRE_GRACE_SECONDS = 6 * 60 * 60
+
+def scheduled_update(trigger_name):
+    """Run the update unless another process holds the run lock or a recent run already succeeded."""
+    with run_lock() as acquired:
+        if not acquired:
+            logger.info(f"Skipping {trigger_name} update: another update is running")
+            return
+
+        minutes = minutes_since_last_success()
+        if minutes is not None and minutes < COALESCE_MINUTES:
+            logger.info(f"Skipping {trigger_name} update: last successful update finished {minutes} minutes ago")
+            return
+
+        run_id = record_run_start(trigger_name)
+        status = 'failed'
+        try:
+            if run_update():
+                status = 'success'
+        finally:
+            record_run_finish(run_id, status)
+
+def check_games_final(scheduler, game_date):
+    """Schedule the post-game update once every game of the night is final."""
+    try:
+        games = fetch_scoreboard(game_date)
+    except Exception as e:
+        logger.error(f"Error checking the scoreboard for {game_date}: {e}")
+        return
+
+    if not all_games_final(games):
+        remaining = sum(1 for game in games if game['status_id'] != STATUS_FINAL)
+        logger.info(f"{remaining} games on {game_date} are not final yet")
+        return
+
+    scheduler.remove_job('post_game_check')
+    run_at = datetime.now(EASTERN) + timedelta(minutes=FINAL_DELAY_MINUTES)
+    scheduler.add_job(
+        scheduled_update,
+        trigger=DateTrigger(run_date=run_at),
+        args=['post_game'],
+        id='post_game_update',
+        name=f"Run update after the games of {game_date}",
+        replace_existing=True)
+    logger.info(f"All games on {game_date} are final; update scheduled for {run_at:%Y-%m-%d %H:%M %Z}")
+
+def plan_post_game_update(scheduler):
+    """Read today's schedule and start checking for final scores shortly after the last tip-off."""
+    today = datetime.now(EASTERN).date()
+    try:
+        games = fetch_scoreboard(today)
+    except Exception as e:
+        logger.error(f"Error fetching the schedule for {today}: {e}")
+        return
+
+    if not games:
+        logger.info(f"No games on {today}; relying on the nightly update")
+        return
+
+    last_tip = last_tip_off(games) or datetime.combine(today, DEFAULT_LAST_TIP_OFF, EASTERN)
+    first_check = max(last_tip + GAME_LENGTH, datetime.now(EASTERN))
+    scheduler.add_job(
+        check_games_final,
+        trigger=IntervalTrigger(
+            minutes=FINAL_POLL_MINUTES,
+            start_date=first_check,
+            end_date=first_check + MAX_POLL_DURATION),
+        args=[scheduler, today],
+        id='post_game_check',
+        name=f"Check whether the games of {today} are final",
+        replace_existing=True)
+    logger.info(f"{len(games)} games on {today}; checking for final scores from {first_check:%H:%M %Z}")
+
+def create_scheduler(scheduler_class=BackgroundScheduler, follow_games=True):
+    """
+    Build a scheduler with the nightly and weekly updates.
+    Args:
+        scheduler_class: BackgroundScheduler or BlockingScheduler.
+        follow_games (bool): Also trigger an update once the last game of the night is final.
+    """
+    scheduler = scheduler_class(job_defaults={
+        'coalesce': True,
+        'max_instances': 1,
+        'misfire_grace_time': MISFIRE_GRACE_SECONDS,
+    })
+
     # Schedule the update to run every day at 2:00 AM
     scheduler.add_job(
-        run_update,
+        scheduled_update,
         trigger=CronTrigger(hour=2, minute=0),
+        args=['daily'],
         id='daily_update',
         name='Run daily update at 2 AM',
         replace_existing=True)
-    
+
     # Schedule a weekly update every Sunday at 1:00 AM
     scheduler.add_job(
-        run_update,
+        scheduled_update,
         trigger=CronTrigger(day_of_week='sun', hour=1, minute=0),
+        args=['weekly'],
         id='weekly_update',
         name='Run weekly update on Sunday at 1 AM',
         replace_existing=True)
 
+    if follow_games:
+        # Plan tonight's post-game update at startup and every day at noon Eastern
+        scheduler.add_job(
+            plan_post_game_update,
+            trigger=CronTrigger(hour=12, minute=0, timezone=EASTERN),
+            args=[scheduler],
+            id='plan_post_game_update',
+            name='Plan the post-game update',
+            next_run_time=datetime.now(EASTERN),
+            replace_existing=True)
+
+    return scheduler
+
+def start_scheduler():
+    """Start the scheduler in a background thread and return it."""
+    scheduler = create_scheduler()
     scheduler.start()
     logger.info("Scheduler started")
+    return scheduler
+
+def run_scheduler_service():
+    """Run the scheduler in the foreground until SIGINT or SIGTERM, letting a running update finish."""
+    scheduler = create_scheduler(BlockingScheduler)
+
+    def shutdown(signum, frame):
+        logger.info(f"Received signal {signum}; waiting for running jobs to finish...")
+        scheduler.shutdown(wait=True)
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    logger.info("Scheduler service started")
+    scheduler.start()
+    logger.info("Scheduler service stopped")
 
 if __name__ == "__main__":
-    start_scheduler()
-    
-    # Keep the script running
-    try:
-        while True:
-            pass
-    except (KeyboardInterrupt, SystemExit):
-        pass
\ No newline at end of file
+    run_scheduler_service()
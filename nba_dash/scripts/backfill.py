@@ -0,0 +1,83 @@
+import logging
+from data_ingestion.fetch_players import fetch_players
+from data_ingestion.fetch_hustle_stats import fetch_season_game_ids, ingest_games, DEFAULT_WORKERS
+from data_ingestion.game_manifest import dedupe_games, register_games, get_games_to_fetch, get_season_summary
+from data_ingestion.seasons import CURRENT_SEASON, season_range, season_start_year
+from data_ingestion import metrics
+from database.aggregates import refresh_aggregates
+from database.partitions import ensure_partitions
+from database.analytics_store import sync_analytics_store
+from database.data_version import stamp_data_version
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def run_backfill(start_season, end_season=CURRENT_SEASON, max_workers=DEFAULT_WORKERS,
+                 max_consecutive_failures=10):
+    """
+    Load hustle stats for a range of seasons, oldest first.
+    Progress is checkpointed per game in game_manifest, so re-running the same
+    command after a crash or rate-limit ban resumes from the last completed game.
+    Args:
+        start_season (str): First season to load, e.g. "2019-20".
+        end_season (str): Last season to load (inclusive).
+        max_workers (int): Number of games fetched concurrently.
+        max_consecutive_failures (int): Stop the backfill after this many failures in a row.
+    Returns:
+        bool: True if every season was walked to the end.
+    """
+    seasons = season_range(start_season, end_season)
+    logger.info(f"Starting backfill of {len(seasons)} seasons: {', '.join(seasons)}")
+    metrics.start_run('backfill')
+    ensure_partitions(season_start_year(seasons[-1]))
+
+    # Older box scores reference players who are no longer active
+    with metrics.timed_stage('players'):
+        fetch_players(current_only=False)
+
+    for index, season in enumerate(seasons, 1):
+        # Past seasons only need registering once; the current one keeps gaining games
+        if not get_season_summary(season) or season == CURRENT_SEASON:
+            try:
+                register_games(dedupe_games(fetch_season_game_ids(season)), season=season)
+            except Exception as e:
+                # Games the manifest already holds are still fetched; a re-run registers the rest
+                logger.error(f"Error registering the games of season {season}: {e}")
+
+        games = get_games_to_fetch(season=season)
+        if not games:
+            logger.info(f"Season {season} ({index}/{len(seasons)}) already complete, skipping")
+            continue
+
+        logger.info(f"Season {season} ({index}/{len(seasons)}): {len(games)} games remaining")
+        try:
+            with metrics.timed_stage('hustle_stats'):
+                ingest_games(games, max_workers=max_workers,
+                             max_consecutive_failures=max_consecutive_failures)
+        except Exception as e:
+            logger.error(f"Backfill stopped during season {season}: {e}. "
+                         f"Run it again to resume from the last completed game.")
+            # Games written before the stop still count towards the aggregates
+            try:
+                refresh_aggregates()
+            except Exception as refresh_error:
+                logger.error(f"Error refreshing aggregates after the stop: {refresh_error}")
+            metrics.finish_run('failed')
+            return False
+
+        with metrics.timed_stage('aggregates'):
+            refresh_aggregates()
+        logger.info(f"Season {season} finished: {get_season_summary(season)}")
+
+    with metrics.timed_stage('analytics_sync'):
+        sync_analytics_store()
+    stamp_data_version('backfill')
+
+    logger.info("Backfill completed successfully!")
+    metrics.finish_run('success')
+    return True
+
+if __name__ == "__main__":
+    start_season = input("Enter the first season to load (e.g. 2019-20): ").strip()
+    end_season = input(f"Enter the last season to load [{CURRENT_SEASON}]: ").strip() or CURRENT_SEASON
+    run_backfill(start_season, end_season)
@@ -0,0 +1,262 @@
+import argparse
+import json
+import logging
+import os
+import subprocess
+import time
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import URL
+from app.queries import DASHBOARD_QUERIES, to_duckdb_sql
+from database.config import DB_CONFIG, get_db_connection
+from database.aggregates import AGGREGATES, refresh_keys, refresh_player_form
+from database.analytics_store import DUCKDB_PATH
+from data_ingestion.fetch_players import PLAYER_COLUMNS, insert_players_batch
+from data_ingestion.fetch_hustle_stats import HUSTLE_STATS_COLUMNS, insert_hustle_stats_batch
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Where benchmark runs are appended, one JSON line per run
+BENCHMARK_DIR = os.environ.get('NBA_BENCHMARK_DIR') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'
+)
+RESULTS_FILE = 'results.jsonl'
+
+# Benchmark games are copies of the newest games under IDs no real or generated game uses
+BENCHMARK_GAME_ID = 99000000
+BENCHMARK_GAMES = 5
+
+def get_engine():
+    """SQLAlchemy engine over pymysql, the same driver the Streamlit pages use."""
+    url = URL.create(
+        'mysql+pymysql',
+        username=DB_CONFIG['user'],
+        password=DB_CONFIG['password'],
+        host=DB_CONFIG['host'],
+        database='nba_db',
+    )
+    return create_engine(url, pool_pre_ping=True)
+
+def summarize(samples):
+    """p50/p95/mean in milliseconds of a list of durations in seconds."""
+    milliseconds = np.array(samples) * 1000
+    return {
+        'p50_ms': round(float(np.percentile(milliseconds, 50)), 2),
+        'p95_ms': round(float(np.percentile(milliseconds, 95)), 2),
+        'mean_ms': round(float(milliseconds.mean()), 2),
+        'runs': len(samples),
+    }
+
+def time_call(func, repeat, warmup=1, setup=None):
+    """Run func warmup + repeat times and return the durations of the timed runs; setup runs untimed before each."""
+    for _ in range(warmup):
+        if setup:
+            setup()
+        func()
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started_at = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started_at)
+    return samples
+
+def benchmark_queries(engine, repeat):
+    """Time every dashboard query, including building the DataFrame as st.connection.query does."""
+    results = {}
+    with engine.connect() as conn:
+        for name, sql, params in DASHBOARD_QUERIES:
+            results[name] = summarize(time_call(lambda: pd.read_sql(text(sql), conn, params=params), repeat))
+    return results
+
+def benchmark_duckdb_queries(repeat, path=DUCKDB_PATH):
+    """Time every dashboard query against the DuckDB copy, as the pages run it with DASH_READ_ENGINE=duckdb."""
+    import duckdb
+
+    results = {}
+    duck = duckdb.connect(path, read_only=True)
+    try:
+        for name, sql, params in DASHBOARD_QUERIES:
+            duckdb_sql = to_duckdb_sql(sql)
+            results[name] = summarize(time_call(lambda: duck.execute(duckdb_sql, params or {}).df(), repeat))
+    finally:
+        duck.close()
+    return results
+
+def benchmark_game_rows():
+    """Copy the newest games' hustle_stats rows under benchmark game IDs."""
+    connection = None
+    try:
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        cursor.execute(
+            "SELECT game_id FROM hustle_stats GROUP BY game_id ORDER BY MAX(game_date) DESC, game_id DESC LIMIT %s",
+            (BENCHMARK_GAMES,)
+        )
+        game_ids = [row[0] for row in cursor.fetchall()]
+        if not game_ids:
+            raise ValueError("hustle_stats is empty; run python -m scripts.generate_data first")
+        cursor.execute(
+            f"SELECT {', '.join(HUSTLE_STATS_COLUMNS)} FROM hustle_stats "
+            f"WHERE game_id IN ({', '.join(['%s'] * len(game_ids))})",
+            game_ids
+        )
+        offsets = {game_id: index for index, game_id in enumerate(game_ids)}
+        return [(BENCHMARK_GAME_ID + offsets[row[0]],) + tuple(row[1:]) for row in cursor.fetchall()]
+    finally:
+        if connection:
+            connection.close()
+
+def delete_benchmark_games():
+    connection = None
+    try:
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        cursor.execute(
+            "DELETE FROM hustle_stats WHERE game_id BETWEEN %s AND %s",
+            (BENCHMARK_GAME_ID, BENCHMARK_GAME_ID + BENCHMARK_GAMES - 1)
+        )
+        connection.commit()
+    finally:
+        if connection:
+            connection.close()
+
+def refresh_benchmark_aggregates(rows):
+    """Recompute the aggregates of the benchmark games' players and teams, then roll back."""
+    connection = None
+    try:
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        for table, key, games_played in AGGREGATES:
+            keys = sorted({row[HUSTLE_STATS_COLUMNS.index(key)] for row in rows})
+            refresh_keys(cursor, table, key, games_played, keys)
+            if key == 'player_id':
+                refresh_player_form(cursor, keys)
+    finally:
+        if connection:
+            connection.rollback()
+            connection.close()
+
+def load_players():
+    connection = None
+    try:
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        cursor.execute(f"SELECT {', '.join(PLAYER_COLUMNS)} FROM players")
+        return cursor.fetchall()
+    finally:
+        if connection:
+            connection.close()
+
+def insert_hustle_rows(rows):
+    """insert_hustle_stats_batch, raising on failure so a failed write is never timed."""
+    if not insert_hustle_stats_batch(rows):
+        raise RuntimeError("hustle_stats insert failed; benchmark aborted")
+
+def benchmark_inserts(repeat):
+    """
+    Time the ingestion write path on a copy of the newest games: the hustle_stats upsert
+    of new rows, the same upsert when every row already exists, the aggregate refresh for
+    the affected players and teams, and a full players upsert (all unchanged rows).
+    The copied games are deleted afterwards and the aggregate refresh is rolled back.
+    """
+    rows = benchmark_game_rows()
+    players = load_players()
+    results = {}
+    try:
+        results['hustle_stats insert'] = summarize(time_call(
+            lambda: insert_hustle_rows(rows), repeat, setup=delete_benchmark_games
+        ))
+        results['hustle_stats upsert (existing rows)'] = summarize(time_call(
+            lambda: insert_hustle_rows(rows), repeat
+        ))
+        results['aggregate refresh'] = summarize(time_call(lambda: refresh_benchmark_aggregates(rows), repeat))
+        results['players upsert'] = summarize(time_call(lambda: insert_players_batch(players), repeat))
+    finally:
+        delete_benchmark_games()
+    return results
+
+def row_counts(engine):
+    with engine.connect() as conn:
+        return {
+            table: conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+            for table in ['teams', 'players', 'hustle_stats']
+        }
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+def load_previous_run(read_engine, results_dir=BENCHMARK_DIR):
+    """Return the newest recorded run on the same read engine, if any."""
+    path = os.path.join(results_dir, RESULTS_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        runs = [json.loads(line) for line in f if line.strip()]
+    runs = [run for run in runs if run.get('read_engine', 'mysql') == read_engine]
+    return runs[-1] if runs else None
+
+def print_report(run, previous):
+    previous_results = (previous or {}).get('results', {})
+    print(f"\n{'benchmark':<40}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}{'prev p50':>10}")
+    for name, result in run['results'].items():
+        previous_p50 = previous_results.get(name, {}).get('p50_ms')
+        print(f"{name:<40}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}{result['mean_ms']:>10.2f}"
+              f"{previous_p50 if previous_p50 is not None else '-':>10}")
+    print(f"rows: {run['rows']}")
+
+def run_benchmarks(repeat=20, include_inserts=True, read_engine='mysql', results_dir=BENCHMARK_DIR):
+    """
+    Time the dashboard queries and the insert path, print p50/p95 latencies next to the
+    previous run's and append the run to benchmarks/results.jsonl.
+    Args:
+        repeat (int): Timed runs per benchmark (after one warm-up run).
+        include_inserts (bool): Also benchmark the write path; it briefly adds and removes rows.
+        read_engine (str): Run the dashboard queries on 'mysql' or on the 'duckdb' copy.
+        results_dir (str): Directory of the results file.
+    Returns:
+        dict: The recorded run.
+    """
+    engine = get_engine()
+    try:
+        if read_engine == 'duckdb':
+            results = benchmark_duckdb_queries(repeat)
+        else:
+            results = benchmark_queries(engine, repeat)
+        if include_inserts:
+            results.update(benchmark_inserts(repeat))
+        run = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'revision': git_revision(),
+            'repeat': repeat,
+            'read_engine': read_engine,
+            'rows': row_counts(engine),
+            'results': results,
+        }
+    finally:
+        engine.dispose()
+
+    previous = load_previous_run(read_engine, results_dir)
+    os.makedirs(results_dir, exist_ok=True)
+    with open(os.path.join(results_dir, RESULTS_FILE), 'a') as f:
+        f.write(json.dumps(run) + '\n')
+    print_report(run, previous)
+    return run
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard queries and the ingestion write path.")
+    parser.add_argument('--repeat', type=int, default=20, help="timed runs per benchmark")
+    parser.add_argument('--queries-only', action='store_true', help="skip the write path benchmarks")
+    parser.add_argument('--engine', choices=['mysql', 'duckdb'], default='mysql',
+                        help="engine the dashboard queries run on")
+    args = parser.parse_args()
+    run_benchmarks(args.repeat, include_inserts=not args.queries_only, read_engine=args.engine)
@@ -0,0 +1,282 @@
+import argparse
+import logging
+import time
+import numpy as np
+from datetime import date, timedelta
+from database.config import get_db_connection
+from database.aggregates import rebuild_aggregates
+from database.partitions import ensure_partitions
+from database.analytics_store import sync_analytics_store
+from database.data_version import stamp_data_version
+from database.games import upsert_games
+from data_ingestion.fetch_teams import insert_team_batch
+from data_ingestion.fetch_players import insert_players_batch
+from data_ingestion.fetch_hustle_stats import insert_hustle_stats_batch
+from data_ingestion.game_manifest import register_games
+from data_ingestion.seasons import CURRENT_SEASON, format_season, season_start_year
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# (team_id, city, name, abbreviation, conference); the real NBA team IDs, so game finder filters accept them
+TEAMS = [
+    (1610612737, 'Atlanta', 'Hawks', 'ATL', 'East'),
+    (1610612738, 'Boston', 'Celtics', 'BOS', 'East'),
+    (1610612739, 'Cleveland', 'Cavaliers', 'CLE', 'East'),
+    (1610612740, 'New Orleans', 'Pelicans', 'NOP', 'West'),
+    (1610612741, 'Chicago', 'Bulls', 'CHI', 'East'),
+    (1610612742, 'Dallas', 'Mavericks', 'DAL', 'West'),
+    (1610612743, 'Denver', 'Nuggets', 'DEN', 'West'),
+    (1610612744, 'Golden State', 'Warriors', 'GSW', 'West'),
+    (1610612745, 'Houston', 'Rockets', 'HOU', 'West'),
+    (1610612746, 'LA', 'Clippers', 'LAC', 'West'),
+    (1610612747, 'Los Angeles', 'Lakers', 'LAL', 'West'),
+    (1610612748, 'Miami', 'Heat', 'MIA', 'East'),
+    (1610612749, 'Milwaukee', 'Bucks', 'MIL', 'East'),
+    (1610612750, 'Minnesota', 'Timberwolves', 'MIN', 'West'),
+    (1610612751, 'Brooklyn', 'Nets', 'BKN', 'East'),
+    (1610612752, 'New York', 'Knicks', 'NYK', 'East'),
+    (1610612753, 'Orlando', 'Magic', 'ORL', 'East'),
+    (1610612754, 'Indiana', 'Pacers', 'IND', 'East'),
+    (1610612755, 'Philadelphia', '76ers', 'PHI', 'East'),
+    (1610612756, 'Phoenix', 'Suns', 'PHX', 'West'),
+    (1610612757, 'Portland', 'Trail Blazers', 'POR', 'West'),
+    (1610612758, 'Sacramento', 'Kings', 'SAC', 'West'),
+    (1610612759, 'San Antonio', 'Spurs', 'SAS', 'West'),
+    (1610612760, 'Oklahoma City', 'Thunder', 'OKC', 'West'),
+    (1610612761, 'Toronto', 'Raptors', 'TOR', 'East'),
+    (1610612762, 'Utah', 'Jazz', 'UTA', 'West'),
+    (1610612763, 'Memphis', 'Grizzlies', 'MEM', 'West'),
+    (1610612764, 'Washington', 'Wizards', 'WAS', 'East'),
+    (1610612765, 'Detroit', 'Pistons', 'DET', 'East'),
+    (1610612766, 'Charlotte', 'Hornets', 'CHA', 'East'),
+]
+TEAM_ABBREVIATIONS = {team[0]: team[3] for team in TEAMS}
+
+# Players the dashboards select by default, kept on their teams every season
+FIXED_PLAYERS = [
+    (2544, 'LeBron James', 'F', 1610612747),
+    (201939, 'Stephen Curry', 'G', 1610612744),
+]
+
+FIRST_NAMES = ['James', 'Marcus', 'Tyler', 'Jalen', 'Anthony', 'Chris', 'Kevin', 'Derrick', 'Malik', 'Jordan',
+               'Luka', 'Nikola', 'Devin', 'Trey', 'Isaiah', 'Aaron', 'Cameron', 'Darius', 'Josh', 'Miles']
+LAST_NAMES = ['Johnson', 'Williams', 'Brown', 'Jones', 'Davis', 'Miller', 'Wilson', 'Moore', 'Taylor', 'Thomas',
+              'Jackson', 'White', 'Harris', 'Martin', 'Thompson', 'Green', 'Walker', 'Allen', 'Young', 'King']
+POSITIONS = ['G', 'G', 'F', 'F', 'C', 'G-F', 'F-C']
+
+ROSTER_SIZE = 15
+GAMES_PER_TEAM = 82
+# Roster spots handed to new players each offseason
+ROSTER_TURNOVER = 3
+# Synthetic player IDs start here, clear of the fixed players
+FIRST_PLAYER_ID = 1000000
+
+# Expected minutes of roster spots 1..15; spots at the end of the bench often do not play
+ROTATION_MINUTES = [34, 33, 32, 30, 28, 24, 22, 20, 16, 14, 10, 6, 4, 3, 2]
+
+# Per-36-minute league rates of the counters that are drawn independently
+RATES_PER_36 = {
+    'pts': 14.0,
+    'contested_shots_2pt': 4.5,
+    'contested_shots_3pt': 3.0,
+    'deflections': 1.8,
+    'charges_drawn': 0.06,
+    'screen_assists': 1.2,
+    'off_loose_balls_recovered': 0.2,
+    'def_loose_balls_recovered': 0.35,
+    'off_boxouts': 0.25,
+    'def_boxouts': 0.9,
+}
+
+def season_opening_day(start_year):
+    return date(start_year, 10, 22)
+
+def game_id(start_year, number):
+    """Regular season game IDs look like 0022400001 and are stored without the leading zeros."""
+    return int(f"2{start_year % 100:02d}{number:05d}")
+
+def new_player(rng, player_id):
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    return {
+        'player_id': player_id,
+        'full_name': name,
+        'position': str(rng.choice(POSITIONS)),
+        # Per-player skill on every counter; gamma(4, 0.25) has mean 1
+        'skill': rng.gamma(4.0, 0.25, size=len(RATES_PER_36)),
+    }
+
+def build_rosters(players):
+    """Fill every team with ROSTER_SIZE players; the fixed players start on their teams."""
+    rosters = {team[0]: [] for team in TEAMS}
+    for player_id, full_name, position, team_id in FIXED_PLAYERS:
+        players[player_id] = {
+            'player_id': player_id, 'full_name': full_name, 'position': position,
+            'skill': np.full(len(RATES_PER_36), 1.5),
+        }
+        rosters[team_id].append(player_id)
+    return rosters
+
+def turn_over_rosters(rng, rosters, players, next_player_id, turnover):
+    """Release `turnover` players per team (never the fixed ones) and sign new ones in their place."""
+    fixed = {player[0] for player in FIXED_PLAYERS}
+    for team_id, roster in rosters.items():
+        releasable = [player_id for player_id in roster if player_id not in fixed]
+        for player_id in rng.permutation(releasable)[:turnover].tolist():
+            roster.remove(player_id)
+        while len(roster) < ROSTER_SIZE:
+            players[next_player_id] = new_player(rng, next_player_id)
+            roster.append(next_player_id)
+            next_player_id += 1
+        # Better players get more minutes
+        roster.sort(key=lambda player_id: -players[player_id]['skill'].sum())
+    return next_player_id
+
+def schedule_season(rng, start_year):
+    """Return (game_id, game_date, home_team_id, away_team_id) for GAMES_PER_TEAM rounds of 15 games."""
+    team_ids = [team[0] for team in TEAMS]
+    games = []
+    game_date = season_opening_day(start_year)
+    for _ in range(GAMES_PER_TEAM):
+        order = rng.permutation(team_ids).tolist()
+        for home, away in zip(order[0::2], order[1::2]):
+            games.append((game_id(start_year, len(games) + 1), game_date, home, away))
+        game_date += timedelta(days=2)
+    return games
+
+def player_lines(rng, game, team_id, roster, players):
+    """Draw one game's hustle_stats rows (HUSTLE_STATS_COLUMNS order) for a team."""
+    game_id_value, game_date, _, _ = game
+
+    minutes = np.clip(rng.normal(ROTATION_MINUTES[:len(roster)], 4), 0, 48)
+    # End of the bench is often a DNP
+    minutes[-4:] *= rng.random(4) < 0.5
+    # hustle_stats stores seconds played
+    seconds = (minutes * 60).round().astype(int)
+
+    skills = np.array([players[player_id]['skill'] for player_id in roster])
+    rates = np.array(list(RATES_PER_36.values()))
+    draws = rng.poisson(skills * rates * (minutes[:, None] / 36.0))
+    counters = dict(zip(RATES_PER_36, draws.T))
+
+    screen_ast_pts = 2 * counters['screen_assists'] + rng.binomial(counters['screen_assists'], 0.35)
+    rows = []
+    for index, player_id in enumerate(roster):
+        c = {name: int(values[index]) for name, values in counters.items()}
+        rows.append((
+            game_id_value, team_id, player_id, game_date, int(seconds[index]),
+            c['pts'],
+            c['contested_shots_2pt'] + c['contested_shots_3pt'],
+            c['contested_shots_2pt'],
+            c['contested_shots_3pt'],
+            c['deflections'],
+            c['charges_drawn'],
+            c['screen_assists'],
+            int(screen_ast_pts[index]),
+            c['off_loose_balls_recovered'],
+            c['def_loose_balls_recovered'],
+            c['off_loose_balls_recovered'] + c['def_loose_balls_recovered'],
+            c['off_boxouts'],
+            c['def_boxouts'],
+            c['off_boxouts'] + c['def_boxouts'],
+        ))
+    return rows
+
+def clear_tables():
+    """Delete the data the generator replaces; players go before teams because of their foreign key."""
+    connection = None
+    try:
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        for table in ['hustle_stats', 'hustle_stats_archive', 'player_stats', 'team_stats', 'player_form',
+                      'game_manifest', 'games', 'players', 'teams']:
+            cursor.execute(f"DELETE FROM {table}")
+        connection.commit()
+    finally:
+        if connection:
+            connection.close()
+
+def generate_data(seasons=5, last_season=CURRENT_SEASON, seed=507):
+    """
+    Replace teams, players and hustle_stats with synthetic data covering several seasons.
+    Rows go through the same batch writers as ingestion, and game_manifest, partitions and
+    aggregates are brought up to date afterwards, so the database looks like a finished backfill.
+    Args:
+        seasons (int): Number of full 82-game seasons to generate.
+        last_season (str): Newest season, e.g. "2024-25".
+        seed (int): Random seed; the same arguments always produce the same data.
+    Returns:
+        int: Number of hustle_stats rows written.
+    """
+    started_at = time.monotonic()
+    rng = np.random.default_rng(seed)
+    last_year = season_start_year(last_season)
+    years = list(range(last_year - seasons + 1, last_year + 1))
+
+    clear_tables()
+    ensure_partitions(last_year)
+
+    players = {}
+    rosters = build_rosters(players)
+    next_player_id = FIRST_PLAYER_ID
+    team_rows = []
+    total_rows = 0
+
+    for index, start_year in enumerate(years):
+        season = format_season(start_year)
+        next_player_id = turn_over_rosters(rng, rosters, players, next_player_id,
+                                           ROSTER_SIZE if index == 0 else ROSTER_TURNOVER)
+        games = schedule_season(rng, start_year)
+        wins = dict.fromkeys(rosters, 0)
+
+        season_rows = []
+        for game in games:
+            _, _, home, away = game
+            home_rows = player_lines(rng, game, home, rosters[home], players)
+            away_rows = player_lines(rng, game, away, rosters[away], players)
+            home_points = sum(row[5] for row in home_rows)
+            away_points = sum(row[5] for row in away_rows)
+            wins[home if home_points >= away_points else away] += 1
+            season_rows += home_rows + away_rows
+
+        # Standings of the newest season are the ones left in teams, as with a real update
+        team_rows = [
+            (team_id, season, city, name, abbreviation, conference,
+             wins[team_id], GAMES_PER_TEAM - wins[team_id], round(wins[team_id] / GAMES_PER_TEAM, 3))
+            for team_id, city, name, abbreviation, conference in TEAMS
+        ]
+        if not insert_hustle_stats_batch(season_rows):
+            raise RuntimeError(f"Writing synthetic hustle stats for {season} failed")
+        upsert_games([(game_id, game_date, season, home, away) for game_id, game_date, home, away in games])
+        register_games(
+            [(game[0], game[1], f"{TEAM_ABBREVIATIONS[game[2]]} vs. {TEAM_ABBREVIATIONS[game[3]]}") for game in games],
+            season=season
+        )
+        total_rows += len(season_rows)
+        logger.info(f"Generated season {season}: {len(games)} games, {len(season_rows)} hustle stats rows")
+
+    insert_team_batch(team_rows)
+    # Everyone who ever played is kept; released players have no current team
+    current_team = {player_id: team_id for team_id, roster in rosters.items() for player_id in roster}
+    insert_players_batch([
+        (player['player_id'], player['full_name'], player['position'], current_team.get(player['player_id']))
+        for player in players.values()
+    ])
+    rebuild_aggregates()
+    sync_analytics_store()
+    stamp_data_version('generate_data')
+
+    logger.info(f"Generated {len(years)} seasons, {len(players)} players and {total_rows} hustle stats rows "
+                f"in {time.monotonic() - started_at:.2f} seconds")
+    return total_rows
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fill nba_db with synthetic teams, players and hustle stats.")
+    parser.add_argument('--seasons', type=int, default=5, help="number of seasons to generate")
+    parser.add_argument('--last-season', default=CURRENT_SEASON, help="newest season, e.g. 2024-25")
+    parser.add_argument('--seed', type=int, default=507, help="random seed")
+    args = parser.parse_args()
+
+    answer = input("This deletes every team, player and hustle stats row in nba_db. Continue? (y/n): ")
+    if answer.strip().lower() == 'y':
+        generate_data(args.seasons, args.last_season, args.seed)
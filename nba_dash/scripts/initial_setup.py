@@ -2,6 +2,7 @@ import logging
 import os
 from database.config import connect_to_mysql, execute_query
 from database.setup_database import setup_database
+from database.aggregates import rebuild_aggregates
 from data_ingestion import run_data_ingestion
 
 logging.basicConfig(level=logging.INFO)
@@ -31,6 +32,8 @@ def initial_setup(drop_existing=False):
 
         logger.info("Running initial database setup...")
         setup_database()
+        logger.info("Building player and team aggregates...")
+        rebuild_aggregates()
         logger.info("Running initial data ingestion...")
         run_data_ingestion()
         logger.info("Initial setup completed successfully!")
@@ -0,0 +1,81 @@
+import logging
+import time
+from data_ingestion.api_cache import set_offline, iter_cached
+from data_ingestion.fetch_teams import fetch_teams
+from data_ingestion.fetch_players import fetch_players
+from data_ingestion.fetch_hustle_stats import (
+    parse_game_finder_results, parse_game_dimension, transform_player_stats_batch, flush_batch
+)
+from data_ingestion.game_manifest import dedupe_games, register_games
+from database.aggregates import refresh_aggregates
+from database.games import upsert_games
+from database.analytics_store import sync_analytics_store
+from database.data_version import stamp_data_version
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def flush_replay_batch(pending):
+    batch_games = [(game_id, game_date) for game_id, game_date, _, _ in pending]
+    if flush_batch(transform_player_stats_batch(pending), batch_games):
+        return len(batch_games)
+    return 0
+
+def replay_games(batch_size=50):
+    """Rebuild hustle_stats from cached LeagueGameFinder and HustleStatsBoxScore responses."""
+    games = {}
+    for params, data in iter_cached('LeagueGameFinder'):
+        upsert_games(parse_game_dimension(data['LeagueGameFinderResults']))
+        season_games = dedupe_games(parse_game_finder_results(data['LeagueGameFinderResults']))
+        register_games(season_games, season=params.get('season_nullable'))
+        for game_id, game_date, matchup in season_games:
+            games[game_id] = (game_date, matchup)
+
+    pending = []
+    replayed = 0
+    for params, data in iter_cached('HustleStatsBoxScore'):
+        game_id = int(params['game_id'])
+        if game_id not in games:
+            logger.warning(f"Skipping cached box score {game_id}: no cached LeagueGameFinder row for it")
+            continue
+
+        game_date, matchup = games[game_id]
+        pending.append((game_id, game_date, matchup, data['PlayerStats']))
+
+        if len(pending) >= batch_size:
+            replayed += flush_replay_batch(pending)
+            pending = []
+
+    if pending:
+        replayed += flush_replay_batch(pending)
+    return replayed
+
+def run_replay():
+    """Rebuild teams, players and hustle_stats from the on-disk API cache without using the network."""
+    started_at = time.monotonic()
+    set_offline(True)
+    try:
+        # Oldest season first so the newest standings are the ones left in teams
+        seasons = sorted(params['season'] for params, _ in iter_cached('LeagueStandings'))
+        for season in seasons:
+            fetch_teams(season)
+
+        # Full league history first, then current rosters so current teams win
+        player_params = sorted(
+            (params for params, _ in iter_cached('CommonAllPlayers')),
+            key=lambda params: (params['is_only_current_season'], params['season'])
+        )
+        for params in player_params:
+            fetch_players(params['season'], current_only=bool(params['is_only_current_season']))
+
+        replayed = replay_games()
+        refresh_aggregates()
+        sync_analytics_store()
+        stamp_data_version('replay')
+        logger.info(f"Replayed {len(seasons)} standings, {len(player_params)} player lists and "
+                    f"{replayed} box scores in {time.monotonic() - started_at:.1f} seconds")
+    finally:
+        set_offline(False)
+
+if __name__ == "__main__":
+    run_replay()
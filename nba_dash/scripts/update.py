@@ -1,16 +1,28 @@
 import logging
+import sys
 from data_ingestion import run_data_ingestion
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def run_update():
+def run_update(tasks=None):
+    """
+    Run the data update. Returns True when every ingestion task succeeded.
+    Args:
+        tasks (list): Ingestion task names to run with their dependencies; None runs all of them.
+    """
     try:
         logger.info("Running data update...")
-        run_data_ingestion()
+        changes = run_data_ingestion(tasks)
+        if changes['failed']:
+            logger.error(f"Data update finished with failed tasks: {', '.join(changes['failed'])}")
+            return False
         logger.info("Data update completed successfully!")
+        return True
     except Exception as e:
         logger.error(f"An error occurred during update: {e}")
+        return False
 
 if __name__ == "__main__":
-    run_update()
\ No newline at end of file
+    # e.g. `python -m scripts.update players` re-runs only the players step and its dependencies
+    run_update(sys.argv[1:] or None)
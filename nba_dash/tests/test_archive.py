@@ -0,0 +1,47 @@
+from database.archive import archive_partition, row_fingerprint
+
+COLUMNS = ['game_id', 'player_id', 'game_date', 'pts']
+
+class RecordingCursor:
+    """Cursor that records every statement and answers fingerprints with a fixed result."""
+
+    def __init__(self, fingerprint=(2, 12345)):
+        self.statements = []
+        self.fingerprint = fingerprint
+        self.rowcount = 0
+
+    def execute(self, sql, params=None):
+        self.statements.append(sql)
+        if sql.startswith('DELETE'):
+            self.rowcount = self.fingerprint[0]
+
+    def fetchone(self):
+        return self.fingerprint
+
+class RecordingConnection:
+    def __init__(self):
+        self.committed = False
+        self.rolled_back = False
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        self.rolled_back = True
+
+def test_row_fingerprint_hashes_whole_columns():
+    cursor = RecordingCursor()
+    assert row_fingerprint(cursor, 'hustle_stats_archive', COLUMNS, join_partition='p2015') == (2, 12345)
+    sql = cursor.statements[0]
+    assert ("CONCAT_WS('|', IFNULL(a.game_id, 'NULL'), IFNULL(a.player_id, 'NULL'), "
+            "IFNULL(a.game_date, 'NULL'), IFNULL(a.pts, 'NULL'))") in sql
+    assert "FROM hustle_stats_archive a JOIN hustle_stats PARTITION (p2015) h" in sql
+
+def test_archive_partition_copies_listed_columns():
+    cursor = RecordingCursor()
+    connection = RecordingConnection()
+    assert archive_partition(connection, cursor, 'p2015', COLUMNS) == 2
+    assert ("REPLACE INTO hustle_stats_archive (game_id, player_id, game_date, pts) "
+            "SELECT game_id, player_id, game_date, pts FROM hustle_stats PARTITION (p2015)") in cursor.statements
+    assert "DELETE FROM hustle_stats PARTITION (p2015)" in cursor.statements
+    assert connection.committed and not connection.rolled_back